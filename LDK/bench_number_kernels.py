@@ -0,0 +1,80 @@
+"""
+Number批量计算内核基准测试
+比较旧版静态方法(列表推导式逐元素计算)与number_kernels向量化内核的耗时
+运行方式: python bench_number_kernels.py
+"""
+import timeit
+from array import array
+
+import number_kernels
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class LegacyKernels(object):
+    """复刻改造前Number静态方法的实现: 对两个列表zip后逐元素计算"""
+
+    @staticmethod
+    def add(numbers_a, numbers_b):
+        return [a + b for a, b in zip(numbers_a, numbers_b)]
+
+    @staticmethod
+    def mul(numbers_a, numbers_b):
+        return [a * b for a, b in zip(numbers_a, numbers_b)]
+
+    @staticmethod
+    def div(numbers_a, numbers_b):
+        return [a / b for a, b in zip(numbers_a, numbers_b)]
+
+    @staticmethod
+    def stasum(numbers):
+        return sum(numbers)
+
+    @staticmethod
+    def stamax(numbers):
+        return max(numbers)
+
+    @staticmethod
+    def stacount(numbers, value):
+        return numbers.count(value)
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """返回func多次运行中最快一次的耗时(秒)"""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    length = 1000000
+    ints = list(range(length))
+    floats = [i + 0.5 for i in range(length)]
+    inputs = [('list[float]', floats, floats), ('array[d]', array('d', floats), array('d', floats))]
+    if np is not None:
+        inputs.append(('ndarray', np.array(floats), np.array(floats)))
+    print(f"{'case':<24}{'before':>12}{'after':>12}{'ratio':>8}")
+    for label, a, b in inputs:
+        cases = [
+            ('add', lambda: LegacyKernels.add(a, b), lambda: number_kernels.add(a, b)),
+            ('mul', lambda: LegacyKernels.mul(a, b), lambda: number_kernels.mul(a, b)),
+            ('div', lambda: LegacyKernels.div(a, b), lambda: number_kernels.div(a, b)),
+            ('sum', lambda: LegacyKernels.stasum(a), lambda: number_kernels.stasum(a)),
+            ('max', lambda: LegacyKernels.stamax(a), lambda: number_kernels.stamax(a)),
+        ]
+        for name, before_func, after_func in cases:
+            before, after = best_of(before_func), best_of(after_func)
+            print(f'{name + " " + label:<24}{before * 1000:>9.1f} ms{after * 1000:>9.1f} ms{before / after:>7.1f}x')
+    out = array('d', bytes(8 * length))
+    _, a, b = inputs[1]
+    before = best_of(lambda: LegacyKernels.add(a, b))
+    after = best_of(lambda: number_kernels.add(a, b, out=out))
+    print(f'{"add array[d] out=":<24}{before * 1000:>9.1f} ms{after * 1000:>9.1f} ms{before / after:>7.1f}x')
+    before = best_of(lambda: LegacyKernels.stacount(ints, 7))
+    after = best_of(lambda: number_kernels.stacount(ints, 7))
+    print(f'{"count list[int]":<24}{before * 1000:>9.1f} ms{after * 1000:>9.1f} ms{before / after:>7.1f}x')
+
+
+if __name__ == "__main__":
+    main()
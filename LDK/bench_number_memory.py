@@ -0,0 +1,48 @@
+"""
+Number内存占用基准测试
+比较旧版布局(实例字典+元组存储)与当前布局(__slots__+紧凑数组存储)每个实例占用的字节数
+运行方式: python bench_number_memory.py
+"""
+import tracemalloc
+
+from number_class import Number
+
+
+class LegacyNumber(object):
+    """复刻1.9.8之前的存储布局: 实例字典保存value和SM, 多值存为元组"""
+
+    def __init__(self, *value, show_mode='__visual__'):
+        self.value = value[0] if len(value) == 1 else value
+        self.SM = show_mode
+
+
+def bytes_per_instance(factory, count: int) -> float:
+    """用tracemalloc测量factory创建count个对象后平均每个对象占用的字节数"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return size / count
+
+
+def main():
+    scalar_count = 100000
+    vector_count = 1000
+    vector_length = 1000
+    cases = [
+        ('scalar', scalar_count, lambda cls: (lambda i: cls(i + 0.5))),
+        (f'vector[{vector_length}]', vector_count,
+         lambda cls: (lambda i: cls(*(i + j + 0.5 for j in range(vector_length))))),
+    ]
+    print(f"{'case':<14}{'before':>14}{'after':>14}{'ratio':>8}")
+    for name, count, make in cases:
+        before = bytes_per_instance(make(LegacyNumber), count)
+        after = bytes_per_instance(make(Number), count)
+        print(f'{name:<14}{before:>12.1f} B{after:>12.1f} B{before / after:>7.1f}x')
+
+
+if __name__ == "__main__":
+    main()
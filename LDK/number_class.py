@@ -1,7 +1,1292 @@
 
 
+import csv
+import io
 import math
-from collections.abc import Callable
+import mmap as _mmap
+import operator
+import os
+import struct
+import sys
+import warnings
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import reduce, wraps
+from itertools import chain, compress, islice, repeat
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from types import FunctionType
+
+try:
+    import numpy as _np
+except ImportError:  # numpy为可选依赖,缺失时所有运算退回纯Python实现
+    _np = None
+
+# 存储引擎相关常量
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+_MAX_EXACT_INT = 2 ** 53  # 超过此范围的整数无法用双精度浮点数精确表示
+_VECTOR_THRESHOLD = 4096  # 元素数不少于此值时才使用numpy向量化路径
+_REPR_THRESHOLD = 1000  # 元素数超过此值时repr/str只显示首尾元素(与numpy的默认值相同)
+_REPR_EDGEITEMS = 3  # 摘要显示时首尾各显示的元素个数
+_FORMAT_CHUNK = 65536  # 批量格式化时每次拼接的元素数
+_INDEX_INSERT_LIMIT = 64  # 一次追加超过此数量时丢弃排序索引(下次查询重建), 否则逐个插入
+
+# 磁盘文件格式: 32字节文件头 + 小端序的原始数值
+# 文件头: 魔数(6) 格式版本(uint16) 类型码('q'/'d') 填充(7) 元素个数(uint64) 写入时的库版本(8)
+_FILE_MAGIC = b'LDKNUM'
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct('<6sHc7xQ8s')
+
+
+def _to_storage(values: "tuple | list") -> "array | list":
+    """将一组数值转换为紧凑的存储
+
+    规则:
+    1. 全部为整数且在int64范围内: array('q')
+    2. 含有浮点数且整数都能被浮点数精确表示: array('d')
+    3. 其他情况(超大整数): 退回Python列表以保证精度
+
+    Args:
+        values: 数值序列(必须可多次遍历)
+
+    Returns:
+        array | list: 每个元素占用8字节的数组,或退回的列表
+    """
+    try:
+        return array('q', values)
+    except TypeError:  # 含有浮点数
+        if any(isinstance(v, int) and not -_MAX_EXACT_INT <= v <= _MAX_EXACT_INT for v in values):
+            return list(values)
+        return array('d', values)
+    except OverflowError:  # 整数超出int64范围
+        return list(values)
+
+
+def _typecode(data) -> "str | None":
+    """返回紧凑存储的类型码('q'/'d'); 共享内存中的memoryview按其格式处理, 其他存储返回None"""
+    if isinstance(data, array):
+        return data.typecode
+    if isinstance(data, memoryview):
+        return data.format
+    return None
+
+
+def _adopt_buffer(buffer) -> "array | memoryview | list":
+    """把支持缓冲区协议的一维数值数据转换为存储
+
+    8字节的本机整数/浮点数(如int64/float64的numpy数组)且连续时零拷贝:
+    得到引用原缓冲区的memoryview, 原数据的修改会反映到Number上;
+    其他数值类型整块复制为紧凑存储。
+
+    Raises:
+        ValueError: 数据不是一维时
+        TypeError: 缓冲区的元素类型不是数值时
+    """
+    view = memoryview(buffer)
+    if view.ndim != 1:
+        raise ValueError("Buffer must be one-dimensional")
+    fmt = view.format.lstrip('@=')
+    if fmt in ('q', 'l', 'd') and view.itemsize == 8:
+        typecode = 'd' if fmt == 'd' else 'q'
+        if view.c_contiguous:
+            return view.cast('B').cast(typecode)
+        storage = array(typecode)
+        storage.frombytes(view.tobytes())
+        return storage
+    if fmt in ('f', 'e', 'd'):
+        return array('d', view.tolist())
+    if len(fmt) == 1 and fmt in 'bBhHiIlLqQ?':
+        return _to_storage(view.tolist())
+    raise TypeError("Buffer must contain int or float values")
+
+
+def _storage_fits(data: "array | memoryview | list", value: int | float) -> bool:
+    """判断value能否无损地放入已有的存储中"""
+    if isinstance(data, list):
+        return True
+    if _typecode(data) == 'q':
+        return isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX
+    return isinstance(value, float) or -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT
+
+
+def _ndview(data: "array | list"):
+    """把紧凑数组零拷贝地视为numpy数组
+
+    注意: 视图存活期间底层array无法改变大小, 因此视图只能作为临时变量使用。
+
+    Returns:
+        numpy.ndarray | None: numpy不可用或存储为list时返回None
+    """
+    typecode = _typecode(data)
+    if _np is None or typecode is None:
+        return None
+    return _np.frombuffer(data, dtype=_np.int64 if typecode == 'q' else _np.float64)
+
+
+def _from_ndarray(result) -> array:
+    """把numpy运算结果复制为紧凑数组存储(frombytes直接读取缓冲区, 只复制一次)"""
+    typecode, dtype = ('d', _np.float64) if result.dtype.kind == 'f' else ('q', _np.int64)
+    storage = array(typecode)
+    storage.frombytes(_np.ascontiguousarray(result, dtype=dtype).data.cast('B'))
+    return storage
+
+
+def _max_abs(x) -> int | float:
+    """返回numpy数组或标量的最大绝对值(整数时精确计算, 避免int64取反溢出)"""
+    if isinstance(x, (int, float)):
+        return abs(x)
+    if x.dtype.kind == 'f':
+        return float(_np.abs(x).max())
+    return max(-int(x.min()), int(x.max()))
+
+
+def _check_log_base(base: int | float) -> None:
+    """检查对数的底数, 在计算任何元素之前给出明确的异常
+
+    Raises:
+        TypeError: 底数不是数值时
+        ValueError: 底数不是正数时
+        ZeroDivisionError: 底数为1时(与math.log一致)
+    """
+    if not isinstance(base, (int, float)):
+        raise TypeError("Logarithm base must be int or float")
+    if not base > 0:
+        raise ValueError("Logarithm base must be positive")
+    if base == 1:
+        raise ZeroDivisionError("Logarithm base must not be 1")
+
+
+def _contains_zero(data: "array | list") -> bool:
+    """判断存储中是否含有0, 大数组时使用向量化扫描"""
+    view = _ndview(data)
+    if view is not None and len(view) >= _VECTOR_THRESHOLD:
+        return not view.all()
+    return any(v == 0 for v in data)
+
+
+_VECTOR_FUNCS = {
+    'add': _np.add,
+    'sub': _np.subtract,
+    'mul': _np.multiply,
+    'truediv': _np.true_divide,
+    'floordiv': _np.floor_divide,
+    'mod': _np.remainder,
+    'pow': _np.power,
+    'or': _np.bitwise_or,
+    'xor': _np.bitwise_xor,
+    'and': _np.bitwise_and,
+    'lshift': _np.left_shift,
+    'rshift': _np.right_shift,
+} if _np is not None else {}
+
+_BITWISE_OPS = ('or', 'xor', 'and', 'lshift', 'rshift')
+
+# 运算名 -> (纯Python实现, 运算符号)
+_PY_FUNCS = {
+    'add': (operator.add, '+'),
+    'sub': (operator.sub, '-'),
+    'mul': (operator.mul, '*'),
+    'truediv': (operator.truediv, '/'),
+    'floordiv': (operator.floordiv, '//'),
+    'mod': (operator.mod, '%'),
+    'pow': (operator.pow, '**'),
+    'or': (operator.or_, '|'),
+    'xor': (operator.xor, '^'),
+    'and': (operator.and_, '&'),
+    'lshift': (operator.lshift, '<<'),
+    'rshift': (operator.rshift, '>>'),
+}
+
+
+def _is_int_operand(x) -> bool:
+    """判断向量化运算的操作数(Python标量或numpy数组)是否为整数"""
+    if isinstance(x, (int, float)):
+        return isinstance(x, int)
+    return x.dtype.kind == 'i'
+
+
+def _int_vector_safe(op: str, x, y) -> bool:
+    """判断两个整数操作数的int64向量化结果是否与Python整数语义一致
+
+    纯Python整数不会溢出, 因此只有结果能确定落在int64内时才允许向量化。
+    """
+    if op in ('or', 'xor', 'and'):
+        return True
+    bound_x, bound_y = _max_abs(x), _max_abs(y)
+    if op in ('add', 'sub'):
+        return bound_x + bound_y <= _INT64_MAX
+    if op == 'mul':
+        return bound_x * bound_y <= _INT64_MAX
+    if op == 'truediv':
+        return max(bound_x, bound_y) <= _MAX_EXACT_INT
+    if op in ('floordiv', 'mod'):
+        return bound_x <= _INT64_MAX  # 排除 INT64_MIN // -1
+    if op in ('lshift', 'rshift'):
+        low = y if isinstance(y, int) else int(y.min())
+        high = y if isinstance(y, int) else int(y.max())
+        if low < 0 or high >= 63:
+            return False
+        return op == 'rshift' or bound_x << high <= _INT64_MAX
+    return False  # 整数幂可能溢出或得到浮点数, 不向量化
+
+
+def _vector_inplace(op: str, data: "array | list", operand: "array | list | int | float") -> bool:
+    """尝试用numpy ufunc的out参数直接在data的缓冲区上完成复合赋值运算
+
+    只有结果类型与存储类型一致(整数存储得到整数结果、浮点存储得到浮点结果)
+    且不会偏离Python语义时才就地计算, 长度与除零检查由调用方完成。
+
+    Returns:
+        bool: 是否已经就地完成计算; False表示调用方需要退回纯Python实现
+    """
+    if _np is None:
+        return False
+    view = _ndview(data)
+    if view is None or len(view) < _VECTOR_THRESHOLD:
+        return False
+    if isinstance(operand, (int, float)):
+        if isinstance(operand, int) and not _INT64_MIN <= operand <= _INT64_MAX:
+            return False
+        other = operand
+    else:
+        other = _ndview(operand)
+        if other is None:
+            return False
+    if view.dtype.kind == 'i':
+        # 真除法总是得到浮点数, 整数存储无法就地容纳
+        if op == 'truediv' or not _is_int_operand(other) or not _int_vector_safe(op, view, other):
+            return False
+    elif op in _BITWISE_OPS:
+        return False  # 浮点数不支持位运算, 交给Python抛出TypeError
+    ufunc = _VECTOR_FUNCS[op]
+    with _np.errstate(all='ignore'):
+        if op != 'pow':
+            ufunc(view, other, out=view)
+            return True
+        # 浮点幂可能溢出或得到复数, 先写入临时数组确认结果有效
+        result = ufunc(view, other)
+        if not _np.isfinite(result).all() and (_np.isfinite(view) & _np.isfinite(other) & ~_np.isfinite(result)).any():
+            return False
+    view[...] = result
+    return True
+
+
+def _vector_binary(op: str, a: "array | list | int | float", b: "array | list | int | float") -> "array | None":
+    """尝试用numpy ufunc完成逐元素二元运算
+
+    a、b为存储或标量, 至少有一个是存储, 长度与除零检查由调用方完成。
+    当numpy不可用、数据量低于阈值, 或结果可能与纯Python语义不一致
+    (整数溢出、负数开方得到复数、浮点溢出)时返回None, 由调用方退回纯Python实现。
+
+    Args:
+        op: 运算名, _VECTOR_FUNCS的键之一
+        a: 左操作数
+        b: 右操作数
+
+    Returns:
+        array | None: 运算结果存储, 或None表示不适用向量化
+    """
+    if _np is None:
+        return None
+    operands = []
+    for x in (a, b):
+        if isinstance(x, (int, float)):
+            if isinstance(x, int) and not _INT64_MIN <= x <= _INT64_MAX:
+                return None
+            operands.append(x)
+        else:
+            view = _ndview(x)
+            if view is None or len(view) < _VECTOR_THRESHOLD:
+                return None
+            operands.append(view)
+    x, y = operands
+    if op in _BITWISE_OPS and not (_is_int_operand(x) and _is_int_operand(y)):
+        return None  # 浮点数不支持位运算, 交给Python抛出TypeError
+    if _is_int_operand(x) and _is_int_operand(y) and not _int_vector_safe(op, x, y):
+        return None
+    # 结果直接写入新分配的紧凑数组, 避免先得到numpy数组再复制一次
+    is_float = op == 'truediv' or not (_is_int_operand(x) and _is_int_operand(y))
+    storage = array('d' if is_float else 'q', [0]) * len(x if not isinstance(x, (int, float)) else y)
+    result = _np.frombuffer(storage, dtype=_np.float64 if is_float else _np.int64)
+    with _np.errstate(all='ignore'):
+        _VECTOR_FUNCS[op](x, y, out=result)
+    if is_float:
+        # Python中浮点幂溢出会抛异常、负数的分数次幂得到复数, numpy则静默产生inf/nan
+        finite = _np.isfinite(result)
+        if not finite.all():
+            inputs_finite = _np.isfinite(x) & _np.isfinite(y)
+            if (inputs_finite & ~finite).any():
+                return None
+    return storage
+
+
+# 比较运算名 -> 运算函数(同时适用于Python标量和numpy数组)
+_COMPARE_FUNCS = {
+    'lt': operator.lt,
+    'le': operator.le,
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'eq': operator.eq,
+    'ne': operator.ne,
+}
+
+
+def _vector_operands(a: "array | list | int | float", b: "array | list | int | float") -> "tuple | None":
+    """把比较/选择的两个操作数转换为numpy视图(标量原样保留), 不适合向量化时返回None
+
+    numpy比较int64与float64时会先把整数转换为浮点数, 超过2**53的整数因此不再精确,
+    这种情况与超出int64的整数标量一样交给Python处理。存储长度低于阈值时同样返回None。
+    """
+    if _np is None:
+        return None
+    operands = []
+    for x in (a, b):
+        if isinstance(x, (int, float)):
+            if isinstance(x, int) and not _INT64_MIN <= x <= _INT64_MAX:
+                return None
+            operands.append(x)
+        else:
+            view = _ndview(x)
+            if view is None or len(view) < _VECTOR_THRESHOLD:
+                return None
+            operands.append(view)
+    x, y = operands
+    if _is_int_operand(x) != _is_int_operand(y) and _max_abs(x if _is_int_operand(x) else y) > _MAX_EXACT_INT:
+        return None
+    return x, y
+
+
+def _compare_storage(op: str, a: "array | list", b: "array | list | int | float") -> bytearray:
+    """逐元素比较存储a与b(存储或标量), 返回每个元素占1字节(0/1)的结果"""
+    func = _COMPARE_FUNCS[op]
+    operands = _vector_operands(a, b)
+    if operands is not None:
+        return bytearray(func(*operands).view(_np.uint8))
+    if isinstance(b, (int, float)):
+        return bytearray(func(v, b) for v in a)
+    return bytearray(map(func, a, b))
+
+
+def _lex_compare(op: str, a: "array | list", b: "array | list") -> bool:
+    """按元组比较规则比较两个等长存储: 由第一个不相等的位置决定结果, 全部相等时比较长度(相等)
+
+    大数组用一次向量化扫描找到第一个不相等的位置, 不需要把两个存储转换为元组。
+    """
+    func = _COMPARE_FUNCS[op]
+    operands = _vector_operands(a, b)
+    if operands is None:
+        return func(tuple(a), tuple(b))
+    x, y = operands
+    different = x != y
+    if not different.any():
+        return op in ('le', 'ge', 'eq')
+    i = int(different.argmax())
+    return func(x[i].item(), y[i].item())
+
+
+def _range_values(start: int | float, step: int | float, indices: range) -> "array | list":
+    """生成等差序列 start + i * step (i取自indices) 的紧凑存储, 逐元素结果与Python计算一致"""
+    if isinstance(start, int) and isinstance(step, int):
+        ends = (start + indices.start * step, start + (indices.start + (len(indices) - 1) * indices.step) * step)
+        if not all(_INT64_MIN <= v <= _INT64_MAX for v in ends):
+            return [start + i * step for i in indices]
+        if _np is None or len(indices) < _VECTOR_THRESHOLD:
+            return array('q', (start + i * step for i in indices))
+        return _from_ndarray(start + _np.arange(indices.start, indices.stop, indices.step, dtype=_np.int64) * step)
+    if _np is None or len(indices) < _VECTOR_THRESHOLD:
+        return array('d', (start + i * step for i in indices))
+    # float64的i * step和加法与Python浮点运算逐元素相同(i < 2**53时转换为浮点数是精确的)
+    return _from_ndarray(start + _np.arange(indices.start, indices.stop, indices.step, dtype=_np.float64) * step)
+
+
+def _summary(items, length: int, formatter: Callable = str) -> str:
+    """把序列格式化为逗号分隔的文本, 超过_REPR_THRESHOLD个元素时只格式化首尾元素, 中间用...代替
+
+    items需要支持切片(Number的切片只复制被显示的元素), 因此耗时与显示的元素数成正比。
+    """
+    if length <= _REPR_THRESHOLD:
+        return ', '.join(map(formatter, items[:length]))
+    head = ', '.join(map(formatter, items[:_REPR_EDGEITEMS]))
+    tail = ', '.join(map(formatter, items[length - _REPR_EDGEITEMS:length]))
+    return f'{head}, ..., {tail}'
+
+
+def _format_chunks(data: "array | list | memoryview", fmt: "str | None", sep: str, integral: bool = False):
+    """按_FORMAT_CHUNK个元素一块格式化存储, 逐块产生文本(块之间不含分隔符)
+
+    每块由map在C层逐元素调用格式化函数, 只有一块的字符串同时存在于内存中。
+    """
+    formatter = str if fmt is None else ('{:' + fmt + '}').format
+    for start in range(0, len(data), _FORMAT_CHUNK):
+        chunk = data[start:start + _FORMAT_CHUNK]
+        if integral and _typecode(chunk) != 'q':
+            chunk = map(int, chunk)
+        yield sep.join(map(formatter, chunk))
+
+
+def _bisect(index: dict, value: int | float, side: str) -> int:
+    """在排序索引上二分查找, NaN视为大于所有值(与numpy.sort/searchsorted一致)"""
+    values, size = index['values'], index['size']
+    if value != value:
+        return size if side == 'left' else len(values)
+    return (bisect_left if side == 'left' else bisect_right)(values, value, 0, size)
+
+
+def _mask_select(data: "array | list | memoryview", bits: bytearray) -> "array | list":
+    """返回存储中掩码为1的元素组成的新存储(可以为空), 大数组使用numpy布尔索引"""
+    view = _ndview(data)
+    if view is not None and len(view) >= _VECTOR_THRESHOLD:
+        return _from_ndarray(view[_np.frombuffer(bits, dtype=_np.bool_)])
+    selected = compress(data, bits)
+    typecode = _typecode(data)
+    return list(selected) if typecode is None else array(typecode, selected)
+
+
+def _sliding_extreme(values: "array | list", window_size: int, greater: bool) -> list:
+    """用单调双端队列计算滑动窗口的最大值(greater=True)或最小值, 总复杂度O(n)"""
+    result = []
+    window = deque()  # 窗口内候选值的下标, 对应的值单调
+    for i, v in enumerate(values):
+        if greater:
+            while window and values[window[-1]] <= v:
+                window.pop()
+        else:
+            while window and values[window[-1]] >= v:
+                window.pop()
+        window.append(i)
+        if window[0] <= i - window_size:
+            window.popleft()
+        if i >= window_size - 1:
+            result.append(values[window[0]])
+    return result
+
+
+def _vector_sliding_extreme(x, window_size: int, ufunc):
+    """van Herk/Gil-Werman算法: 用分块前缀/后缀累积极值向量化地求滑动极值, O(n)
+
+    Args:
+        x: numpy数组
+        window_size: 窗口大小
+        ufunc: _np.maximum或_np.minimum
+    """
+    n = len(x)
+    blocks = -(-n // window_size)
+    padded = _np.concatenate([x, _np.full(blocks * window_size - n, x[-1], dtype=x.dtype)])
+    grid = padded.reshape(blocks, window_size)
+    prefix = ufunc.accumulate(grid, axis=1).ravel()
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    return ufunc(suffix[:n - window_size + 1], prefix[window_size - 1:n])
+
+
+
+def _all_integral(data: "array | list") -> bool:
+    """判断存储中的值是否都是整数, int64数组无需扫描, 大浮点数组使用向量化检查"""
+    if _typecode(data) == 'q':
+        return True
+    x = _ndview(data)
+    if x is not None and len(x) >= _VECTOR_THRESHOLD:
+        return bool(_np.isfinite(x).all() and (x == _np.floor(x)).all())
+    return all(isinstance(v, int) or float(v).is_integer() for v in data)
+
+
+def _vector_gcd_lcm(name: str, a: "array | list", b: "array | list") -> "array | None":
+    """在两个int64数组上向量化计算gcd/lcm(numpy.gcd), 不满足条件或可能溢出时返回None
+
+    调用前需保证lcm的参数中不含0。
+    """
+    if not _typecode(a) == _typecode(b) == 'q':
+        return None
+    if _np is None or len(a) < _VECTOR_THRESHOLD:
+        return None
+    x, y = _ndview(a), _ndview(b)
+    if (x == _INT64_MIN).any() or (y == _INT64_MIN).any():
+        return None  # 绝对值超出int64
+    g = _np.gcd(x, y)
+    if name == 'gcd':
+        return _from_ndarray(g)
+    ax, ay = _np.abs(x) // g, _np.abs(y)
+    if (ax > _INT64_MAX // ay).any():
+        return None
+    return _from_ndarray(ax * ay)
+
+
+_FACTORIAL_MEMO_LIMIT = 1024  # 不超过此值的阶乘保存在共享备忘表中
+_FACTORIAL_STEP_LIMIT = 256  # 相邻参数之差不超过此值时由上一个阶乘连乘得到
+_FACTORIALS = [1]  # _FACTORIALS[k] == k!, 按需增量扩展
+
+
+def _factorials(values: "Iterable[int]") -> list:
+    """阶乘引擎: 计算一组升序排列的非负整数的阶乘
+
+    不超过_FACTORIAL_MEMO_LIMIT的参数查共享备忘表(不够时增量扩展);
+    更大的参数由上一个结果连乘区间内的整数得到, 间隔过大时直接调用math.factorial。
+    """
+    memo = _FACTORIALS
+    results = []
+    prev_n, prev_f = 0, 1
+    for n in values:
+        if n <= _FACTORIAL_MEMO_LIMIT:
+            while len(memo) <= n:
+                memo.append(memo[-1] * len(memo))
+            f = memo[n]
+        elif n - prev_n <= _FACTORIAL_STEP_LIMIT:
+            f = prev_f * math.prod(range(prev_n + 1, n + 1))
+        else:
+            f = math.factorial(n)
+        results.append(f)
+        prev_n, prev_f = n, f
+    return results
+
+
+def _read_file_header(f) -> "tuple[str, int]":
+    """读取并校验Number文件头, 返回(类型码, 元素个数), 文件位置停在数据开头
+
+    Raises:
+        ValueError: 文件不是Number文件,版本不受支持,或文件被截断时
+    """
+    raw = f.read(_FILE_HEADER.size)
+    if len(raw) < _FILE_HEADER.size:
+        raise ValueError("Not a Number file")
+    magic, version, typecode, length, _ = _FILE_HEADER.unpack(raw)
+    typecode = typecode.decode('ascii', 'replace')
+    if magic != _FILE_MAGIC:
+        raise ValueError("Not a Number file")
+    if version > _FILE_VERSION:
+        raise ValueError(f"Unsupported Number file version: {version}")
+    if typecode not in ('q', 'd') or length == 0:
+        raise ValueError("Corrupted Number file header")
+    if os.fstat(f.fileno()).st_size < _FILE_HEADER.size + length * 8:
+        raise ValueError("Truncated Number file")
+    return typecode, length
+
+
+# 文本解析相关常量
+_FLOAT_MARKERS = (b'.', b'e', b'E', b'n', b'N')  # 小数点、指数、nan/inf
+_WHITESPACE = (b' ', b'\t', b'\n', b'\r', b'\x0b', b'\x0c')
+
+
+def _parse_number(token: "str | bytes") -> int | float:
+    """解析单个数字文本, 整数文本得到int, 其他得到float"""
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            raise ValueError(f"Invalid numeric value: {token!r}") from None
+
+
+def _exact_float_result(x) -> bool:
+    """按float64解析的结果中没有可能是超大整数的值(否则需要逐个解析以保持精度)"""
+    return not (_np.abs(x) >= _MAX_EXACT_INT).any()
+
+
+def _parse_numbers(data: bytes) -> "array | list":
+    """把以空白分隔的数字文本批量解析为紧凑存储
+
+    大文本使用numpy.fromstring在C层一次解析: 不含小数点、指数和nan/inf时按int64解析,
+    否则按float64解析; 结果可能溢出(int64饱和)或丢失整数精度、以及格式错误时退回逐个解析,
+    此时错误信息会给出无法解析的文本。
+    """
+    if not data or data.isspace():
+        return array('q')
+    if _np is not None and len(data) >= _VECTOR_THRESHOLD:
+        is_float = any(marker in data for marker in _FLOAT_MARKERS)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', DeprecationWarning)  # 未能读到结尾时numpy只给出警告
+                x = _np.fromstring(data, dtype=_np.float64 if is_float else _np.int64, sep=' ')
+            if is_float and _exact_float_result(x):
+                return _from_ndarray(x)
+            if not is_float and x.max() < _INT64_MAX and x.min() > _INT64_MIN:
+                return _from_ndarray(x)
+        except (DeprecationWarning, ValueError):
+            pass
+    return _to_storage([_parse_number(token) for token in data.split()])
+
+
+@contextmanager
+def _open_binary(source):
+    """以二进制方式打开文件路径、bytes类缓冲区或文件对象"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        yield source
+
+
+@contextmanager
+def _open_text(source):
+    """以文本方式打开文件路径、bytes类缓冲区或文件对象(供csv解析使用)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='', encoding='utf-8') as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.StringIO(bytes(source).decode('utf-8'), newline='')
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    else:
+        wrapper = io.TextIOWrapper(source, encoding='utf-8', newline='')
+        try:
+            yield wrapper
+        finally:
+            wrapper.detach()  # 不关闭调用方的文件对象
+
+
+def _text_blocks(source, sep: "str | None", blocksize: int):
+    """按blocksize字节分块读取数字文本并逐块解析, 跨块的数字拼接到下一块"""
+    separator = sep.encode() if sep else None
+    with _open_binary(source) as f:
+        rest = b''
+        while True:
+            block = f.read(blocksize)
+            if isinstance(block, str):
+                block = block.encode()
+            if not block:
+                break
+            block = rest + block
+            if separator:
+                block = block.replace(separator, b' ')
+            cut = max(block.rfind(c) for c in _WHITESPACE)
+            rest = block[cut + 1:]
+            if cut >= 0:
+                storage = _parse_numbers(block[:cut + 1])
+                if len(storage):
+                    yield storage
+        storage = _parse_numbers(rest)
+        if len(storage):
+            yield storage
+
+
+def _parse_csv_column(lines, column: int, delimiter: str) -> "array | list":
+    """解析CSV中的一列数值
+
+    numpy可用时使用loadtxt的C解析器(先按int64, 失败再按float64), lines为可定位的文件时
+    每次尝试前回到起始位置; 否则或解析失败时用csv模块逐行解析。
+    """
+    start = lines.tell() if hasattr(lines, 'seek') else None
+    if _np is not None:
+        for dtype in (_np.int64, _np.float64):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)  # 没有数据时的警告
+                    x = _np.loadtxt(lines, dtype=dtype, delimiter=delimiter, usecols=column,
+                                    ndmin=1, quotechar='"', comments=None)
+                if dtype is _np.int64 or _exact_float_result(x):
+                    return _from_ndarray(x)
+                break
+            except (ValueError, OverflowError):
+                pass
+            finally:
+                if start is not None:
+                    lines.seek(start)
+    values = []
+    for row in csv.reader(lines, delimiter=delimiter):
+        if not row:
+            continue
+        if column >= len(row):
+            raise ValueError(f"Row has no column {column}: {row!r}")
+        values.append(_parse_number(row[column].strip()))
+    return _to_storage(values)
+
+
+def _csv_chunks(source, column: "int | str", delimiter: str, header: bool, chunksize: "int | None"):
+    """读取CSV的一列, chunksize为None时一次解析全部行, 否则每chunksize行产生一块"""
+    with _open_text(source) as f:
+        if header or isinstance(column, str):
+            names = next(csv.reader([f.readline()], delimiter=delimiter), [])
+            if isinstance(column, str):
+                if column not in names:
+                    raise ValueError(f"Column not found: {column!r}")
+                column = names.index(column)
+        if chunksize is None:
+            storage = _parse_csv_column(f if f.seekable() else f.readlines(), column, delimiter)
+            if len(storage):
+                yield storage
+            return
+        while True:
+            lines = list(islice(f, chunksize))
+            if not lines:
+                return
+            storage = _parse_csv_column(lines, column, delimiter)
+            if len(storage):
+                yield storage
+
+
+def _kernels():
+    """延迟导入批量计算内核模块(number_kernels依赖本模块)"""
+    import number_kernels
+    return number_kernels
+
+_TRACKED_ATTACH = sys.version_info < (3, 13) and os.name == 'posix'  # 附加共享内存时是否会向resource_tracker登记
+
+
+def _attach_shared(name: str) -> SharedMemory:
+    """附加到已存在的共享内存段, 不向resource_tracker登记
+
+    段的生命周期由创建者负责; 附加方若登记, 其退出时会误删仍在使用的段。
+    Python 3.13之前无法关闭登记, 附加后立即撤销这一个段的登记, 不改动全局的resource_tracker。
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    shm = SharedMemory(name=name)
+    if _TRACKED_ATTACH:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _unlink_shared(shm: SharedMemory) -> None:
+    """删除创建者的共享内存段
+
+    multiprocessing启动的子进程与父进程共用同一个resource_tracker, 子进程附加后撤销登记时
+    会同时撤销创建者的登记; 删除前重新登记(重复登记没有影响), 使unlink中的撤销总能匹配。
+    """
+    if _TRACKED_ATTACH:
+        resource_tracker.register(shm._name, 'shared_memory')
+    shm.unlink()
+
+
+def _parallel_chunk(kind: str, func: Callable, sources: tuple):
+    """worker中处理一个分块
+
+    Args:
+        kind: 'map'、'filter'、'zip'或'reduce'
+        func: 用户函数
+        sources: 每个输入一项, 为(共享内存段名, 类型码, 起, 止)或直接传入的分块数据
+
+    Returns:
+        map/filter/zip返回结果存储, reduce返回该分块的归约值
+    """
+    segments, views, chunks = [], [], []
+    try:
+        for source in sources:
+            if isinstance(source, tuple):
+                name, typecode, start, stop = source
+                shm = _attach_shared(name)
+                segments.append(shm)
+                views.append(shm.buf.cast(typecode))
+                views.append(views[-1][start:stop])
+                chunks.append(views[-1])
+            else:
+                chunks.append(source)
+        if kind == 'map':
+            result = [func(v) for v in chunks[0]]
+        elif kind == 'filter':
+            result = [v for v in chunks[0] if func(v)]
+        elif kind == 'zip':
+            result = [func(a, b) for a, b in zip(*chunks)]
+        else:
+            return reduce(func, chunks[0])
+        return _to_storage(result) if result else result
+    finally:
+        for view in reversed(views):
+            view.release()
+        for shm in segments:
+            shm.close()
+
+
+def _parallel_run(executor: Executor, kind: str, func: Callable, datas: tuple, chunksize: "int | None") -> list:
+    """把输入切成分块提交给executor, 按分块顺序返回各分块的结果
+
+    ProcessPoolExecutor下数组存储先放入共享内存, 只向worker传递段名和范围,
+    分块数据不经过pickle; 线程池直接传递零拷贝的memoryview切片。
+    """
+    length = len(datas[0])
+    if chunksize is None:
+        chunksize = max(_VECTOR_THRESHOLD, -(-length // (4 * (os.cpu_count() or 1))))
+    elif chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+    shared = isinstance(executor, ProcessPoolExecutor)
+    segments, views, inputs = [], [], []
+    futures = []
+    try:
+        for data in datas:
+            typecode = _typecode(data)
+            if typecode is not None and shared:
+                nbytes = len(data) * 8
+                shm = SharedMemory(create=True, size=max(nbytes, 1))
+                segments.append(shm)
+                shm.buf[:nbytes] = memoryview(data).cast('B')
+                inputs.append((shm.name, typecode))
+            elif typecode is not None:
+                views.append(memoryview(data))
+                inputs.append(views[-1])
+            else:
+                inputs.append(data)
+        for start in range(0, length, chunksize):
+            stop = min(start + chunksize, length)
+            sources = tuple(
+                (item[0], item[1], start, stop) if isinstance(item, tuple) else item[start:stop]
+                for item in inputs
+            )
+            futures.append(executor.submit(_parallel_chunk, kind, func, sources))
+        return [future.result() for future in futures]
+    finally:
+        wait(futures)
+        for view in views:
+            view.release()
+        for shm in segments:
+            shm.close()
+            _unlink_shared(shm)
+
+class Rolling(object):
+    """
+    Rolling 类型:Number的滑动窗口统计
+
+    通过Number.rolling(window_size)获得, 每个统计量都只遍历一次数据(O(n), 与窗口大小无关):
+    1. sum/mean: 滑动累加和
+    2. max/min: 单调双端队列
+    3. variance/std_dev: 滑动Welford更新(总体方差, 与Number.variance一致)
+    大数组在numpy可用时使用向量化实现(累积和差分、分块前缀/后缀极值)。
+    """
+
+    def __init__(self, data: "array | list", window_size: int) -> None:
+        """构造滑动窗口对象, 一般通过Number.rolling()获得
+
+        参数:
+            data: 多值Number的存储
+            window_size: 窗口大小, 已经由Number.rolling校验
+        """
+        self._data = data
+        self._window = window_size
+
+    def _view(self):
+        """满足向量化条件时返回数据的numpy视图, 否则返回None"""
+        if len(self._data) < _VECTOR_THRESHOLD:
+            return None
+        return _ndview(self._data)
+
+    def _window_sums(self) -> "array | list":
+        """计算每个窗口的和"""
+        data, w = self._data, self._window
+        x = self._view()
+        if x is not None and (x.dtype.kind == 'f' or _max_abs(x) * len(x) <= _MAX_EXACT_INT):
+            cumsum = _np.concatenate([_np.zeros(1, dtype=x.dtype), _np.cumsum(x)])
+            return _from_ndarray(cumsum[w:] - cumsum[:-w])
+        current = sum(data[:w])
+        result = [current]
+        for i in range(w, len(data)):
+            current += data[i] - data[i - w]
+            result.append(current)
+        return _to_storage(result)
+
+    def sum(self) -> "Number":
+        """滑动窗口和
+
+        Returns:
+            Number: 长度为len-window_size+1的Number对象
+        """
+        return Number._from_buffer(self._window_sums())
+
+    def mean(self) -> "Number":
+        """滑动窗口均值
+
+        Returns:
+            Number: 长度为len-window_size+1的Number对象
+        """
+        sums = self._window_sums()
+        w = self._window
+        view = _ndview(sums)
+        if view is not None and len(view) >= _VECTOR_THRESHOLD:
+            return Number._from_buffer(_from_ndarray(view / w))
+        return Number._from_buffer(_to_storage([v / w for v in sums]))
+
+    def _extreme(self, greater: bool) -> "Number":
+        """滑动窗口最大值/最小值的公共实现"""
+        x = self._view()
+        if x is not None:
+            return Number._from_buffer(_from_ndarray(_vector_sliding_extreme(x, self._window, _np.maximum if greater else _np.minimum)))
+        return Number._from_buffer(_to_storage(_sliding_extreme(self._data, self._window, greater)))
+
+    def max(self) -> "Number":
+        """滑动窗口最大值
+
+        Returns:
+            Number: 长度为len-window_size+1的Number对象
+        """
+        return self._extreme(True)
+
+    def min(self) -> "Number":
+        """滑动窗口最小值
+
+        Returns:
+            Number: 长度为len-window_size+1的Number对象
+        """
+        return self._extreme(False)
+
+    def _variances(self) -> array:
+        """计算每个窗口的总体方差"""
+        data, w = self._data, self._window
+        if w == 1:
+            return array('d', bytes(8 * len(data)))
+        x = self._view()
+        if x is not None:
+            # 先减去全局均值再做累积和, 减小大数相减带来的精度损失
+            centered = x - x.mean()
+            zero = _np.zeros(1)
+            s1 = _np.concatenate([zero, _np.cumsum(centered)])
+            s2 = _np.concatenate([zero, _np.cumsum(centered * centered)])
+            window_s1 = s1[w:] - s1[:-w]
+            variances = (s2[w:] - s2[:-w] - window_s1 * window_s1 / w) / w
+            return _from_ndarray(_np.maximum(variances, 0.0))
+        mean = sum(data[:w]) / w
+        m2 = sum((v - mean) ** 2 for v in data[:w])
+        result = array('d', [m2 / w])
+        for i in range(w, len(data)):
+            new, old = data[i], data[i - w]
+            old_mean = mean
+            mean += (new - old) / w
+            m2 += (new - old) * (new - mean + old - old_mean)
+            result.append(max(m2, 0.0) / w)
+        return result
+
+    def variance(self) -> "Number":
+        """滑动窗口总体方差
+
+        Returns:
+            Number: 长度为len-window_size+1的Number对象
+        """
+        return Number._from_buffer(self._variances())
+
+    def std_dev(self) -> "Number":
+        """滑动窗口总体标准差
+
+        Returns:
+            Number: 长度为len-window_size+1的Number对象
+        """
+        variances = self._variances()
+        view = _ndview(variances)
+        if view is not None and len(view) >= _VECTOR_THRESHOLD:
+            return Number._from_buffer(_from_ndarray(_np.sqrt(view)))
+        return Number._from_buffer(array('d', map(math.sqrt, variances)))
+
+
+class StatsAccumulator(object):
+    """
+    StatsAccumulator 类型:单次遍历的流式统计累加器(Welford算法)
+
+    主要特性:
+    1. 一次遍历同时得到count, sum, mean, variance, std_dev, min, max
+    2. 可以由Number对象或任意数值可迭代对象逐步喂入数据
+    3. 支持merge()合并部分结果(Chan并行算法), 可用于分块/并行归约
+    """
+
+    def __init__(self, values: "Number | Iterable[int | float] | None" = None) -> None:
+        """构造累加器
+
+        参数:
+            values: 可选的初始数据, Number对象或数值可迭代对象
+        """
+        self.count = 0
+        self.sum: int | float = 0
+        self._mean = 0.0  # Welford更新使用的滑动均值
+        self._m2 = 0.0  # 与均值之差的平方和
+        self._min: int | float | None = None
+        self._max: int | float | None = None
+        if values is not None:
+            self.update(values)
+
+    def __repr__(self) -> str:
+        """返回累加器的字符串表示"""
+        if not self.count:
+            return 'StatsAccumulator(count=0)'
+        return (f'StatsAccumulator(count={self.count}, mean={self.mean}, '
+                f'variance={self.variance}, min={self._min}, max={self._max})')
+
+    def add(self, value: int | float) -> 'StatsAccumulator':
+        """喂入单个数值
+
+        Raises:
+            TypeError: 当value不是数值类型时
+        """
+        if not isinstance(value, (int, float)):
+            raise TypeError("Value must be int or float")
+        self.count += 1
+        self.sum += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+        return self
+
+    def update(self, values: "Number | Iterable[int | float]") -> 'StatsAccumulator':
+        """喂入一批数值
+
+        Number对象和序列(列表、元组、数组)按批计算后合并, 其他可迭代对象逐个累加。
+
+        Args:
+            values: Number对象或数值可迭代对象
+
+        Returns:
+            StatsAccumulator: self本身, 便于链式调用
+
+        Raises:
+            TypeError: 当包含非数值元素时
+        """
+        if isinstance(values, Number):
+            if isinstance(values._data, (int, float)):
+                return self.add(values._data)
+            return self.merge(StatsAccumulator._from_storage(values._data))
+        if isinstance(values, (list, tuple, array)):
+            if not all(isinstance(v, (int, float)) for v in values):
+                raise TypeError("All values must be int or float")
+            return self.merge(StatsAccumulator._from_storage(values)) if values else self
+        for v in values:
+            self.add(v)
+        return self
+
+    @classmethod
+    def _from_storage(cls, data: "array | list | tuple") -> 'StatsAccumulator':
+        """由一个非空的已校验序列批量计算统计量"""
+        acc = cls()
+        n = len(data)
+        x = _ndview(data) if n >= _VECTOR_THRESHOLD else None
+        if x is not None and (x.dtype.kind == 'f' or _max_abs(x) * n <= _INT64_MAX):
+            total = x.sum()
+            acc.sum = total.item()
+            acc._mean = acc.sum / n
+            centered = x - acc._mean
+            acc._m2 = float(_np.dot(centered, centered))
+            acc._min, acc._max = x.min().item(), x.max().item()
+        else:
+            acc.sum = sum(data)
+            acc._mean = acc.sum / n
+            acc._m2 = sum((v - acc._mean) ** 2 for v in data)
+            acc._min, acc._max = min(data), max(data)
+        acc.count = n
+        return acc
+
+    def merge(self, other: 'StatsAccumulator') -> 'StatsAccumulator':
+        """合并另一个累加器的结果(Chan并行算法)
+
+        Args:
+            other: 另一个StatsAccumulator对象
+
+        Returns:
+            StatsAccumulator: self本身, 可配合functools.reduce做树形归约
+
+        Raises:
+            TypeError: 当参数不是StatsAccumulator时
+        """
+        if not isinstance(other, StatsAccumulator):
+            raise TypeError("Argument must be a StatsAccumulator object")
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.sum, self._mean, self._m2 = other.count, other.sum, other._mean, other._m2
+            self._min, self._max = other._min, other._max
+            return self
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        return self
+
+    def _require_data(self) -> None:
+        """没有数据时抛出异常"""
+        if not self.count:
+            raise ValueError("StatsAccumulator has no data")
+
+    @property
+    def mean(self) -> float:
+        """算术平均值"""
+        self._require_data()
+        return self.sum / self.count
+
+    @property
+    def variance(self) -> float:
+        """总体方差(与Number.variance一致)"""
+        self._require_data()
+        return max(self._m2, 0.0) / self.count
+
+    @property
+    def sample_variance(self) -> float:
+        """样本方差(除以count-1)
+
+        Raises:
+            ValueError: 当数据少于两个时
+        """
+        if self.count < 2:
+            raise ValueError("Sample variance requires at least two values")
+        return max(self._m2, 0.0) / (self.count - 1)
+
+    @property
+    def std_dev(self) -> float:
+        """总体标准差"""
+        return math.sqrt(self.variance)
+
+    @property
+    def min(self) -> int | float:
+        """最小值"""
+        self._require_data()
+        return self._min
+
+    @property
+    def max(self) -> int | float:
+        """最大值"""
+        self._require_data()
+        return self._max
+
+    def to_dict(self) -> dict[str, int | float]:
+        """以字典形式返回全部统计量"""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.mean,
+            'variance': self.variance,
+            'std_dev': self.std_dev,
+            'min': self.min,
+            'max': self.max,
+        }
+
+
+class Mask(object):
+    """
+    Mask 类型:逐元素比较得到的紧凑布尔掩码
+
+    主要特性:
+    1. 每个元素占1字节(0/1), 由Number.lt/le/gt/ge/eq/ne生成
+    2. 掩码之间支持 &、|、^、~ 组合, 整块计算, 不逐元素调用Python函数
+    3. 可用于Number的下标(number[mask])、item_filter(mask)和Number.where(mask, a, b)
+    4. 支持numpy.asarray(mask)零拷贝地得到只读布尔数组
+    """
+    __slots__ = ('_bits',)
+
+    def __init__(self, flags: "Iterable" = ()) -> None:
+        """由任意真值可迭代对象构造掩码
+
+        参数:
+            flags: 可迭代对象, 每个元素按真值转换为True/False; numpy布尔数组整块转换
+        """
+        if _np is not None and isinstance(flags, _np.ndarray):
+            self._bits = bytearray(_np.ascontiguousarray(flags, dtype=_np.bool_).view(_np.uint8))
+        else:
+            self._bits = bytearray(map(bool, flags))
+
+    @classmethod
+    def _from_bits(cls, bits: bytearray) -> 'Mask':
+        """内部使用的构造路径: 直接采用只含0/1的bytearray, 不复制"""
+        obj = cls.__new__(cls)
+        obj._bits = bits
+        return obj
+
+    def __repr__(self) -> str:
+        """返回掩码的字符串表示, 如 Mask([True, False]); 元素很多时只显示首尾元素"""
+        return f'Mask([{_summary(self, len(self))}])'
+
+    def __len__(self) -> int:
+        """返回掩码的长度"""
+        return len(self._bits)
+
+    def __iter__(self):
+        """按顺序迭代每个元素的布尔值"""
+        return map(bool, self._bits)
+
+    def __getitem__(self, index: "int | slice") -> "bool | tuple[bool, ...]":
+        """返回指定位置的布尔值, 切片时与Number一样返回元组"""
+        if isinstance(index, slice):
+            return tuple(map(bool, self._bits[index]))
+        return bool(self._bits[index])
+
+    def __eq__(self, other: object) -> bool:
+        """两个掩码长度相同且每个元素都相同时相等"""
+        if not isinstance(other, Mask):
+            return NotImplemented
+        return self._bits == other._bits
+
+    __hash__ = None
+
+    def _combine(self, other: 'Mask', func: Callable) -> 'Mask':
+        """两个掩码的逐元素逻辑运算
+
+        0/1字节之间的按位运算结果仍是0/1, 因此可以把整个掩码当作一个大整数一次计算,
+        numpy不可用时也在C层完成。
+        """
+        if not isinstance(other, Mask):
+            return NotImplemented
+        if len(self._bits) != len(other._bits):
+            raise ValueError("Cannot combine Masks with different lengths")
+        if _np is not None:
+            x = _np.frombuffer(self._bits, dtype=_np.uint8)
+            y = _np.frombuffer(other._bits, dtype=_np.uint8)
+            return Mask._from_bits(bytearray(func(x, y)))
+        n = len(self._bits)
+        value = func(int.from_bytes(self._bits, 'little'), int.from_bytes(other._bits, 'little'))
+        return Mask._from_bits(bytearray(value.to_bytes(n, 'little')))
+
+    def __and__(self, other: 'Mask') -> 'Mask':
+        """逻辑与(&): 两个掩码都为True的位置为True"""
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other: 'Mask') -> 'Mask':
+        """逻辑或(|): 任一掩码为True的位置为True"""
+        return self._combine(other, operator.or_)
+
+    def __xor__(self, other: 'Mask') -> 'Mask':
+        """逻辑异或(^): 两个掩码不同的位置为True"""
+        return self._combine(other, operator.xor)
+
+    def __invert__(self) -> 'Mask':
+        """逻辑非(~): 逐元素取反, 用bytes.translate在C层完成"""
+        return Mask._from_bits(self._bits.translate(_MASK_INVERT))
+
+    def count(self) -> int:
+        """返回为True的元素个数"""
+        if _np is not None and len(self._bits) >= _VECTOR_THRESHOLD:
+            return int(_np.count_nonzero(_np.frombuffer(self._bits, dtype=_np.uint8)))
+        return self._bits.count(1)
+
+    def any(self) -> bool:
+        """是否至少有一个元素为True"""
+        return 1 in self._bits
+
+    def all(self) -> bool:
+        """是否所有元素都为True"""
+        return 0 not in self._bits
+
+    def indices(self) -> list[int]:
+        """返回为True的元素的下标列表"""
+        if _np is not None and len(self._bits) >= _VECTOR_THRESHOLD:
+            return _np.flatnonzero(_np.frombuffer(self._bits, dtype=_np.uint8)).tolist()
+        return list(compress(range(len(self._bits)), self._bits))
+
+    def __array__(self, dtype=None, copy: "bool | None" = None):
+        """numpy数组协议: 返回与掩码共享内存的只读布尔数组
+
+        Args:
+            dtype: 需要的numpy数据类型, 不是bool时转换(复制)
+            copy: True时总是复制; False时如果无法避免复制则抛出ValueError
+
+        Raises:
+            ValueError: copy=False但无法避免复制时
+        """
+        view = _np.frombuffer(self._bits, dtype=_np.bool_)
+        if copy or (dtype is not None and _np.dtype(dtype) != view.dtype):
+            if copy is False:
+                raise ValueError("Unable to avoid copy while creating an array from this Mask")
+            return _np.array(view, dtype=dtype)
+        view.flags.writeable = False
+        return view
+
+
+_MASK_INVERT = bytes([1, 0]) + bytes(254)  # Mask取反使用的bytes.translate转换表
+
+
 class Number(object):
     """
     Number 类型:统一处理数值计算的核心类
@@ -16,6 +1301,8 @@ class Number(object):
     """
     # 类主体
     __version__='1.9.8'
+    # 使用__slots__代替实例字典: 单值Number只占用一个对象头加三个指针
+    __slots__ = ('_data', 'SM', '_cache')
     def __init__(self, *value: int | float,show_mode:str='__visual__') -> None:
         """构造新的Number实例
         
@@ -23,6 +1310,8 @@ class Number(object):
             *value: 一个或多个数值,支持以下形式:
                   - 单个数值: 创建单值对象
                   - 多个数值: 创建多值对象
+                  - 单个array/memoryview/numpy数组: 采用其缓冲区,
+                    int64/float64数据不复制(见from_buffer)
             show_mode: 显示模式设置
                       - '__visual__': 带值标签显示(默认),如"value:1"
                       - '__value__': 仅显示数值,如"1"
@@ -33,12 +1322,180 @@ class Number(object):
         """
         if not value:
             raise ValueError("Number must be initialized with at least one value")
+        if len(value) == 1 and (isinstance(value[0], (array, memoryview)) or _np is not None and isinstance(value[0], _np.ndarray)):
+            # 数组、memoryview和numpy数组直接采用其缓冲区, 不复制, 按外部缓冲区处理(不缓存聚合量)
+            storage = _adopt_buffer(value[0])
+            if not len(storage):
+                raise ValueError("Number must be initialized with at least one value")
+            self._data = storage[0] if len(storage) == 1 else storage
+            self.SM = show_mode
+            self._cache = None
+            return
         if not all(isinstance(v, (int, float)) for v in value):
             raise TypeError("All values must be int or float")
-        # 如果只有一个值,直接存储该值；否则存储为元组
-        self.value: int | float | tuple[int | float, ...] = value[0] if len(value) == 1 else value
+        # 如果只有一个值,直接存储该值；否则存储为紧凑数组(每个元素8字节)
+        self._data: int | float | array | list | memoryview = value[0] if len(value) == 1 else _to_storage(value)
         self.SM=show_mode
+        self._cache: dict | None = None  # 派生聚合量的缓存, 由修改操作负责维护
     
+    @classmethod
+    def _from_buffer(cls, data: "array | list") -> "Number":
+        """内部使用的可信构造路径: 直接采用已有的存储, 不复制、不展开参数、不逐元素检查类型
+
+        与Number(*values)一致, 只有一个值时得到单值Number。
+
+        Args:
+            data: 由本类产生的紧凑存储(array('q')/array('d'))或列表, 不能为空
+        """
+        if isinstance(data, memoryview):
+            data = array(data.format, data.tobytes())  # 不与共享内存中的数据共用缓冲区
+        obj = cls.__new__(cls)
+        obj._data = data[0] if len(data) == 1 else data
+        obj.SM = '__visual__'
+        obj._cache = None
+        return obj
+
+    @classmethod
+    def _from_values(cls, values: "Iterable[int | float]") -> "Number":
+        """由内部计算产生的数值构造Number, 只做一次紧凑存储转换, 不逐元素检查类型"""
+        return cls._from_buffer(_to_storage(values if isinstance(values, (list, tuple)) else list(values)))
+
+    @classmethod
+    def from_iterable(cls, values: "Iterable[int | float]", show_mode: str = '__visual__') -> "Number":
+        """由任意数值可迭代对象构造Number
+
+        与Number(*values)等价, 但不需要把数据展开为可变参数,适合大量数据。
+
+        Args:
+            values: 数值可迭代对象
+            show_mode: 显示模式设置,同构造器
+
+        Returns:
+            Number: 新的Number对象
+
+        Raises:
+            ValueError: 未提供任何数值
+            TypeError: 提供的值不是整数或浮点数
+        """
+        if isinstance(values, array) and values.typecode in ('q', 'd'):
+            if not values:
+                raise ValueError("Number must be initialized with at least one value")
+            obj = cls._from_buffer(values[:])  # 复制出的数组由Number独占, 可以缓存聚合量
+            obj.SM = show_mode
+            return obj
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        if not values:
+            raise ValueError("Number must be initialized with at least one value")
+        if not all(isinstance(v, (int, float)) for v in values):
+            raise TypeError("All values must be int or float")
+        obj = cls._from_buffer(_to_storage(values))
+        obj.SM = show_mode
+        return obj
+
+    @classmethod
+    def from_buffer(cls, buffer: "array | memoryview | list | tuple", show_mode: str = '__visual__') -> "Number":
+        """由调用方保证可信的数据直接构造Number, 跳过逐元素类型检查
+
+        - 支持缓冲区协议的一维int64/float64数据(array('q')/array('d')、memoryview、numpy数组等):
+          引用原缓冲区, 不复制, 原地修改会双向反映; 原数据可能被外部修改, 因此不缓存聚合量;
+          改变长度的操作(append、删除等)会先复制一份, 之后不再共享
+        - 其他数值类型的缓冲区: 整块复制为紧凑存储
+        - 列表/元组: 转换为紧凑存储
+
+        Args:
+            buffer: 可信的数值数据
+            show_mode: 显示模式设置,同构造器
+
+        Returns:
+            Number: 新的Number对象
+
+        Raises:
+            ValueError: 数据为空或不是一维时
+            TypeError: 缓冲区的元素类型不是数值时
+        """
+        storage = _to_storage(buffer) if isinstance(buffer, (list, tuple)) else _adopt_buffer(buffer)
+        if not len(storage):
+            raise ValueError("Number must be initialized with at least one value")
+        obj = cls.__new__(cls)
+        obj._data = storage[0] if len(storage) == 1 else storage
+        obj.SM = show_mode
+        obj._cache = None
+        return obj
+
+    @classmethod
+    def from_text(cls, source, sep: "str | None" = None, blocksize: "int | None" = None,
+                  show_mode: str = '__visual__') -> "Number | ChunkedNumber":
+        """从文本文件或缓冲区批量读取以空白分隔的数值
+
+        整块文本交给numpy在C层一次解析(不可用时逐个解析), 不经过逐元素的类型检查。
+        全部为整数文本时得到整数存储。
+
+        Args:
+            source: 文件路径、bytes类缓冲区或已打开的文件对象
+            sep: 额外的分隔符(如','),空白总是分隔符
+            blocksize: 指定时每次读取这么多字节并逐块解析, 返回ChunkedNumber
+            show_mode: 显示模式设置,同构造器
+
+        Returns:
+            Number | ChunkedNumber: 读取的数值; 指定blocksize时为按块流式读取的ChunkedNumber
+
+        Raises:
+            ValueError: 没有数值或包含无法解析的文本时
+        """
+        if blocksize is not None:
+            if blocksize <= 0:
+                raise ValueError("blocksize must be positive")
+            if isinstance(source, (str, os.PathLike, bytes, bytearray, memoryview)):
+                return ChunkedNumber._derive(lambda: _text_blocks(source, sep, blocksize))
+            return ChunkedNumber(_text_blocks(source, sep, blocksize))  # 文件对象只能读取一遍
+        with _open_binary(source) as f:
+            data = f.read()
+        if isinstance(data, str):
+            data = data.encode()
+        if sep:
+            data = data.replace(sep.encode(), b' ')
+        return cls._from_parsed(_parse_numbers(data), show_mode)
+
+    @classmethod
+    def from_csv(cls, source, column: "int | str" = 0, delimiter: str = ',', header: bool = False,
+                 chunksize: "int | None" = None, show_mode: str = '__visual__') -> "Number | ChunkedNumber":
+        """从CSV文件或缓冲区读取一列数值
+
+        numpy可用时使用loadtxt的C解析器, 否则用csv模块逐行解析。
+        该列全部为整数文本时得到整数存储。
+
+        Args:
+            source: 文件路径、bytes类缓冲区或已打开的文件对象
+            column: 列下标,或列名(此时第一行视为表头)
+            delimiter: 字段分隔符
+            header: 第一行是否为表头
+            chunksize: 指定时每次读取这么多行并逐块解析, 返回ChunkedNumber
+            show_mode: 显示模式设置,同构造器
+
+        Returns:
+            Number | ChunkedNumber: 读取的数值; 指定chunksize时为按块流式读取的ChunkedNumber
+
+        Raises:
+            ValueError: 没有数值、找不到列或包含无法解析的文本时
+        """
+        if chunksize is not None:
+            if chunksize <= 0:
+                raise ValueError("chunksize must be positive")
+            if isinstance(source, (str, os.PathLike, bytes, bytearray, memoryview)):
+                return ChunkedNumber._derive(lambda: _csv_chunks(source, column, delimiter, header, chunksize))
+            return ChunkedNumber(_csv_chunks(source, column, delimiter, header, chunksize))
+        storages = list(_csv_chunks(source, column, delimiter, header, None))
+        return cls._from_parsed(storages[0] if storages else array('q'), show_mode)
+
+    @classmethod
+    def _from_parsed(cls, storage: "array | list", show_mode: str) -> "Number":
+        """由解析得到的存储构造Number"""
+        if not len(storage):
+            raise ValueError("Number must be initialized with at least one value")
+        obj = cls._from_buffer(storage)
+        obj.SM = show_mode
+        return obj
+
     def __str__(self) -> str:
         """返回对象的字符串表示
         
@@ -47,13 +1504,108 @@ class Number(object):
                 - '__visual__': 'value:值' 
                 - '__value__': 仅值
                 - 其他: 'NONE'
+                超过1000个元素时只显示首尾各3个元素, 如 value:(0, 1, 2, ..., 997, 998, 999)
         """
-        if self.SM=='__visual__':
-            return f'value:{self.value}'
-        elif self.SM=='__value__':
-            return str(self.value)
-        else:
+        if self.SM not in ('__visual__', '__value__'):
             return 'NONE'
+        if isinstance(self._data, (int, float)):
+            text = str(self._data)
+        else:
+            text = f'({_summary(self, len(self))})'  # 与str(tuple)相同, 元素很多时只显示首尾元素
+        return f'value:{text}' if self.SM == '__visual__' else text
+
+    @property
+    def value(self) -> int | float | tuple[int | float, ...]:
+        """数值内容
+
+        Returns:
+            int | float | tuple: 单值时为该数值, 多值时为包含所有值的元组(兼容旧接口)
+
+        同时含有整数和浮点数的多值按array('d')存储, 其中的整数以浮点数返回,
+        例如Number(1, 2.5, 3).value为(1.0, 2.5, 3.0)。
+        """
+        data = self._data
+        return data if isinstance(data, (int, float)) else tuple(data)
+
+    @value.setter
+    def value(self, value: "int | float | tuple | list") -> None:
+        """设置数值内容, 多值会被重新转换为紧凑存储"""
+        self._data = value if isinstance(value, (int, float)) else _to_storage(tuple(value))
+        self._cache = None
+
+    # 缓存维护
+    def _cache_dict(self) -> dict:
+        """返回缓存字典, 第一次查询聚合量时才创建(单值Number不会分配字典)
+
+        存储是外部缓冲区(memoryview)时, 数据可能被其他对象或进程修改, 不缓存聚合量。
+        """
+        if isinstance(self._data, memoryview):
+            return {}
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        return cache
+
+    def _cache_append(self, values: "Iterable[int | float]") -> None:
+        """追加元素后增量更新缓存的聚合量, 无法增量维护的缓存直接丢弃
+
+        与_cache_remove相同, 只增量维护整数的和; 浮点数的和丢弃后重新计算,
+        因为Python 3.12起sum()对浮点数使用补偿求和, 逐个相加的结果可能与之不同。
+        统计累加器合并后的方差与重新计算的结果在舍入上不同(整数数据也是如此), 同样丢弃,
+        保证聚合量与修改历史无关。
+        """
+        cache = self._cache
+        if not cache:
+            return
+        kept = {}
+        total = cache.get('sum')
+        if isinstance(total, int) and all(isinstance(v, int) for v in values):
+            kept['sum'] = total + sum(values)
+        if 'max' in cache:
+            kept['max'] = max(cache['max'], *values)
+        if 'min' in cache:
+            kept['min'] = min(cache['min'], *values)
+        if 'sorted' in cache and len(values) <= _INDEX_INSERT_LIMIT:
+            index = cache['sorted']
+            start = len(self._data)
+            try:
+                for offset, v in enumerate(values):
+                    if v == v:
+                        pos = bisect_right(index['values'], v, 0, index['size'])
+                        index['size'] += 1
+                    else:  # NaN排在最后, 不参与二分查找
+                        pos = len(index['values'])
+                    index['values'].insert(pos, v)
+                    index['order'].insert(pos, start + offset)
+                kept['sorted'] = index
+            except (TypeError, OverflowError):
+                pass  # 值放不进索引的存储类型(如整数数组追加浮点数), 丢弃索引
+        self._cache = kept
+
+    def _cache_remove(self, old: int | float, new: "int | float | None" = None) -> None:
+        """删除(new为None)或替换一个元素后增量更新缓存的聚合量
+
+        整数的和可以精确地增量维护; 浮点数的和增量维护会产生舍入误差, 因此丢弃。
+        被移除的值恰好是最大/最小值时无法得知新的极值, 同样丢弃。
+        """
+        cache = self._cache
+        if not cache:
+            return
+        kept = {}
+        total = cache.get('sum')
+        if isinstance(total, int) and isinstance(old, int) and (new is None or isinstance(new, int)):
+            kept['sum'] = total - old + (new or 0)
+        if 'max' in cache:
+            if new is not None and new >= cache['max']:
+                kept['max'] = new
+            elif old != cache['max']:
+                kept['max'] = cache['max'] if new is None else max(cache['max'], new)
+        if 'min' in cache:
+            if new is not None and new <= cache['min']:
+                kept['min'] = new
+            elif old != cache['min']:
+                kept['min'] = cache['min'] if new is None else min(cache['min'], new)
+        self._cache = kept
 
     def __repr__(self) -> str:
         """返回对象的详细字符串表示
@@ -62,11 +1614,11 @@ class Number(object):
             str: 构造器格式的字符串, 如:
                 - 单值:Number(值)
                 - 多值:Number(值1, 值2, ...)
+                - 超过1000个元素:Number(值1, 值2, 值3, ..., 倒数第3个值, 倒数第2个值, 最后一个值)
         """
-        if isinstance(self.value, (int, float)):
-            return f'Number({self.value})'
-        values_str = ', '.join(str(v) for v in self.value)
-        return f'Number({values_str})'
+        if isinstance(self._data, (int, float)):
+            return f'Number({self._data})'
+        return f'Number({_summary(self, len(self))})'
     def __add__(self, other: "Number | int | float") -> 'Number' :
         """实现加法运算
 
@@ -90,17 +1642,23 @@ class Number(object):
             TypeError: 当使用不支持的类型进行相加时
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                return Number(self.value + other.value)
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return Number(self._data + other._data)
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 raise ValueError("Cannot add single value with multiple values")
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 raise ValueError("Cannot add Numbers with different lengths")
-            return Number(*(a + b for a, b in zip(self.value, other.value)))
+            result = _vector_binary('add', self._data, other._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(a + b for a, b in zip(self._data, other._data))
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return Number(self.value + other)
-            return Number(*(v + other for v in self.value))
+            if isinstance(self._data, (int, float)):
+                return Number(self._data + other)
+            result = _vector_binary('add', self._data, other)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(v + other for v in self._data)
         raise TypeError(f"Unsupported operand type for +: '{type(self).__name__}' and '{type(other).__name__}'")
     def __radd__(self, other: int | float) -> 'Number':
 
@@ -143,17 +1701,23 @@ class Number(object):
             TypeError: 当使用不支持的类型进行相减时
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                return Number(self.value - other.value)
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return Number(self._data - other._data)
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 raise ValueError("Cannot subtract single value with multiple values")
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 raise ValueError("Cannot subtract Numbers with different lengths")
-            return Number(*(a - b for a, b in zip(self.value, other.value)))
+            result = _vector_binary('sub', self._data, other._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(a - b for a, b in zip(self._data, other._data))
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return Number(self.value - other)
-            return Number(*(v - other for v in self.value))
+            if isinstance(self._data, (int, float)):
+                return Number(self._data - other)
+            result = _vector_binary('sub', self._data, other)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(v - other for v in self._data)
         raise TypeError(f"Unsupported operand type for -: '{type(self).__name__}' and '{type(other).__name__}'")
     def __rsub__(self, other: int | float) -> 'Number':
         """实现反向减法运算(当左操作数不是Number类型时被调用)
@@ -174,9 +1738,12 @@ class Number(object):
             TypeError: 当左操作数不是int或float类型时
         """
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return Number(other - self.value)
-            return Number(*(other - v for v in self.value))
+            if isinstance(self._data, (int, float)):
+                return Number(other - self._data)
+            result = _vector_binary('sub', other, self._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(other - v for v in self._data)
         raise TypeError(f"Unsupported operand type for -: '{type(other).__name__}' and '{type(self).__name__}'")
     def __mul__(self, other: "Number | int | float") -> 'Number':
         """实现乘法运算
@@ -201,17 +1768,23 @@ class Number(object):
             TypeError: 当使用不支持的类型进行相乘时
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                return Number(self.value * other.value)
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return Number(self._data * other._data)
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 raise ValueError("Cannot multiply single value with multiple values")
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 raise ValueError("Cannot multiply Numbers with different lengths")
-            return Number(*(a * b for a, b in zip(self.value, other.value)))
+            result = _vector_binary('mul', self._data, other._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(a * b for a, b in zip(self._data, other._data))
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return Number(self.value * other)
-            return Number(*(v * other for v in self.value))
+            if isinstance(self._data, (int, float)):
+                return Number(self._data * other)
+            result = _vector_binary('mul', self._data, other)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(v * other for v in self._data)
         raise TypeError(f"Unsupported operand type for *: '{type(self).__name__}' and '{type(other).__name__}'")
     def __rmul__(self, other: int | float) -> 'Number':
         """实现反向乘法运算(当左操作数不是Number类型时被调用)
@@ -255,23 +1828,29 @@ class Number(object):
             ZeroDivisionError: 当除数为零时
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                if other.value == 0:
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                if other._data == 0:
                     raise ZeroDivisionError("Division by zero")
-                return Number(self.value / other.value)
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+                return Number(self._data / other._data)
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 raise ValueError("Cannot divide single value with multiple values")
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 raise ValueError("Cannot divide Numbers with different lengths")
-            if any(v == 0 for v in other.value):
+            if _contains_zero(other._data):
                 raise ZeroDivisionError("Division by zero")
-            return Number(*(a / b for a, b in zip(self.value, other.value)))
+            result = _vector_binary('truediv', self._data, other._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(a / b for a, b in zip(self._data, other._data))
         if isinstance(other, (int, float)):
             if other == 0:
                 raise ZeroDivisionError("Division by zero")
-            if isinstance(self.value, (int, float)):
-                return Number(self.value / other)
-            return Number(*(v / other for v in self.value))
+            if isinstance(self._data, (int, float)):
+                return Number(self._data / other)
+            result = _vector_binary('truediv', self._data, other)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(v / other for v in self._data)
         raise TypeError(f"Unsupported operand type for /: '{type(self).__name__}' and '{type(other).__name__}'")
     def __rtruediv__(self, other: int | float) -> 'Number':
         """实现反向除法运算(当左操作数不是Number类型时被调用)
@@ -293,13 +1872,16 @@ class Number(object):
             ZeroDivisionError: 当Number对象中包含零值时
         """
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                if self.value == 0:
+            if isinstance(self._data, (int, float)):
+                if self._data == 0:
                     raise ZeroDivisionError("Division by zero")
-                return Number(other / self.value)
-            if any(v == 0 for v in self.value):
+                return Number(other / self._data)
+            if _contains_zero(self._data):
                 raise ZeroDivisionError("Division by zero")
-            return Number(*(other / v for v in self.value))
+            result = _vector_binary('truediv', other, self._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number._from_values(other / v for v in self._data)
         raise TypeError(f"Unsupported operand type for /: '{type(other).__name__}' and '{type(self).__name__}'")
     def __eq__(self, other: "Number | int | float") -> bool:
         """实现相等性比较
@@ -320,15 +1902,18 @@ class Number(object):
             bool: 是否相等
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                return self.value == other.value
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return self._data == other._data
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 return False
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 return False
-            return all(a == b for a, b in zip(self.value, other.value))
+            operands = _vector_operands(self._data, other._data)
+            if operands is not None:
+                return bool(_np.array_equal(*operands))
+            return all(a == b for a, b in zip(self._data, other._data))
         if isinstance(other, (int, float)):
-            return isinstance(self.value, (int, float)) and self.value == other
+            return isinstance(self._data, (int, float)) and self._data == other
         return False
     def __lt__(self, other: "Number | int | float") -> bool:
         """实现小于比较
@@ -353,16 +1938,16 @@ class Number(object):
             TypeError: 当使用不支持的类型进行比较时
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                return self.value < other.value
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return self._data < other._data
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 raise ValueError("Cannot compare single value with multiple values")
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 raise ValueError("Cannot compare Numbers with different lengths")
-            return tuple(self.value) < tuple(other.value)
+            return _lex_compare('lt', self._data, other._data)
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return self.value < other
+            if isinstance(self._data, (int, float)):
+                return self._data < other
             raise ValueError("Cannot compare multiple values with single value")
         raise TypeError(f"Cannot compare {type(self).__name__} with {type(other).__name__}")
     def __gt__(self, other: "Number | int | float") -> bool:
@@ -388,94 +1973,258 @@ class Number(object):
             TypeError: 当使用不支持的类型进行比较时
         """
         if isinstance(other, Number):
-            if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-                return self.value > other.value
-            if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return self._data > other._data
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
                 raise ValueError("Cannot compare single value with multiple values")
-            if len(self.value) != len(other.value):
+            if len(self._data) != len(other._data):
                 raise ValueError("Cannot compare Numbers with different lengths")
-            return tuple(self.value) > tuple(other.value)
+            return _lex_compare('gt', self._data, other._data)
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return self.value > other
+            if isinstance(self._data, (int, float)):
+                return self._data > other
             raise ValueError("Cannot compare multiple values with single value")
         raise TypeError(f"Cannot compare {type(self).__name__} with {type(other).__name__}")
     def __le__(self, other: "Number | int | float") -> bool:
         """实现小于等于比较
 
-        通过组合__lt__和__eq__的结果实现
-        继承了这两个方法的所有规则和限制
+        规则与__lt__相同(多值之间按照元组比较规则), 只进行一次比较
 
         Args:
             other: 另一个Number对象或数值
 
         Returns:
             bool: 是否小于等于
-        """
-        return self < other or self == other
-
-    def __ge__(self, other: "Number | int | float") -> bool:
-        """实现大于等于比较
-
-        通过组合__gt__和__eq__的结果实现
-        继承了这两个方法的所有规则和限制
 
-        Args:
-            other: 另一个Number对象或数值
+        Raises:
+            ValueError: 当试图比较单值和多值,或多值间长度不同时
+            TypeError: 当使用不支持的类型进行比较时
+        """
+        if isinstance(other, Number):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return self._data <= other._data
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
+                raise ValueError("Cannot compare single value with multiple values")
+            if len(self._data) != len(other._data):
+                raise ValueError("Cannot compare Numbers with different lengths")
+            return _lex_compare('le', self._data, other._data)
+        if isinstance(other, (int, float)):
+            if isinstance(self._data, (int, float)):
+                return self._data <= other
+            raise ValueError("Cannot compare multiple values with single value")
+        raise TypeError(f"Cannot compare {type(self).__name__} with {type(other).__name__}")
+
+
+    def __ge__(self, other: "Number | int | float") -> bool:
+        """实现大于等于比较
+
+        规则与__lt__相同(多值之间按照元组比较规则), 只进行一次比较
+
+        Args:
+            other: 另一个Number对象或数值
 
         Returns:
             bool: 是否大于等于
+
+        Raises:
+            ValueError: 当试图比较单值和多值,或多值间长度不同时
+            TypeError: 当使用不支持的类型进行比较时
+        """
+        if isinstance(other, Number):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return self._data >= other._data
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
+                raise ValueError("Cannot compare single value with multiple values")
+            if len(self._data) != len(other._data):
+                raise ValueError("Cannot compare Numbers with different lengths")
+            return _lex_compare('ge', self._data, other._data)
+        if isinstance(other, (int, float)):
+            if isinstance(self._data, (int, float)):
+                return self._data >= other
+            raise ValueError("Cannot compare multiple values with single value")
+        raise TypeError(f"Cannot compare {type(self).__name__} with {type(other).__name__}")
+    def _compare_mask(self, op: str, other: "Number | int | float") -> Mask:
+        """逐元素比较的公共实现
+
+        规则与加法相同(单值与多值不能混合、多值间长度必须相同), int/float标量广播到每个元素。
+        大数组由numpy一次比较完成, 结果直接作为掩码。
+
+        Raises:
+            ValueError: 当试图比较单值和多值,或多值间长度不同时
+            TypeError: 当使用不支持的类型进行比较时
+        """
+        data = self._data
+        if isinstance(other, Number):
+            if isinstance(data, (int, float)) and isinstance(other._data, (int, float)):
+                return Mask._from_bits(bytearray([_COMPARE_FUNCS[op](data, other._data)]))
+            if isinstance(data, (int, float)) or isinstance(other._data, (int, float)):
+                raise ValueError("Cannot compare single value with multiple values")
+            if len(data) != len(other._data):
+                raise ValueError("Cannot compare Numbers with different lengths")
+            return Mask._from_bits(_compare_storage(op, data, other._data))
+        if isinstance(other, (int, float)):
+            if isinstance(data, (int, float)):
+                return Mask._from_bits(bytearray([_COMPARE_FUNCS[op](data, other)]))
+            return Mask._from_bits(_compare_storage(op, data, other))
+        raise TypeError(f"Cannot compare {type(self).__name__} with {type(other).__name__}")
+
+    def lt(self, other: "Number | int | float") -> Mask:
+        """逐元素小于比较, 返回掩码
+
+        Args:
+            other: 等长的Number对象或int/float标量
+
+        Returns:
+            Mask: 每个位置是否小于other的对应值
+        """
+        return self._compare_mask('lt', other)
+
+    def le(self, other: "Number | int | float") -> Mask:
+        """逐元素小于等于比较, 返回掩码"""
+        return self._compare_mask('le', other)
+
+    def gt(self, other: "Number | int | float") -> Mask:
+        """逐元素大于比较, 返回掩码"""
+        return self._compare_mask('gt', other)
+
+    def ge(self, other: "Number | int | float") -> Mask:
+        """逐元素大于等于比较, 返回掩码"""
+        return self._compare_mask('ge', other)
+
+    def eq(self, other: "Number | int | float") -> Mask:
+        """逐元素相等比较, 返回掩码"""
+        return self._compare_mask('eq', other)
+
+    def ne(self, other: "Number | int | float") -> Mask:
+        """逐元素不等比较, 返回掩码"""
+        return self._compare_mask('ne', other)
+
+    @staticmethod
+    def where(mask: Mask, a: "Number | int | float", b: "Number | int | float") -> 'Number':
+        """按掩码逐元素选择: 掩码为True的位置取a的值, 否则取b的值
+
+        a、b可以是与掩码等长的多值Number, 也可以是广播到每个位置的int/float标量。
+        大数组由numpy.where一次完成。
+
+        Args:
+            mask: 选择掩码
+            a: 掩码为True时的取值来源
+            b: 掩码为False时的取值来源
+
+        Returns:
+            Number: 选择结果, 长度与掩码相同
+
+        Raises:
+            ValueError: 当掩码为空,或Number的长度与掩码不同时
+            TypeError: 当参数类型不正确时
         """
-        return self > other or self == other
-    def __getitem__(self, index: int) -> int | float:
+        if not isinstance(mask, Mask):
+            raise TypeError("mask must be a Mask object")
+        if not len(mask):
+            raise ValueError("Mask must not be empty")
+        operands = []
+        for x in (a, b):
+            if isinstance(x, Number):
+                if isinstance(x._data, (int, float)) or len(x._data) != len(mask):
+                    raise ValueError("Operands must have the same length as the mask")
+                operands.append(x._data)
+            elif isinstance(x, (int, float)):
+                operands.append(x)
+            else:
+                raise TypeError(f"Unsupported operand type for where: '{type(x).__name__}'")
+        x, y = operands
+        if _np is not None and len(mask) >= _VECTOR_THRESHOLD:
+            if isinstance(x, (int, float)) and isinstance(y, (int, float)):
+                # 两个标量: 按_to_storage的规则确定结果类型, 需要退回列表时不向量化
+                pair = _to_storage([x, y])
+                views = None if isinstance(pair, list) else tuple(_ndview(pair))
+            else:
+                views = _vector_operands(x, y)
+            if views is not None:
+                return Number._from_buffer(_from_ndarray(_np.where(_np.asarray(mask), *views)))
+        x = repeat(x) if isinstance(x, (int, float)) else x
+        y = repeat(y) if isinstance(y, (int, float)) else y
+        return Number._from_values([u if flag else v for flag, u, v in zip(mask._bits, x, y)])
+
+    def __getitem__(self, index: "int | slice | Mask") -> "int | float | tuple[int | float, ...]":
         """获取指定索引位置的值
 
         通过此方法实现下标访问语法(如: obj[0]),只适用于多值Number对象。
         对单值Number对象使用此方法会引发TypeError异常。
+        下标为等长的Mask时返回掩码为True的元素组成的元组(与切片一样可以为空)。
 
         Args:
-            index: 要访问的索引位置
+            index: 要访问的索引位置、切片或掩码
 
         Returns:
-            int | float: 指定位置的数值
+            int | float | tuple: 指定位置的数值; 切片或掩码时为元组(与value的格式一致)
 
         Raises:
             TypeError: 当对单值Number对象使用索引操作时
             IndexError: 当索引超出范围时
+            ValueError: 当掩码长度与对象不同时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot index single value")
-        return self.value[index]
+        if isinstance(index, Mask):
+            if len(index) != len(self._data):
+                raise ValueError("Mask must have the same length as the Number")
+            return tuple(_mask_select(self._data, index._bits))
+        item = self._data[index]
+        return tuple(item) if isinstance(index, slice) else item
+
+    def _resize(self, action: Callable) -> None:
+        """执行会改变存储长度的操作
+
+        存储是外部缓冲区(memoryview),或数组正被导出(如numpy视图仍然存在)而无法改变长度时,
+        先复制为独占的数组再执行, 之后不再与外部共享。
+        """
+        data = self._data
+        if isinstance(data, memoryview):
+            data = self._data = array(data.format, data.tobytes())
+        try:
+            action(data)
+        except BufferError:
+            data = self._data = data[:]
+            action(data)
 
     def __setitem__(self, index: int, value: int | float) -> None:
         """设置指定索引位置的值
 
         通过此方法实现下标赋值语法(如: obj[0] = 1),只适用于多值Number对象。
         對單值Number對象使用此方法會引發TypeError異常。
-        修改后的结果会被转换为tuple以保持不可变性。
+        直接在底层数组上原地修改,必要时提升存储类型(如整数数组写入浮点数)。
 
         Args:
             index: 要设置的索引位置
             value: 要设置的新值,必须是int或float类型
 
         Raises:
-            TypeError: 当对单值Number对象使用索引操作时,或value不是数值类型时
+            TypeError: 当对单值Number对象使用索引操作时,index不是整数时,或value不是数值类型时
             IndexError: 当索引超出范围时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot index single value")
+        if not isinstance(index, int):
+            raise TypeError("Number indices must be integers")
         if not isinstance(value, (int, float)):
             raise TypeError("Value must be int or float")
-        value_list = list(self.value)
-        value_list[index] = value
-        self.value = tuple(value_list)
+        old = self._data[index]
+        if _storage_fits(self._data, value):
+            self._data[index] = value
+        else:
+            # 类型提升(如整数数组写入浮点数)只会发生一次
+            value_list = list(self._data)
+            value_list[index] = value
+            self._data = _to_storage(value_list)
+        self._cache_remove(old, value)  # 写入成功后才更新缓存
 
     def __delitem__(self, index: int) -> None:
         """删除指定索引位置的值
 
         通过此方法实现del语句(如: del obj[0]),只适用于多值Number对象。
         对单值Number对象使用此方法会引发TypeError异常。
-        删除后的结果会被转换为tuple以保持不可变性。
+        直接在底层数组上原地删除。
 
         Args:
             index: 要删除的索引位置
@@ -484,45 +2233,132 @@ class Number(object):
             TypeError: 当对单值Number对象使用索引操作时
             IndexError: 当索引超出范围时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot index single value")
-        value_list = list(self.value)
-        del value_list[index]
-        self.value = tuple(value_list)
+        old = self._data[index]
+        self._resize(lambda data: data.__delitem__(index))
+        if isinstance(index, slice):
+            self._cache = None  # 删除了多个元素, 不做增量维护
+        else:
+            self._cache_remove(old)
 
     # 数学方法
-    def sqrt(self) -> 'Number':
+    _MATH_ERRORS = {
+        'sqrt': "Cannot calculate square root of negative Number",
+        'log': "Cannot calculate logarithm of non-positive Number",
+    }
+
+    def _unary_math(self, name: str, out: "Number | None" = None, base: float = math.e) -> 'Number':
+        """sqrt/exp/log/sin/cos/tan的公共实现
+
+        大数组使用numpy ufunc单次遍历整个缓冲区, 不做预扫描:
+        计算完成后检查结果掩码(有效输入得到nan/inf)来判断定义域错误或溢出,
+        异常类型与逐元素调用math函数时一致。其他情况单次map调用math函数。
+
+        Args:
+            name: 函数名
+            out: 可选的输出Number,长度必须与本对象相同;其浮点缓冲区会被直接覆盖
+            base: 对数的底数,只对log有效
+
+        Returns:
+            Number: 结果;指定out时返回out本身
+
+        Raises:
+            ValueError: 定义域错误(此时out的内容不确定),log的底数不是正数,或out长度不匹配时
+            ZeroDivisionError: log的底数为1时
+            OverflowError: exp结果溢出时
+            TypeError: out不是Number对象时
+        """
+        scale = None
+        if name == 'log':
+            _check_log_base(base)
+            func = lambda v: math.log(v, base)
+            if base != math.e:
+                scale = math.log(base)
+        else:
+            func = getattr(math, name)
+        data = self._data
+        if out is not None:
+            if not isinstance(out, Number):
+                raise TypeError("out must be a Number object")
+            if isinstance(out._data, (int, float)) != isinstance(data, (int, float)) or len(out) != len(self):
+                raise ValueError("out must have the same length as the Number")
+            out._cache = None  # 出错时out的缓冲区可能已被部分改写, 先丢弃其缓存
+        try:
+            if isinstance(data, (int, float)):
+                if out is None:
+                    return Number(func(data))
+                out._data = func(data)
+                return out
+            target = out._data if out is not None and _typecode(out._data) == 'd' else None
+            if isinstance(target, memoryview) and target.readonly:
+                target = None  # 只读的共享数据, 交给out的存储替换逻辑报错
+            x = _ndview(data) if len(data) >= _VECTOR_THRESHOLD else None
+            if x is not None:
+                storage = target if target is not None else array('d', bytes(8 * len(data)))
+                result = _ndview(storage)
+                with _np.errstate(all='ignore'):
+                    getattr(_np, name)(x, out=result)
+                    if name == 'exp':
+                        if (_np.isinf(result) & _np.isfinite(x)).any():
+                            raise OverflowError("math range error")
+                    else:
+                        invalid = _np.isnan(result)
+                        if name == 'log':
+                            invalid |= result == -_np.inf
+                        if invalid.any() and (invalid & ~_np.isnan(x)).any():
+                            raise ValueError("math domain error")
+                    if scale is not None:
+                        result /= scale
+                del result
+            else:
+                storage = array('d', map(func, data))
+                if target is not None:
+                    target[:] = storage
+                    storage = target
+        except ValueError as e:
+            if name in self._MATH_ERRORS:
+                raise ValueError(self._MATH_ERRORS[name]) from None
+            raise e
+        if out is None:
+            return Number._from_buffer(storage)
+        out._data = storage
+        out._cache = None
+        return out
+
+    def sqrt(self, out: "Number | None" = None) -> 'Number':
         """返回平方根
 
         计算每个数值的平方根。对于单值Number对象直接计算,对于多值Number对象分别计算每个值的平方根。
 
+        Args:
+            out: 可选的输出Number,结果直接写入其缓冲区
+
         Returns:
             Number: 包含平方根结果的Number对象
 
         Raises:
             ValueError: 当试图计算负数的平方根时
         """
-        if isinstance(self.value, (int, float)):
-            if self.value < 0:
-                raise ValueError("Cannot calculate square root of negative Number")
-            return Number(math.sqrt(self.value))
-        if any(v < 0 for v in self.value):
-            raise ValueError("Cannot calculate square root of negative Number")
-        return Number(*(math.sqrt(v) for v in self.value))
+        return self._unary_math('sqrt', out)
 
-    def exp(self) -> 'Number':
+    def exp(self, out: "Number | None" = None) -> 'Number':
         """返回e的self.value次方
 
         计算以自然对数e为底的指数函数值。对于单值Number对象直接计算,对于多值Number对象分别计算每个值。
 
+        Args:
+            out: 可选的输出Number,结果直接写入其缓冲区
+
         Returns:
             Number: 包含指数运算结果的Number对象
+
+        Raises:
+            OverflowError: 当结果超出浮点数范围时
         """
-        if isinstance(self.value, (int, float)):
-            return Number(math.exp(self.value))
-        return Number(*(math.exp(v) for v in self.value))
+        return self._unary_math('exp', out)
 
-    def log(self, base: float = math.e) -> 'Number':
+    def log(self, base: float = math.e, out: "Number | None" = None) -> 'Number':
         """返回以base为底的对数
 
         计算对数值。默认使用自然对数e作为底数,也可以指定其他正数作为底数。
@@ -530,59 +2366,58 @@ class Number(object):
 
         Args:
             base: 对数的底数,默认为自然对数e
+            out: 可选的输出Number,结果直接写入其缓冲区
 
         Returns:
             Number: 包含对数运算结果的Number对象
 
         Raises:
-            ValueError: 当试图计算非正数的对数时
+            ValueError: 当试图计算非正数的对数,或底数不是正数时
+            ZeroDivisionError: 当底数为1时
         """
-        if isinstance(self.value, (int, float)):
-            if self.value <= 0:
-                raise ValueError("Cannot calculate logarithm of non-positive Number")
-            return Number(math.log(self.value, base))
-        if any(v <= 0 for v in self.value):
-            raise ValueError("Cannot calculate logarithm of non-positive Number")
-        return Number(*(math.log(v, base) for v in self.value))
+        return self._unary_math('log', out, base)
 
-    def sin(self) -> "Number":
+    def sin(self, out: "Number | None" = None) -> "Number":
         """返回正弦值
 
         计算正弦值。对于单值Number对象直接计算,对于多值Number对象分别计算每个值的正弦。
         输入值应为弧度制。
 
+        Args:
+            out: 可选的输出Number,结果直接写入其缓冲区
+
         Returns:
             Number: 包含正弦值的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(math.sin(self.value))
-        return Number(*(math.sin(v) for v in self.value))
+        return self._unary_math('sin', out)
 
-    def cos(self) -> "Number":
+    def cos(self, out: "Number | None" = None) -> "Number":
         """返回余弦值
 
         计算余弦值。对于单值Number对象直接计算,对于多值Number对象分别计算每个值的余弦。
         输入值应为弧度制。
 
+        Args:
+            out: 可选的输出Number,结果直接写入其缓冲区
+
         Returns:
             Number: 包含余弦值的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(math.cos(self.value))
-        return Number(*(math.cos(v) for v in self.value))
+        return self._unary_math('cos', out)
 
-    def tan(self) -> "Number":
+    def tan(self, out: "Number | None" = None) -> "Number":
         """返回正切值
 
         计算正切值。对于单值Number对象直接计算,对于多值Number对象分别计算每个值的正切。
         输入值应为弧度制。
 
+        Args:
+            out: 可选的输出Number,结果直接写入其缓冲区
+
         Returns:
             Number: 包含正切值的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(math.tan(self.value))
-        return Number(*(math.tan(v) for v in self.value))
+        return self._unary_math('tan', out)
 
     # 实用方法
     def is_integer(self) -> bool:
@@ -594,9 +2429,9 @@ class Number(object):
         Returns:
             bool: 如果所有值都是整数返回True,否则返回False
         """
-        if isinstance(self.value, (int, float)):
-            return isinstance(self.value, int) or float(self.value).is_integer()
-        return all(isinstance(v, int) or float(v).is_integer() for v in self.value)
+        if isinstance(self._data, (int, float)):
+            return isinstance(self._data, int) or float(self._data).is_integer()
+        return _all_integral(self._data)
 
     def to_int(self) -> "Number":
         """转换为整数
@@ -606,9 +2441,9 @@ class Number(object):
         Returns:
             Number: 包含转换后整数值的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(int(self.value))
-        return Number(*(int(v) for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(int(self._data))
+        return Number._from_values(int(v) for v in self._data)
 
     def to_float(self) -> "Number":
         """转换为浮点数
@@ -618,9 +2453,9 @@ class Number(object):
         Returns:
             Number: 包含转换后浮点数值的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(float(self.value))
-        return Number(*(float(v) for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(float(self._data))
+        return Number._from_values(float(v) for v in self._data)
 
     def factorial(self) -> "Number":
         """计算阶乘
@@ -633,13 +2468,21 @@ class Number(object):
         Raises:
             ValueError: 当值为负数或非整数时
         """
-        if isinstance(self.value, (int, float)):
-            if not (isinstance(self.value, int) or float(self.value).is_integer()) or self.value < 0:
+        data = self._data
+        if isinstance(data, (int, float)):
+            if not (isinstance(data, int) or float(data).is_integer()) or data < 0:
                 raise ValueError("Factorial is only defined for non-negative integers")
-            return Number(math.factorial(int(self.value)))
-        if not self.is_integer() or any(v < 0 for v in self.value):
+            return Number(_factorials([int(data)])[0])
+        if not _all_integral(data) or self.min() < 0:
             raise ValueError("Factorial is only defined for non-negative integers")
-        return Number(*(math.factorial(int(v)) for v in self.value))
+        x = _ndview(data) if len(data) >= _VECTOR_THRESHOLD and _typecode(data) == 'q' else None
+        if x is not None and self.max() <= 20:
+            # 20!以内的结果都能用int64表示, 直接查表
+            table = _np.array(_factorials(range(21)), dtype=_np.int64)
+            return Number._from_buffer(_from_ndarray(table[x]))
+        distinct = sorted({int(v) for v in self._unique_table()['values']})
+        table = dict(zip(distinct, _factorials(distinct)))
+        return Number._from_values([table[v] for v in data])
 
     def is_positive(self) -> bool:
         """判断是否全为正数
@@ -649,9 +2492,9 @@ class Number(object):
         Returns:
             bool: 如果所有值都大于0返回True,否则返回False
         """
-        if isinstance(self.value, (int, float)):
-            return self.value > 0
-        return all(v > 0 for v in self.value)
+        if isinstance(self._data, (int, float)):
+            return self._data > 0
+        return all(v > 0 for v in self._data)
 
     def is_negative(self) -> bool:
         """判断是否全为负数
@@ -661,9 +2504,9 @@ class Number(object):
         Returns:
             bool: 如果所有值都小于0返回True,否则返回False
         """
-        if isinstance(self.value, (int, float)):
-            return self.value < 0
-        return all(v < 0 for v in self.value)
+        if isinstance(self._data, (int, float)):
+            return self._data < 0
+        return all(v < 0 for v in self._data)
 
     def is_zero(self) -> bool:
         """判断是否全为零
@@ -673,9 +2516,9 @@ class Number(object):
         Returns:
             bool: 如果所有值都等于0返回True,否则返回False
         """
-        if isinstance(self.value, (int, float)):
-            return self.value == 0
-        return all(v == 0 for v in self.value)
+        if isinstance(self._data, (int, float)):
+            return self._data == 0
+        return all(v == 0 for v in self._data)
     def __hash__(self) -> int:
         """实现哈希函数,使Number对象可以用作字典键或集合元素
 
@@ -689,8 +2532,8 @@ class Number(object):
         Raises:
             TypeError: 当尝试对多值Number对象进行哈希操作时
         """
-        if isinstance(self.value, (int, float)):
-            return hash(self.value)
+        if isinstance(self._data, (int, float)):
+            return hash(self._data)
         raise TypeError("unhashable type: 'Number' with multiple values")
 
     def __len__(self) -> int:
@@ -699,9 +2542,9 @@ class Number(object):
         Returns:
             int: 单值Number对象返回1,多值Number对象返回其包含的值的数量
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             return 1
-        return len(self.value)
+        return len(self._data)
 
     def __neg__(self) -> 'Number':
         """实现一元负号操作
@@ -709,9 +2552,9 @@ class Number(object):
         Returns:
             Number: 包含所有值的相反数的新Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(-self.value)
-        return Number(*(-v for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(-self._data)
+        return Number._from_values(-v for v in self._data)
 
     def __pos__(self) -> 'Number':
         """实现一元正号操作(保持值不变)
@@ -719,7 +2562,9 @@ class Number(object):
         Returns:
             Number: 包含相同值的新Number对象
         """
-        return Number(*self.value) if isinstance(self.value, tuple) else Number(self.value)
+        if isinstance(self._data, (int, float)):
+            return Number(self._data)
+        return Number._from_buffer(self._data[:])
 
     def __abs__(self) -> 'Number':
         """返回绝对值
@@ -727,9 +2572,9 @@ class Number(object):
         Returns:
             Number: 包含所有值的绝对值的新Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(abs(self.value))
-        return Number(*(abs(v) for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(abs(self._data))
+        return Number._from_values(abs(v) for v in self._data)
 
     def __pow__(self, power: "Number | int | float") -> 'Number':
         """实现幂运算
@@ -745,17 +2590,23 @@ class Number(object):
             TypeError: 当使用不支持的类型作为指数时
         """
         if isinstance(power, Number):
-            if isinstance(self.value, (int, float)) and isinstance(power.value, (int, float)):
-                return Number(self.value ** power.value)
-            if isinstance(self.value, (int, float)) or isinstance(power.value, (int, float)):
+            if isinstance(self._data, (int, float)) and isinstance(power._data, (int, float)):
+                return Number(self._data ** power._data)
+            if isinstance(self._data, (int, float)) or isinstance(power._data, (int, float)):
                 raise ValueError("Cannot use single value with multiple values in power operation")
-            if len(self.value) != len(power.value):
+            if len(self._data) != len(power._data):
                 raise ValueError("Cannot use Numbers with different lengths in power operation")
-            return Number(*(a ** b for a, b in zip(self.value, power.value)))
+            result = _vector_binary('pow', self._data, power._data)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number.from_iterable(a ** b for a, b in zip(self._data, power._data))
         if isinstance(power, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return Number(self.value ** power)
-            return Number(*(v ** power for v in self.value))
+            if isinstance(self._data, (int, float)):
+                return Number(self._data ** power)
+            result = _vector_binary('pow', self._data, power)
+            if result is not None:
+                return Number._from_buffer(result)
+            return Number.from_iterable(v ** power for v in self._data)
         raise TypeError(f"Unsupported operand type for **: '{type(self).__name__}' and '{type(power).__name__}'")
 
     def __rpow__(self, other: int | float) -> 'Number':
@@ -772,8 +2623,8 @@ class Number(object):
             ValueError: 当Number对象包含多个值时
         """
         if isinstance(other, (int, float)):
-            if isinstance(self.value, (int, float)):
-                return Number(other ** self.value)
+            if isinstance(self._data, (int, float)):
+                return Number(other ** self._data)
             raise ValueError("Cannot use multiple values as exponent with single base")
         raise TypeError(f"Unsupported operand type for **: '{type(other).__name__}' and '{type(self).__name__}'")
 
@@ -787,13 +2638,16 @@ class Number(object):
             TypeError: 当对单值Number对象使用此方法时
             IndexError: 当索引超出范围时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot delete items from single value")
-        value_list = list(self.value)
+        self._cache = None
         # 从大到小排序索引,以避免删除元素后索引位置变化导致的问题
-        for index in sorted(indices, reverse=True):
-            del value_list[index]
-        self.value = tuple(value_list) if value_list else 0
+        def delete(data):
+            for index in sorted(indices, reverse=True):
+                del data[index]
+        self._resize(delete)
+        if not self._data:
+            self._data = 0
 
     def append(self, value: int | float) -> None:
         """添加一个值到Number对象末尾
@@ -806,12 +2660,14 @@ class Number(object):
         """
         if not isinstance(value, (int, float)):
             raise TypeError("Value must be int or float")
-        if isinstance(self.value, (int, float)):
-            self.value = (self.value, value)
+        if isinstance(self._data, (int, float)):
+            self._data = _to_storage((self._data, value))
+            return
+        self._cache_append((value,))
+        if _storage_fits(self._data, value):
+            self._resize(lambda data: data.append(value))  # 均摊O(1)
         else:
-            value_list = list(self.value)
-            value_list.append(value)
-            self.value = tuple(value_list)
+            self._data = _to_storage([*self._data, value])
 
     def extend(self, values: "list | tuple | Number") -> None:
         """扩展Number对象,添加多个值
@@ -823,19 +2679,25 @@ class Number(object):
             TypeError: 当values中包含非数值类型元素时
         """
         if isinstance(values, Number):
-            if isinstance(values.value, (int, float)):
-                self.append(values.value)
+            if isinstance(values._data, (int, float)):
+                self.append(values._data)
             else:
-                self.extend(values.value)
+                self.extend(values._data)
         else:
             if not all(isinstance(v, (int, float)) for v in values):
                 raise TypeError("All values must be int or float")
-            if isinstance(self.value, (int, float)):
-                self.value = (self.value, *values)
+            if isinstance(self._data, (int, float)):
+                self._data = _to_storage((self._data, *values))
+                return
+            if not values:
+                return
+            self._cache_append(values)
+            if isinstance(values, array) and _typecode(self._data) == values.typecode:
+                self._resize(lambda data: data.extend(values))  # 同类型数组直接整块复制
+            elif all(_storage_fits(self._data, v) for v in values):
+                self._resize(lambda data: data.extend(iter(values)))
             else:
-                value_list = list(self.value)
-                value_list.extend(values)
-                self.value = tuple(value_list)
+                self._data = _to_storage([*self._data, *values])
 
 
 
@@ -849,19 +2711,24 @@ class Number(object):
             Number: 包含四舍五入后值的新Number对象
 
         """
-        if isinstance(self.value, (int, float)):
-            return Number(round(self.value, ndigits))
-        return Number(*(round(v, ndigits) for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(round(self._data, ndigits))
+        return Number._from_values(round(v, ndigits) for v in self._data)
 
     def sum(self) -> int | float:
         """计算所有值的总和
 
+        结果会被缓存,对象未被修改时再次调用为O(1)。
+
         Returns:
             int | float: 单值直接返回,多值返回所有值的和
         """
-        if isinstance(self.value, (int, float)):
-            return self.value
-        return sum(self.value)
+        if isinstance(self._data, (int, float)):
+            return self._data
+        cache = self._cache_dict()
+        if 'sum' not in cache:
+            cache['sum'] = sum(self._data)
+        return cache['sum']
 
     def mean(self) -> float:
         """计算算术平均值
@@ -869,29 +2736,39 @@ class Number(object):
         Returns:
             float: 所有值的算术平均值
         """
-        if isinstance(self.value, (int, float)):
-            return float(self.value)
-        return sum(self.value) / len(self.value)
+        if isinstance(self._data, (int, float)):
+            return float(self._data)
+        return self.sum() / len(self._data)
 
     def max(self) -> int | float:
         """返回最大值
 
+        结果会被缓存,对象未被修改时再次调用为O(1)。
+
         Returns:
             int | float: 所有值中的最大值
         """
-        if isinstance(self.value, (int, float)):
-            return self.value
-        return max(self.value)
+        if isinstance(self._data, (int, float)):
+            return self._data
+        cache = self._cache_dict()
+        if 'max' not in cache:
+            cache['max'] = max(self._data)
+        return cache['max']
 
     def min(self) -> int | float:
         """返回最小值
 
+        结果会被缓存,对象未被修改时再次调用为O(1)。
+
         Returns:
             int | float: 所有值中的最小值
         """
-        if isinstance(self.value, (int, float)):
-            return self.value
-        return min(self.value)
+        if isinstance(self._data, (int, float)):
+            return self._data
+        cache = self._cache_dict()
+        if 'min' not in cache:
+            cache['min'] = min(self._data)
+        return cache['min']
     def gcd(self, other: "Number") -> "Number":
         """计算最大公约数
 
@@ -908,26 +2785,24 @@ class Number(object):
             TypeError: 当参数类型不正确时
             ValueError: 当值不是整数时
         """
-        def _gcd(a: int, b: int) -> int:
-            while b:
-                a, b = b, a % b
-            return abs(a)
-
         if not isinstance(other, Number):
             raise TypeError("Argument must be a Number object")
 
-        if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-            if not (float(self.value).is_integer() and float(other.value).is_integer()):
+        if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+            if not (float(self._data).is_integer() and float(other._data).is_integer()):
                 raise ValueError("Values must be integers")
-            return Number(_gcd(int(self.value), int(other.value)))
+            return Number(math.gcd(int(self._data), int(other._data)))
 
         if len(self) != len(other):
             raise ValueError("Cannot calculate GCD of Numbers with different lengths")
 
-        if not all(float(v).is_integer() for v in self.value + other.value):
+        if not (_all_integral(self._data) and _all_integral(other._data)):
             raise ValueError("All values must be integers")
 
-        return Number(*[_gcd(int(a), int(b)) for a, b in zip(self.value, other.value)])
+        storage = _vector_gcd_lcm('gcd', self._data, other._data)
+        if storage is not None:
+            return Number._from_buffer(storage)
+        return Number._from_values(map(math.gcd, map(int, self._data), map(int, other._data)))
 
     def lcm(self, other: "Number") -> "Number":
         """计算最小公倍数
@@ -946,26 +2821,29 @@ class Number(object):
             ValueError: 当值不是整数时
             ZeroDivisionError: 当任一数为0时
         """
-        def _lcm(a: int, b: int) -> int:
-            if a == 0 or b == 0:
-                raise ZeroDivisionError("Cannot calculate LCM with zero")
-            return abs(a * b) // math.gcd(a, b)
-
         if not isinstance(other, Number):
             raise TypeError("Argument must be a Number object")
 
-        if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-            if not (float(self.value).is_integer() and float(other.value).is_integer()):
+        if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+            if not (float(self._data).is_integer() and float(other._data).is_integer()):
                 raise ValueError("Values must be integers")
-            return Number(_lcm(int(self.value), int(other.value)))
+            if self._data == 0 or other._data == 0:
+                raise ZeroDivisionError("Cannot calculate LCM with zero")
+            return Number(math.lcm(int(self._data), int(other._data)))
 
         if len(self) != len(other):
             raise ValueError("Cannot calculate LCM of Numbers with different lengths")
 
-        if not all(float(v).is_integer() for v in self.value + other.value):
+        if not (_all_integral(self._data) and _all_integral(other._data)):
             raise ValueError("All values must be integers")
 
-        return Number(*[_lcm(int(a), int(b)) for a, b in zip(self.value, other.value)])
+        if _contains_zero(self._data) or _contains_zero(other._data):
+            raise ZeroDivisionError("Cannot calculate LCM with zero")
+
+        storage = _vector_gcd_lcm('lcm', self._data, other._data)
+        if storage is not None:
+            return Number._from_buffer(storage)
+        return Number._from_values(map(math.lcm, map(int, self._data), map(int, other._data)))
 
     def abs(self) -> "Number":
         """返回绝对值
@@ -973,9 +2851,9 @@ class Number(object):
         Returns:
             Number: 包含绝对值的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(abs(self.value))
-        return Number(*(abs(v) for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(abs(self._data))
+        return Number._from_values(abs(v) for v in self._data)
 
     def power(self, n: int) -> "Number":
         """计算幂
@@ -994,9 +2872,9 @@ class Number(object):
         if not isinstance(n, int):
             raise TypeError("Exponent must be an integer")
 
-        if isinstance(self.value, (int, float)):
-            return Number(pow(self.value, n))
-        return Number(*(pow(v, n) for v in self.value))
+        if isinstance(self._data, (int, float)):
+            return Number(pow(self._data, n))
+        return Number._from_values(pow(v, n) for v in self._data)
 
     def average(self) -> float:
         """计算平均值
@@ -1004,29 +2882,182 @@ class Number(object):
         Returns:
             float: 所有元素的平均值
         """
-        if isinstance(self.value, (int, float)):
-            return float(self.value)
-        return sum(self.value) / len(self.value)
+        if isinstance(self._data, (int, float)):
+            return float(self._data)
+        return self.sum() / len(self._data)
+
+
+    def _sorted_index(self) -> dict:
+        """排序二级索引
+
+        'values'为升序排列的值, 'order'为每个值在原数据中的下标(置换数组),
+        'size'为非NaN值的个数(NaN排在最后, 不参与二分查找)。
+        第一次查询时构建(大数组使用numpy稳定排序), 缓存在_cache中:
+        append/extend少量数据时增量插入, 其他修改操作会使其失效。
+        外部缓冲区(memoryview)上的数据不缓存, 每次查询都会重建。
+
+        Returns:
+            dict: 'values'、'order'、'size'
+        """
+        data = self._data
+        if isinstance(data, (int, float)):
+            return {'values': (data,), 'order': (0,), 'size': int(data == data)}
+        cache = self._cache_dict()
+        index = cache.get('sorted')
+        if index is not None:
+            return index
+        x = _ndview(data) if len(data) >= _VECTOR_THRESHOLD else None
+        if x is not None:
+            order = _np.argsort(x, kind='stable')
+            values = x[order]
+            nans = int(_np.isnan(values).sum()) if values.dtype.kind == 'f' else 0
+            index = {'values': _from_ndarray(values), 'order': _from_ndarray(order), 'size': len(values) - nans}
+        else:
+            order = sorted((i for i, v in enumerate(data) if v == v), key=data.__getitem__)
+            size = len(order)
+            order.extend(i for i, v in enumerate(data) if v != v)
+            typecode = _typecode(data)
+            values = [data[i] for i in order]
+            index = {'values': list(values) if typecode is None else array(typecode, values),
+                     'order': array('q', order), 'size': size}
+        cache['sorted'] = index
+        return index
+
+    def searchsorted(self, value: "int | float | Number | Iterable[int | float]",
+                     side: str = 'left') -> "int | list[int]":
+        """在排序索引上二分查找value在升序排列中的插入位置
+
+        索引只在第一次查询时构建一次(O(n log n)), 之后每次查询为O(log n)。
+
+        Args:
+            value: 要查找的值; 为Number或可迭代对象时批量查找
+            side: 'left'返回第一个不小于value的位置, 'right'返回第一个大于value的位置
+
+        Returns:
+            int | list[int]: 插入位置; 批量查找时为位置列表
+
+        Raises:
+            ValueError: 当side不是'left'或'right'时
+        """
+        if side not in ('left', 'right'):
+            raise ValueError("side must be 'left' or 'right'")
+        index = self._sorted_index()
+        if isinstance(value, (int, float)):
+            return _bisect(index, value, side)
+        queries = value._data if isinstance(value, Number) else value
+        if isinstance(queries, (int, float)):
+            queries = (queries,)
+        elif _typecode(queries) is None:
+            queries = list(queries)
+        if _np is not None and len(queries) >= _VECTOR_THRESHOLD:
+            # numpy.searchsorted同样把NaN排在最后, 结果与逐个二分查找一致
+            storage = queries if _typecode(queries) is not None else _to_storage(queries)
+            operands = _vector_operands(index['values'], storage)
+            if operands is not None:
+                return _np.searchsorted(*operands, side=side).tolist()
+        return [_bisect(index, q, side) for q in queries]
+
+    def rank(self, value: int | float) -> int:
+        """返回严格小于value的元素个数(O(log n)), NaN视为大于所有值
+
+        Args:
+            value: 要查询的值
+
+        Returns:
+            int: 严格小于value的元素个数
+        """
+        return _bisect(self._sorted_index(), value, 'left')
+
+    def range_count(self, lo: int | float, hi: int | float) -> int:
+        """返回落在闭区间[lo, hi]内的元素个数(O(log n))
+
+        Args:
+            lo: 区间下界
+            hi: 区间上界
+
+        Returns:
+            int: 满足 lo <= v <= hi 的元素个数, lo > hi 或边界为NaN时为0
+        """
+        if lo != lo or hi != hi:
+            return 0
+        index = self._sorted_index()
+        values, size = index['values'], index['size']
+        return max(0, bisect_right(values, hi, 0, size) - bisect_left(values, lo, 0, size))
+
+    def nearest(self, value: int | float, return_index: bool = False) -> "int | float | tuple[int | float, int]":
+        """返回与value最接近的元素(O(log n)), 距离相同时取较小的元素
+
+        Args:
+            value: 要查询的值
+            return_index: 是否同时返回该元素在原数据中的下标
+
+        Returns:
+            int | float | tuple: 最接近的元素; return_index为True时返回(元素, 下标)
 
+        Raises:
+            ValueError: 当value为NaN,或数据中没有可比较的值(全部为NaN)时
+        """
+        if value != value:
+            raise ValueError("Cannot search for NaN")
+        index = self._sorted_index()
+        values, size = index['values'], index['size']
+        if not size:
+            raise ValueError("No comparable values to search")
+        pos = bisect_left(values, value, 0, size)
+        if pos == size or (pos > 0 and value - values[pos - 1] <= values[pos] - value):
+            pos -= 1
+        return (values[pos], index['order'][pos]) if return_index else values[pos]
 
     def count(self, value: int | float) -> int:
         """计算指定值出现的次数
 
+        已经建立排序索引(searchsorted/rank/range_count/nearest)时在索引上二分查找,
+        否则使用去重引擎的哈希表。
+
         Args:
             value: 要计数的值
 
         Returns:
-            int: 值出现的次数
+            int: 值出现的次数,与去重引擎共用一次遍历,之后的查询为O(1)
+        """
+        if isinstance(self._data, (int, float)):
+            return 1 if self._data == value else 0
+        if self._cache and 'sorted' in self._cache and isinstance(value, (int, float)):
+            return self.range_count(value, value)  # NaN不等于任何值, range_count返回0
+        table = self._unique_table()
+        if 'lookup' not in table:
+            table['lookup'] = dict(zip(table['values'], table['counts']))
+        try:
+            return table['lookup'].get(value, 0)
+        except TypeError:  # 不可哈希的值不可能出现在Number中
+            return 0
+
+    def _order_statistics(self, ranks: "Iterable[int]") -> dict[int, int | float]:
+        """返回指定名次(从0开始)的顺序统计量
+
+        大数组使用numpy.partition一次性选出所有名次(introselect,O(n));
+        否则对数据只排序一次,供所有名次共用。
+
+        Args:
+            ranks: 要查询的名次
+
+        Returns:
+            dict[int, int | float]: 名次 -> 该名次上的值
         """
-        if isinstance(self.value, (int, float)):
-            return 1 if self.value == value else 0
-        return sum(1 for v in self.value if v == value)
+        ranks = sorted(set(ranks))
+        x = _ndview(self._data) if len(self._data) >= _VECTOR_THRESHOLD else None
+        if x is not None:
+            selected = _np.partition(x, ranks)
+            return {k: selected[k].item() for k in ranks}
+        sorted_values = sorted(self._data)
+        return {k: sorted_values[k] for k in ranks}
 
     def median(self) -> float:
         """计算中位数
 
         如果元素个数为奇数,返回中间的数;
         如果元素个数为偶数,返回中间两个数的平均值.
+        使用选择算法而不是完整排序。
 
         Returns:
             float: 中位数
@@ -1034,13 +3065,84 @@ class Number(object):
         Raises:
             TypeError: 当对象为单值Number时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot calculate median of single value")
-        sorted_values = sorted(self.value)
-        n = len(sorted_values)
+        n = len(self._data)
         if n % 2 == 0:
-            return (sorted_values[n//2 - 1] + sorted_values[n//2]) / 2
-        return float(sorted_values[n//2])
+            stats = self._order_statistics((n//2 - 1, n//2))
+            return (stats[n//2 - 1] + stats[n//2]) / 2
+        return float(self._order_statistics((n//2,))[n//2])
+
+    def quantiles(self, qs: "Iterable[float]") -> list[float]:
+        """同时计算多个分位数
+
+        使用线性插值(与numpy.quantile默认方式一致),
+        所有分位数共用同一次选择/排序,适合一次性查询p50/p90/p99等。
+
+        Args:
+            qs: 分位数列表,每个值都在[0, 1]之间
+
+        Returns:
+            list[float]: 与qs顺序对应的分位数
+
+        Raises:
+            TypeError: 当对象为单值Number时
+            ValueError: 当分位数不在[0, 1]之间时
+        """
+        if isinstance(self._data, (int, float)):
+            raise TypeError("Cannot calculate quantile of single value")
+        qs = list(qs)
+        if not all(isinstance(q, (int, float)) and 0 <= q <= 1 for q in qs):
+            raise ValueError("Quantiles must be between 0 and 1")
+        n = len(self._data)
+        positions = [(n - 1) * q for q in qs]
+        ranks = set()
+        for h in positions:
+            lo = int(h)
+            ranks.add(lo)
+            if lo + 1 < n:
+                ranks.add(lo + 1)
+        stats = self._order_statistics(ranks)
+        result = []
+        for h in positions:
+            lo = int(h)
+            if lo + 1 >= n or h == lo:
+                result.append(float(stats[lo]))
+            else:
+                result.append(stats[lo] + (h - lo) * (stats[lo + 1] - stats[lo]))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """计算分位数
+
+        Args:
+            q: 分位数,在[0, 1]之间
+
+        Returns:
+            float: 线性插值得到的分位数
+
+        Raises:
+            TypeError: 当对象为单值Number时
+            ValueError: 当分位数不在[0, 1]之间时
+        """
+        return self.quantiles((q,))[0]
+
+    def percentile(self, p: float) -> float:
+        """计算百分位数
+
+        Args:
+            p: 百分位,在[0, 100]之间
+
+        Returns:
+            float: 线性插值得到的百分位数
+
+        Raises:
+            TypeError: 当对象为单值Number时
+            ValueError: 当百分位不在[0, 100]之间时
+        """
+        if not isinstance(p, (int, float)) or not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        return self.quantile(p / 100)
 
     def mode(self) -> "Number":
         """计算众数(出现次数最多的值)
@@ -1050,17 +3152,36 @@ class Number(object):
         Returns:
             Number: 包含众数的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(self.value)
+        if isinstance(self._data, (int, float)):
+            return Number(self._data)
 
-        from collections import Counter
-        counts = Counter(self.value)
-        max_freq = max(counts.values())
-        modes = tuple(num for num, freq in counts.items() if freq == max_freq)
-        return Number(*modes)
+        table = self._unique_table()
+        counts = table['counts']
+        max_freq = max(counts)
+        modes = [num for num, freq in zip(table['values'], counts) if freq == max_freq]
+        return Number._from_buffer(_to_storage(modes))
+
+    def stats(self) -> StatsAccumulator:
+        """单次遍历计算全部基础统计量
+
+        Returns:
+            StatsAccumulator: 包含count, sum, mean, variance, std_dev, min, max的累加器,
+                              还可以继续喂入数据或与其他累加器合并。
+                              返回的是缓存结果的副本,对象未被修改时再次调用为O(1)
+        """
+        return StatsAccumulator().merge(self._stats())
+
+    def _stats(self) -> StatsAccumulator:
+        """返回缓存的统计累加器(内部使用,调用方不得修改)"""
+        if isinstance(self._data, (int, float)):
+            return StatsAccumulator(self)
+        cache = self._cache_dict()
+        if 'stats' not in cache:
+            cache['stats'] = StatsAccumulator(self)
+        return cache['stats']
 
     def variance(self) -> float:
-        """计算方差
+        """计算方差(总体方差,由StatsAccumulator单次遍历得到)
 
         Returns:
             float: 方差
@@ -1068,11 +3189,10 @@ class Number(object):
         Raises:
             TypeError: 当对象为单值Number时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot calculate variance of single value")
 
-        avg = self.average()
-        return sum((x - avg) ** 2 for x in self.value) / len(self.value)
+        return self._stats().variance
 
     def std_dev(self) -> float:
         """计算标准差
@@ -1094,30 +3214,88 @@ class Number(object):
         Returns:
             Number: 归一化后的Number对象
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             return Number(1.0)
 
-        min_val = min(self.value)
-        max_val = max(self.value)
+        stats = self._stats()
+        min_val = stats.min
+        max_val = stats.max
         if min_val == max_val:
-            return Number(*(0.0 for _ in self.value))
-        return Number(*((x - min_val) / (max_val - min_val) for x in self.value))
+            return Number._from_values(0.0 for _ in self._data)
+        return Number._from_values((x - min_val) / (max_val - min_val) for x in self._data)
+
+    def _unique_table(self, return_index: bool = False) -> dict:
+        """去重引擎
+
+        单次遍历得到按首次出现顺序排列的不同值及其出现次数(可选首次出现的下标):
+        - 大数组: numpy排序+相邻比较(np.unique),再按首次出现的下标恢复原有顺序
+        - 其他情况: 基于哈希的Counter,保持插入顺序
+        结果缓存在_cache中,供unique、distinct_count、mode、count共用。
+
+        Args:
+            return_index: 是否需要每个不同值首次出现的下标
+
+        Returns:
+            dict: 'values'、'counts'以及可选的'index',都是存储对象
+        """
+        cache = self._cache_dict()
+        table = cache.get('unique')
+        if table is not None and (not return_index or 'index' in table):
+            return table
+        data = self._data
+        x = _ndview(data) if len(data) >= _VECTOR_THRESHOLD else None
+        if x is not None:
+            values, index, counts = _np.unique(x, return_index=True, return_counts=True, equal_nan=False)
+            order = _np.argsort(index, kind='stable')
+            table = {
+                'values': _from_ndarray(values[order]),
+                'index': _from_ndarray(index[order]),
+                'counts': _from_ndarray(counts[order]),
+            }
+        elif return_index:
+            entries = {}  # 值 -> [首次出现的下标, 出现次数]
+            for i, v in enumerate(data):
+                entry = entries.get(v)
+                if entry is None:
+                    entries[v] = [i, 1]
+                else:
+                    entry[1] += 1
+            table = {
+                'values': _to_storage(list(entries)),
+                'index': array('q', (entry[0] for entry in entries.values())),
+                'counts': array('q', (entry[1] for entry in entries.values())),
+            }
+        else:
+            counter = Counter(data)
+            table = {'values': _to_storage(list(counter)), 'counts': array('q', counter.values())}
+        cache['unique'] = table
+        return table
 
-    def unique(self) -> "Number":
+    def unique(self, return_index: bool = False, return_counts: bool = False) -> "Number | tuple[Number, ...]":
         """返回去重后的值
 
-        保持原有顺序。
+        保持原有顺序。使用哈希表去重(大数组使用numpy向量化),复杂度O(n),
+        结果会被缓存,对象未被修改时再次调用只需复制结果。
+
+        Args:
+            return_index: 是否同时返回每个不同值首次出现的下标
+            return_counts: 是否同时返回每个不同值出现的次数
 
         Returns:
-            Number: 去重后的Number对象
+            Number | tuple[Number, ...]: 去重后的Number对象;
+                如果要求了下标或次数,则返回(去重结果, 下标, 次数)中被要求的部分组成的元组
         """
-        if isinstance(self.value, (int, float)):
-            return Number(self.value)
-        seen = []
-        for x in self.value:
-            if x not in seen:
-                seen.append(x)
-        return Number(*seen)
+        if isinstance(self._data, (int, float)):
+            table = {'values': (self._data,), 'index': (0,), 'counts': (1,)}
+        else:
+            table = self._unique_table(return_index)
+        # 返回副本,避免调用方修改缓存
+        result = [Number._from_buffer(table['values'][:])]
+        if return_index:
+            result.append(Number._from_buffer(table['index'][:]))
+        if return_counts:
+            result.append(Number._from_buffer(table['counts'][:]))
+        return result[0] if len(result) == 1 else tuple(result)
 
 
     def product(self) -> int | float:
@@ -1126,11 +3304,11 @@ class Number(object):
         Returns:
             int | float: 所有元素的乘积
         """
-        if isinstance(self.value, (int, float)):
-            return self.value
+        if isinstance(self._data, (int, float)):
+            return self._data
 
         result = 1
-        for v in self.value:
+        for v in self._data:
             result *= v
         return result
 
@@ -1142,44 +3320,68 @@ class Number(object):
         Returns:
             Number: 累积乘积的Number对象
         """
-        if isinstance(self.value, (int, float)):
-            return Number(self.value)
+        if isinstance(self._data, (int, float)):
+            return Number(self._data)
 
         result = []
         product = 1
-        for x in self.value:
+        for x in self._data:
             product *= x
             result.append(product)
-        return Number(*result)
+        return Number._from_values(result)
 
-    def item_filter(self, predicate: callable) -> "Number":
+    def item_filter(self, predicate: "callable | Mask", executor: "Executor | None" = None,
+                    chunksize: "int | None" = None) -> "Number":
         """筛选满足条件的元素
 
+        predicate为Mask(如number.item_filter(number.gt(0)))时整块筛选, 不逐元素调用Python函数。
+
         Args:
-            predicate: 接受一个数值并返回布尔值的函数
+            predicate: 接受一个数值并返回布尔值的函数, 或与对象等长的掩码
+            executor: 可选的concurrent.futures执行器,指定时分块并行筛选,结果保持原有顺序
+            chunksize: 并行时每个分块的元素数,默认按CPU核数自动划分
 
         Returns:
             Number: 包含所有满足条件的元素的新Number对象
+
+        Raises:
+            ValueError: 当掩码长度与对象不同时
         """
-        if isinstance(self.value, (int, float)):
-            if predicate(self.value):
-                return Number(self.value)
+        if isinstance(predicate, Mask):
+            if len(predicate) != len(self):
+                raise ValueError("Mask must have the same length as the Number")
+            if isinstance(self._data, (int, float)):
+                return Number(self._data if predicate[0] else 0)
+            filtered = _mask_select(self._data, predicate._bits)
+            return Number._from_buffer(filtered) if len(filtered) else Number(0)
+        if isinstance(self._data, (int, float)):
+            if predicate(self._data):
+                return Number(self._data)
             # 如果单值不满足条件,返回空值会有问题,所以返回0
             return Number(0)
 
-        filtered = [v for v in self.value if predicate(v)]
+        if executor is not None:
+            filtered = list(chain.from_iterable(_parallel_run(executor, 'filter', predicate, (self._data,), chunksize)))
+        else:
+            filtered = [v for v in self._data if predicate(v)]
         if not filtered:
             return Number(0)  # 如果没有满足条件的元素,返回0
-        return Number(*filtered)
+        return Number._from_values(filtered)
 
 
 
-    def reduce(self, func: callable, initial=None) -> int | float:
+    def reduce(self, func: callable, initial=None, executor: "Executor | None" = None,
+               chunksize: "int | None" = None) -> int | float:
         """使用指定函数对序列进行归约操作
 
+        指定executor时各分块在worker中分别归约,再按树形两两合并分块结果,
+        因此此时func必须满足结合律。
+
         Args:
             func: 接受两个参数并返回一个值的函数
             initial: 初始值,如果不指定则使用序列第一个元素
+            executor: 可选的concurrent.futures执行器
+            chunksize: 并行时每个分块的元素数,默认按CPU核数自动划分
 
         Returns:
             归约操作的结果
@@ -1187,20 +3389,32 @@ class Number(object):
         Raises:
             ValueError: 当对象为空且没有提供初始值时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             if initial is None:
-                return self.value
-            return func(initial, self.value)
-
-        from functools import reduce
-        return reduce(func, self.value, initial)
-
-    def zip_with(self, other: "Number", func: callable) -> "Number":
+                return self._data
+            return func(initial, self._data)
+
+        if not len(self._data) and initial is None:
+            raise ValueError("reduce() of empty Number with no initial value")
+        if executor is None:
+            return reduce(func, self._data) if initial is None else reduce(func, self._data, initial)
+        parts = _parallel_run(executor, 'reduce', func, (self._data,), chunksize)
+        while len(parts) > 1:
+            merged = [func(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+            if len(parts) % 2:
+                merged.append(parts[-1])
+            parts = merged
+        return parts[0] if initial is None else func(initial, parts[0])
+
+    def zip_with(self, other: "Number", func: callable, executor: "Executor | None" = None,
+                 chunksize: "int | None" = None) -> "Number":
         """将两个Number对象的元素通过指定函数组合
 
         Args:
             other: 另一个Number对象
             func: 接受两个参数并返回一个值的函数
+            executor: 可选的concurrent.futures执行器,指定时分块并行计算,结果保持原有顺序
+            chunksize: 并行时每个分块的元素数,默认按CPU核数自动划分
 
         Returns:
             Number: 组合结果的新Number对象
@@ -1212,16 +3426,19 @@ class Number(object):
         if not isinstance(other, Number):
             raise TypeError("First argument must be a Number object")
 
-        if isinstance(self.value, (int, float)) and isinstance(other.value, (int, float)):
-            return Number(func(self.value, other.value))
+        if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+            return Number(func(self._data, other._data))
 
-        if isinstance(self.value, (int, float)) or isinstance(other.value, (int, float)):
+        if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
             raise ValueError("Cannot zip single value with multiple values")
 
-        if len(self.value) != len(other.value):
+        if len(self._data) != len(other._data):
             raise ValueError("Cannot zip Numbers with different lengths")
 
-        return Number(*(func(a, b) for a, b in zip(self.value, other.value)))
+        if executor is not None:
+            parts = _parallel_run(executor, 'zip', func, (self._data, other._data), chunksize)
+            return Number.from_iterable(chain.from_iterable(parts))
+        return Number.from_iterable(func(a, b) for a, b in zip(self._data, other._data))
 
     def slice(self, start: int = None, stop: int = None, step: int = None) -> "Number":
         """返回指定切片的新Number对象
@@ -1237,15 +3454,15 @@ class Number(object):
         Raises:
             TypeError: 当对单值Number使用此方法时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot slice single value")
 
-        sliced = self.value[slice(start, stop, step)]
+        sliced = self._data[slice(start, stop, step)]
         if not sliced:  # 如果切片为空
             return Number(0)
         if len(sliced) == 1:  # 如果只有一个元素
             return Number(sliced[0])
-        return Number(*sliced)
+        return Number._from_buffer(sliced)
 
     def distinct_count(self) -> int:
         """计算不同值的数量
@@ -1253,9 +3470,9 @@ class Number(object):
         Returns:
             int: 不同值的数量
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             return 1
-        return len(set(self.value))
+        return len(self._unique_table()['values'])
 
     def to_list(self) -> list:
         """转换为Python列表
@@ -1263,9 +3480,135 @@ class Number(object):
         Returns:
             list: 包含所有值的Python列表
         """
-        if isinstance(self.value, (int, float)):
-            return [self.value]
-        return list(self.value)
+        if isinstance(self._data, (int, float)):
+            return [self._data]
+        return list(self._data)
+
+    def to_shared(self) -> 'SharedNumber':
+        """复制到一段新的共享内存中
+
+        得到的SharedNumber可以传给其他进程,pickle时只传递共享内存段的名字。
+
+        Returns:
+            SharedNumber: 由当前进程拥有的共享Number
+
+        Raises:
+            TypeError: 当对象是单值,或包含超出int64范围的整数时
+        """
+        return SharedNumber._create(self._data, self.SM)
+
+    def save(self, path: "str | os.PathLike") -> None:
+        """以二进制格式保存到文件
+
+        文件由32字节的文件头(格式版本、类型码、元素个数、库版本)和小端序的原始数值组成,
+        可以用Number.open以内存映射方式打开。
+
+        Args:
+            path: 文件路径
+
+        Raises:
+            TypeError: 当包含超出int64范围的整数时
+        """
+        data = self._data
+        if isinstance(data, (int, float)):
+            data = _to_storage((data,))
+        typecode = _typecode(data)
+        if typecode is None:
+            raise TypeError("Only int64 or float64 values can be saved")
+        header = _FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, typecode.encode(), len(data),
+                                   Number.__version__.encode())
+        with open(path, 'wb') as f:
+            f.write(header)
+            if sys.byteorder == 'little':
+                f.write(memoryview(data).cast('B'))
+            else:
+                swapped = array(typecode, data)
+                swapped.byteswap()
+                f.write(swapped)
+
+    @classmethod
+    def open(cls, path: "str | os.PathLike", mmap: bool = True, writable: bool = False) -> 'Number':
+        """打开由save保存的文件
+
+        Args:
+            path: 文件路径
+            mmap: 为True时返回内存映射的MappedNumber, 只读取文件头, 数据按需分页载入;
+                  为False时一次性读入内存, 返回普通的Number
+            writable: 内存映射模式下是否允许原地修改(修改会写回文件)
+
+        Returns:
+            Number: 只有一个元素时总是返回单值Number
+
+        Raises:
+            ValueError: 文件不是Number文件,版本不受支持,或文件被截断时
+        """
+        with open(path, 'r+b' if writable else 'rb') as f:
+            typecode, length = _read_file_header(f)
+            end = _FILE_HEADER.size + length * 8
+            if not mmap or length == 1 or sys.byteorder != 'little':
+                storage = array(typecode)
+                storage.fromfile(f, length)
+                if sys.byteorder != 'little':
+                    storage.byteswap()
+                return Number._from_buffer(storage)
+            mapping = _mmap.mmap(f.fileno(), end, access=_mmap.ACCESS_WRITE if writable else _mmap.ACCESS_READ)
+        obj = MappedNumber.__new__(MappedNumber)
+        view = memoryview(mapping)[_FILE_HEADER.size:end]
+        Number._data.__set__(obj, view.cast(typecode))
+        view.release()
+        obj._mmap = mapping
+        obj._path = os.fspath(path)
+        obj.SM = '__visual__'
+        obj._cache = None
+        return obj
+
+    def to_memoryview(self) -> memoryview:
+        """返回存储的只读memoryview, 不复制
+
+        视图存在期间改变长度的操作(append、删除等)会让Number改用一份新的存储。
+
+        Returns:
+            memoryview: 格式为'q'(int64)或'd'(float64)的一维视图
+
+        Raises:
+            TypeError: 当包含超出int64范围的整数时(这种存储没有连续的缓冲区)
+        """
+        data = self._data
+        if isinstance(data, (int, float)):
+            data = _to_storage((data,))
+        if _typecode(data) is None:
+            raise TypeError("Number with integers outside int64 range has no buffer")
+        return memoryview(data).toreadonly()
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """缓冲区协议(Python 3.12+), 使memoryview(number)等零拷贝地读取数据, 同to_memoryview"""
+        return self.to_memoryview()
+
+    def __array__(self, dtype=None, copy: "bool | None" = None):
+        """numpy数组接口, 使numpy.asarray(number)等直接读取存储
+
+        int64/float64存储返回共享同一缓冲区的只读numpy数组, 不复制;
+        修改数据应通过Number的方法进行, 以便维护缓存。
+
+        Args:
+            dtype: 需要的numpy数据类型, 与存储类型不同时转换(复制)
+            copy: True时总是复制; False时如果无法避免复制则抛出ValueError
+
+        Returns:
+            numpy.ndarray: 单值Number得到0维数组, 超出int64范围的整数得到object数组
+
+        Raises:
+            ValueError: copy=False但无法避免复制时
+        """
+        data = self._data
+        view = None if isinstance(data, (int, float)) else _ndview(data)
+        if view is None or copy or (dtype is not None and view.dtype != _np.dtype(dtype)):
+            if copy is False:
+                raise ValueError("Unable to avoid copy while creating an array from this Number")
+            source = view if view is not None else (data if isinstance(data, (int, float)) else list(data))
+            return _np.array(source, dtype=dtype)
+        view.flags.writeable = False
+        return view
 
     def to_tuple(self) -> tuple:
         """转换为Python元组
@@ -1273,9 +3616,9 @@ class Number(object):
         Returns:
             tuple: 包含所有值的Python元组
         """
-        if isinstance(self.value, (int, float)):
-            return (self.value,)
-        return self.value
+        if isinstance(self._data, (int, float)):
+            return (self._data,)
+        return tuple(self._data)
 
     def to_set(self) -> set:
         """转换为Python集合
@@ -1283,9 +3626,9 @@ class Number(object):
         Returns:
             set: 包含所有不同值的Python集合
         """
-        if isinstance(self.value, (int, float)):
-            return {self.value}
-        return set(self.value)
+        if isinstance(self._data, (int, float)):
+            return {self._data}
+        return set(self._data)
 
     def to_dict(self, keys=None) -> dict:
         """转换为Python字典
@@ -1301,24 +3644,29 @@ class Number(object):
             ValueError: 当keys的长度与值的数量不匹配时
         """
         if keys is None:
-            if isinstance(self.value, (int, float)):
-                return {0: self.value}
-            return {i: v for i, v in enumerate(self.value)}
+            if isinstance(self._data, (int, float)):
+                return {0: self._data}
+            return {i: v for i, v in enumerate(self._data)}
 
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             if len(keys) != 1:
                 raise ValueError("Number of keys must match number of values")
-            return {keys[0]: self.value}
+            return {keys[0]: self._data}
 
-        if len(keys) != len(self.value):
+        if len(keys) != len(self._data):
             raise ValueError("Number of keys must match number of values")
-        return {k: v for k, v in zip(keys, self.value)}
+        return {k: v for k, v in zip(keys, self._data)}
 
-    def item_map(self, func) -> 'Number':
+    def item_map(self, func, executor: "Executor | None" = None, chunksize: "int | None" = None) -> 'Number':
         """对Number对象中的每个元素应用函数
 
+        指定executor时把存储切成分块并行映射,结果保持原有顺序。
+        使用ProcessPoolExecutor时数组存储经共享内存传给worker,func必须可以pickle。
+
         Args:
             func: 接受一个数值并返回一个数值的函数
+            executor: 可选的concurrent.futures执行器(线程池或进程池)
+            chunksize: 并行时每个分块的元素数,默认按CPU核数自动划分
 
         Returns:
             Number: 包含映射后结果的新Number对象
@@ -1329,86 +3677,310 @@ class Number(object):
         if not callable(func):
             raise TypeError('func must be a function object')
             
-        if isinstance(self.value, (int, float)):
-            return Number(*(func(self.value)))
+        if isinstance(self._data, (int, float)):
+            return Number(*(func(self._data)))
+        elif executor is not None:
+            parts = _parallel_run(executor, 'map', func, (self._data,), chunksize)
+            return Number.from_iterable(chain.from_iterable(parts))
         else:
-            return Number(*(func(v) for v in self.value))
-    
-    def __or__(self, other:'Number') -> 'Number':
-        """位或运算符(|)的重载，对两个 Number 对象的对应元素执行或操作"""
-        return self.zip_with(other, lambda a, b: a | b)
-    
-    def __and__(self, other:'Number') -> 'Number':
-        """位与运算符(&)的重载，对两个 Number 对象的对应元素执行与操作"""
-        return self.zip_with(other, lambda a, b: a & b)
+            return Number.from_iterable(func(v) for v in self._data)
 
-    def __xor__(self, other:'Number') -> 'Number':
-        """位异或运算符(^)的重载，对两个 Number 对象的对应元素执行异或操作"""
-        return self.zip_with(other, lambda a, b: a ^ b)
+    def lazy(self) -> 'LazyNumber':
+        """进入延迟求值模式
 
-    def __invert__(self) -> 'Number':
-        """位反运算符(~)的重载，对 Number 对象的每个元素执行取反操作"""
-        return self.item_map(lambda x: ~x)
+        返回一个LazyNumber表达式, 之后的运算符和数学方法只构建表达式树,
+        直到访问.value、sum()、to_list()等方法时才一次性融合求值。
+        注意: 求值前原地修改参与运算的Number会影响结果。
 
-    def __lshift__(self, other:'Number') -> 'Number':
-        """左移运算符(<<)的重载，对两个 Number 对象的对应元素执行左移操作"""
-        return self.zip_with(other, lambda a, b: a << b)
+        Returns:
+            LazyNumber: 以本对象为叶子节点的表达式
 
-    def __rshift__(self, other:'Number') -> 'Number':
-        """右移运算符(>>)的重载，对两个 Number 对象的对应元素执行右移操作"""
-        return self.zip_with(other, lambda a, b: a >> b)
+        Raises:
+            TypeError: 当对单值Number使用此方法时
+        """
+        if isinstance(self._data, (int, float)):
+            raise TypeError("Cannot build lazy expression from single value")
+        return LazyNumber('leaf', (self._data,), len(self._data))
 
-    def __iadd__(self, other:'Number') -> 'Number':
-        """复合加法赋值运算符(+=)的重载，执行原地加法操作"""
-        return self.zip_with(other, lambda a, b: a + b)
+    def chunked(self, chunksize: int = 65536) -> 'ChunkedNumber':
+        """按块切分为ChunkedNumber,之后的运算按块流式进行
 
-    def __isub__(self, other:'Number') -> 'Number':
-        """复合减法赋值运算符(-=)的重载，执行原地减法操作"""
-        return self.zip_with(other, lambda a, b: a - b)
+        Args:
+            chunksize: 每块的元素数
 
-    def __imul__(self, other:'Number') -> 'Number':
-        """复合乘法赋值运算符(*=)的重载，执行原地乘法操作"""
-        return self.zip_with(other, lambda a, b: a * b)
+        Returns:
+            ChunkedNumber: 以本对象的数据为来源的分块序列
 
-    def __itruediv__(self, other:'Number') -> 'Number':
-        """复合除法赋值运算符(/=)的重载，执行原地除法操作"""
-        return self.zip_with(other, lambda a, b: a / b)
+        Raises:
+            ValueError: 当chunksize不是正数时
+        """
+        if chunksize <= 0:
+            raise ValueError("chunksize must be positive")
+        data = _to_storage((self._data,)) if isinstance(self._data, (int, float)) else self._data
+        return ChunkedNumber._derive(lambda: (data[i:i + chunksize] for i in range(0, len(data), chunksize)))
+    
+    def _bitwise(self, op: str, other: "Number | int", reflected: bool = False) -> 'Number':
+        """位运算与移位运算的公共实现
 
-    def __ifloordiv__(self, other:'Number') -> 'Number':
-        """复合整除赋值运算符(//=)的重载，执行原地整除操作"""
-        return self.zip_with(other, lambda a, b: a // b)
+        规则与加法相同(单值与多值不能混合、多值间长度必须相同), int标量会广播到每个元素。
+        int64存储的大数组直接在整个缓冲区上向量化计算; 结果可能超出int64的移位和
+        大整数、浮点存储退回纯Python逐元素计算(浮点数由Python抛出TypeError)。
 
-    def __imod__(self, other:'Number') -> 'Number':
-        """复合取模赋值运算符(%=)的重载，执行原地取模操作"""
-        return self.zip_with(other, lambda a, b: a % b)
+        Args:
+            op: 运算名, 'or'/'xor'/'and'/'lshift'/'rshift'之一
+            other: 另一个Number对象或int
+            reflected: 为True时计算 other op self
 
-    def __ipow__(self, other:'Number') -> 'Number':
-        """复合幂运算赋值运算符(**=)的重载，执行原地幂运算"""
-        return self.zip_with(other, lambda a, b: a ** b)
+        Returns:
+            Number: 运算结果
 
-    def __ior__(self, other:'Number') -> 'Number':
-        """复合位或赋值运算符(|=)的重载，执行原地位或操作"""
-        return self.zip_with(other, lambda a, b: a | b)
+        Raises:
+            ValueError: 当试图将单值与多值运算,或多值间长度不同,或移位位数为负时
+            TypeError: 当操作数类型不支持位运算时
+        """
+        func, symbol = _PY_FUNCS[op]
+        if isinstance(other, Number):
+            if isinstance(self._data, (int, float)) and isinstance(other._data, (int, float)):
+                return Number(func(self._data, other._data))
+            if isinstance(self._data, (int, float)) or isinstance(other._data, (int, float)):
+                raise ValueError(f"Cannot apply {symbol} to single value and multiple values")
+            if len(self._data) != len(other._data):
+                raise ValueError(f"Cannot apply {symbol} to Numbers with different lengths")
+            operand = other._data
+        elif isinstance(other, int):
+            if isinstance(self._data, (int, float)):
+                return Number(func(other, self._data) if reflected else func(self._data, other))
+            operand = other
+        else:
+            symbols = (type(other).__name__, type(self).__name__) if reflected else (type(self).__name__, type(other).__name__)
+            raise TypeError(f"Unsupported operand type for {symbol}: '{symbols[0]}' and '{symbols[1]}'")
+        a, b = (operand, self._data) if reflected else (self._data, operand)
+        result = _vector_binary(op, a, b)
+        if result is not None:
+            return Number._from_buffer(result)
+        if isinstance(a, (int, float)):
+            return Number._from_values(func(a, v) for v in b)
+        if isinstance(b, (int, float)):
+            return Number._from_values(func(v, b) for v in a)
+        return Number._from_values(map(func, a, b))
+
+    def __or__(self, other: "Number | int") -> 'Number':
+        """位或运算符(|)的重载，对两个 Number 对象的对应元素执行或操作"""
+        return self._bitwise('or', other)
 
-    def __ixor__(self, other:'Number') -> 'Number':
-        """复合位异或赋值运算符(^=)的重载，执行原地位异或操作"""
-        return self.zip_with(other, lambda a, b: a ^ b)
+    def __ror__(self, other: int) -> 'Number':
+        """反向位或运算符的重载，用于支持 int | Number"""
+        return self._bitwise('or', other, reflected=True)
 
-    def __iand__(self, other:'Number') -> 'Number':
-        """复合位与赋值运算符(&=)的重载，执行原地位与操作"""
-        return self.zip_with(other, lambda a, b: a & b)
+    def __and__(self, other: "Number | int") -> 'Number':
+        """位与运算符(&)的重载，对两个 Number 对象的对应元素执行与操作"""
+        return self._bitwise('and', other)
 
-    def __ilshift__(self, other:'Number') -> 'Number':
-        """复合左移赋值运算符(<<=)的重载，执行原地左移操作"""
-        return self.zip_with(other, lambda a, b: a << b)
+    def __rand__(self, other: int) -> 'Number':
+        """反向位与运算符的重载，用于支持 int & Number"""
+        return self._bitwise('and', other, reflected=True)
 
-    def __irshift__(self, other:'Number') -> 'Number':
-        """复合右移赋值运算符(>>=)的重载，执行原地右移操作"""
-        return self.zip_with(other, lambda a, b: a >> b)
+    def __xor__(self, other: "Number | int") -> 'Number':
+        """位异或运算符(^)的重载，对两个 Number 对象的对应元素执行异或操作"""
+        return self._bitwise('xor', other)
+
+    def __rxor__(self, other: int) -> 'Number':
+        """反向位异或运算符的重载，用于支持 int ^ Number"""
+        return self._bitwise('xor', other, reflected=True)
+
+    def __invert__(self) -> 'Number':
+        """位反运算符(~)的重载，对 Number 对象的每个元素执行取反操作
+
+        int64存储的大数组向量化计算(~x == -x - 1, 不会超出int64)。
+        """
+        data = self._data
+        if isinstance(data, (int, float)):
+            return Number(~data)
+        x = _ndview(data) if _typecode(data) == 'q' and len(data) >= _VECTOR_THRESHOLD else None
+        if x is not None:
+            return Number._from_buffer(_from_ndarray(_np.invert(x)))
+        return Number._from_values(~v for v in data)
+
+    def __lshift__(self, other: "Number | int") -> 'Number':
+        """左移运算符(<<)的重载，对两个 Number 对象的对应元素执行左移操作"""
+        return self._bitwise('lshift', other)
+
+    def __rlshift__(self, other: int) -> 'Number':
+        """反向左移运算符的重载，用于支持 int << Number"""
+        return self._bitwise('lshift', other, reflected=True)
+
+    def __rshift__(self, other: "Number | int") -> 'Number':
+        """右移运算符(>>)的重载，对两个 Number 对象的对应元素执行右移操作"""
+        return self._bitwise('rshift', other)
+
+    def __rrshift__(self, other: int) -> 'Number':
+        """反向右移运算符的重载，用于支持 int >> Number"""
+        return self._bitwise('rshift', other, reflected=True)
+
+    def popcount(self) -> 'Number':
+        """统计每个元素二进制表示中1的个数(负数统计绝对值, 与int.bit_count一致)
+
+        Returns:
+            Number: 每个元素的置位数
+
+        Raises:
+            TypeError: 当值不是整数时
+        """
+        data = self._data
+        if isinstance(data, (int, float)):
+            return Number(data.bit_count())
+        x = _ndview(data) if _typecode(data) == 'q' and len(data) >= _VECTOR_THRESHOLD else None
+        if x is not None and hasattr(_np, 'bitwise_count'):
+            return Number._from_buffer(_from_ndarray(_np.bitwise_count(x)))
+        return Number._from_values(v.bit_count() for v in data)
+
+    def bit_test(self, bit: int) -> 'Number':
+        """检查每个元素的第bit位(从0开始)是否为1, 负数按补码处理
+
+        Args:
+            bit: 要检查的位, 非负整数
+
+        Returns:
+            Number: 每个元素对应位的值(0或1)
+
+        Raises:
+            ValueError: 当bit为负数时
+            TypeError: 当值不是整数时
+        """
+        if not isinstance(bit, int):
+            raise TypeError("bit must be an integer")
+        if bit < 0:
+            raise ValueError("bit must be non-negative")
+        data = self._data
+        if isinstance(data, (int, float)):
+            return Number(data >> bit & 1)
+        x = _ndview(data) if _typecode(data) == 'q' and len(data) >= _VECTOR_THRESHOLD else None
+        if x is not None:
+            # int64右移63位以上时结果只剩符号位, 与Python补码语义一致
+            return Number._from_buffer(_from_ndarray((x >> min(bit, 63)) & 1))
+        return Number._from_values(v >> bit & 1 for v in data)
+
+    def bit_select(self, mask: "Number | int", other: "Number | int") -> 'Number':
+        """按位选择: mask中为1的位取自本对象, 为0的位取自other
+
+        等价于 (self & mask) | (other & ~mask), 常用于合并两个位掩码列。
+
+        Args:
+            mask: 选择掩码, Number对象或int
+            other: mask为0的位的来源, Number对象或int
+
+        Returns:
+            Number: 合并后的结果
+
+        Raises:
+            ValueError: 当单值与多值混合或长度不同时
+            TypeError: 当值不是整数时
+        """
+        return (self & mask) | (~mask & other)
+
+    def _inplace(self, op: str, other: "Number | int | float") -> 'Number':
+        """复合赋值运算的公共实现
+
+        规则与对应的二元运算相同(单值与多值不能混合、多值间长度必须相同),
+        并且支持int/float标量操作数(对每个元素广播)。
+        大数组优先使用numpy在原缓冲区上就地计算, 不分配新的数组;
+        否则先完整计算出结果再写回, 计算失败时对象保持不变。
+
+        Args:
+            op: 运算名, 如'add'、'mul'
+            other: 另一个Number对象或数值
+
+        Returns:
+            Number: self本身
+
+        Raises:
+            ValueError: 当单值与多值混合,或多值间长度不同时
+            TypeError: 当使用不支持的类型,或结果不是数值时
+            ZeroDivisionError: 当除数为零时
+        """
+        func, symbol = _PY_FUNCS[op]
+        if isinstance(other, Number):
+            operand = other._data
+        elif isinstance(other, (int, float)):
+            operand = other
+        else:
+            raise TypeError(f"Unsupported operand type for {symbol}=: '{type(self).__name__}' and '{type(other).__name__}'")
+        data = self._data
+        operand_is_scalar = isinstance(operand, (int, float))
+        if isinstance(data, (int, float)):
+            if not operand_is_scalar:
+                raise ValueError("Cannot combine single value with multiple values")
+            self._data = Number(func(data, operand))._data
+            return self
+        if not operand_is_scalar and len(operand) != len(data):
+            raise ValueError("Cannot combine Numbers with different lengths")
+        if op in ('truediv', 'floordiv', 'mod') and (operand == 0 if operand_is_scalar else _contains_zero(operand)):
+            raise ZeroDivisionError("Division by zero")
+        self._cache = None
+        if isinstance(data, memoryview) and data.readonly:
+            data = self._data = array(data.format, data.tobytes())  # 只读的外部缓冲区: 复制后再就地计算
+        if _vector_inplace(op, data, operand):
+            return self
+        if operand_is_scalar:
+            values = [func(v, operand) for v in data]
+        else:
+            values = [func(a, b) for a, b in zip(data, operand)]
+        if not all(isinstance(v, (int, float)) for v in values):
+            raise TypeError("All values must be int or float")
+        storage = _to_storage(values)
+        if _typecode(data) is not None and _typecode(data) == _typecode(storage):
+            data[:] = storage  # 类型不变时写回原缓冲区
+        else:
+            self._data = storage
+        return self
 
-    def __rshift__(self, other) -> 'Number':
-        """右移运算符的重载，对两个 Number 对象的对应元素执行右移操作"""
-        return self.zip_with(other, lambda a, b: b >> a)
+    def __iadd__(self, other: 'Number | int | float') -> 'Number':
+        """复合加法赋值运算符(+=)的重载，在原缓冲区上就地执行加法操作"""
+        return self._inplace('add', other)
+
+    def __isub__(self, other: 'Number | int | float') -> 'Number':
+        """复合减法赋值运算符(-=)的重载，在原缓冲区上就地执行减法操作"""
+        return self._inplace('sub', other)
+
+    def __imul__(self, other: 'Number | int | float') -> 'Number':
+        """复合乘法赋值运算符(*=)的重载，在原缓冲区上就地执行乘法操作"""
+        return self._inplace('mul', other)
+
+    def __itruediv__(self, other: 'Number | int | float') -> 'Number':
+        """复合除法赋值运算符(/=)的重载，在原缓冲区上就地执行除法操作"""
+        return self._inplace('truediv', other)
+
+    def __ifloordiv__(self, other: 'Number | int | float') -> 'Number':
+        """复合整除赋值运算符(//=)的重载，在原缓冲区上就地执行整除操作"""
+        return self._inplace('floordiv', other)
+
+    def __imod__(self, other: 'Number | int | float') -> 'Number':
+        """复合取模赋值运算符(%=)的重载，在原缓冲区上就地执行取模操作"""
+        return self._inplace('mod', other)
+
+    def __ipow__(self, other: 'Number | int | float') -> 'Number':
+        """复合幂运算赋值运算符(**=)的重载，在原缓冲区上就地执行幂运算"""
+        return self._inplace('pow', other)
+
+    def __ior__(self, other: 'Number | int | float') -> 'Number':
+        """复合位或赋值运算符(|=)的重载，在原缓冲区上就地执行位或操作"""
+        return self._inplace('or', other)
+
+    def __ixor__(self, other: 'Number | int | float') -> 'Number':
+        """复合位异或赋值运算符(^=)的重载，在原缓冲区上就地执行位异或操作"""
+        return self._inplace('xor', other)
+
+    def __iand__(self, other: 'Number | int | float') -> 'Number':
+        """复合位与赋值运算符(&=)的重载，在原缓冲区上就地执行位与操作"""
+        return self._inplace('and', other)
+
+    def __ilshift__(self, other: 'Number | int | float') -> 'Number':
+        """复合左移赋值运算符(<<=)的重载，在原缓冲区上就地执行左移操作"""
+        return self._inplace('lshift', other)
+
+    def __irshift__(self, other: 'Number | int | float') -> 'Number':
+        """复合右移赋值运算符(>>=)的重载，在原缓冲区上就地执行右移操作"""
+        return self._inplace('rshift', other)
 
 
 
@@ -1419,9 +3991,10 @@ class Number(object):
             str | list: 如果是单值返回该值的二进制字符串表示，
                     如果是多值返回包含每个值的二进制字符串表示的列表
         """
-        if isinstance(self.value, (int, float)):
-            return bin(int(self.value))
-        return [bin(int(v)) for v in self.value]
+        if isinstance(self._data, (int, float)):
+            return bin(int(self._data))
+        data = self._data
+        return list(map('{:#b}'.format, data if _typecode(data) == 'q' else map(int, data)))
 
     def hex(self) -> str | list:
         """返回Number对象的十六进制表示形式
@@ -1430,9 +4003,10 @@ class Number(object):
             str | list: 如果是单值返回该值的十六进制字符串表示，
                     如果是多值返回包含每个值的十六进制字符串表示的列表
         """
-        if isinstance(self.value, (int, float)):
-            return hex(int(self.value))
-        return [hex(int(v)) for v in self.value]
+        if isinstance(self._data, (int, float)):
+            return hex(int(self._data))
+        data = self._data
+        return list(map('{:#x}'.format, data if _typecode(data) == 'q' else map(int, data)))
 
     def oct(self) -> str | list:
         """返回Number对象的八进制表示形式
@@ -1441,15 +4015,84 @@ class Number(object):
             str | list: 如果是单值返回该值的八进制字符串表示，
                     如果是多值返回包含每个值的八进制字符串表示的列表
         """
-        if isinstance(self.value, (int, float)):
-            return oct(int(self.value))
-        return [oct(int(v)) for v in self.value]
+        if isinstance(self._data, (int, float)):
+            return oct(int(self._data))
+        data = self._data
+        return list(map('{:#o}'.format, data if _typecode(data) == 'q' else map(int, data)))
+
+    def to_text(self, file=None, sep: str = ' ', fmt: "str | None" = None, integral: bool = False) -> "str | None":
+        """把全部数值批量格式化为文本, 直接写入文件或缓冲区
+
+        按块格式化并写出, 不会为每个元素保留字符串; 默认格式(str)与from_text互为逆操作。
+
+        Args:
+            file: 文件路径、文本文件对象(如io.StringIO)或二进制文件对象(如io.BytesIO, 按ASCII写入);
+                  为None时返回字符串
+            sep: 元素之间的分隔符
+            fmt: 可选的格式说明, 与format()相同, 如'.3f'、'#x'(同hex())、'08b'
+            integral: 是否先把每个值转换为int(与bin/hex/oct相同), 用于整数格式说明
+
+        Returns:
+            str | None: file为None时返回格式化后的文本, 否则返回None
+
+        Raises:
+            ValueError: 当格式说明不适用于数值时
+        """
+        data = _to_storage((self._data,)) if isinstance(self._data, (int, float)) else self._data
+        chunks = _format_chunks(data, fmt, sep, integral)
+        if file is None:
+            return sep.join(chunks)
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w', encoding='ascii') as f:
+                self._write_chunks(f, chunks, sep)
+            return None
+        if not isinstance(file, io.TextIOBase):
+            chunks = (chunk.encode('ascii') for chunk in chunks)
+            sep = sep.encode('ascii')
+        self._write_chunks(file, chunks, sep)
+        return None
+
+    @staticmethod
+    def _write_chunks(file, chunks: Iterable, sep: "str | bytes") -> None:
+        """依次写出各块, 块之间插入分隔符"""
+        for i, chunk in enumerate(chunks):
+            if i:
+                file.write(sep)
+            file.write(chunk)
+
+    def rolling(self, window_size: int) -> 'Rolling':
+        """创建滑动窗口统计对象
+
+        返回的Rolling对象提供sum、mean、max、min、variance、std_dev,
+        每个统计量的总复杂度都是O(n),与窗口大小无关。
+
+        Args:
+            window_size (int): 窗口大小,必须为正整数且不大于序列长度
+
+        Returns:
+            Rolling: 滑动窗口统计对象
+
+        Raises:
+            ValueError: 当window_size小于1或大于序列长度时
+            TypeError: 当对单值Number使用此方法时
+        """
+        if isinstance(self._data, (int, float)):
+            raise TypeError("Cannot calculate rolling stats of single value")
+
+        if not isinstance(window_size, int) or window_size < 1:
+            raise ValueError("Window size must be a positive integer")
+
+        if window_size > len(self._data):
+            raise ValueError("Window size cannot be larger than sequence length")
+
+        return Rolling(self._data, window_size)
 
     def moving_average(self, window_size: int) -> 'Number':
         """计算移动平均值
 
         使用指定大小的滑动窗口计算移动平均值。对单值返回其本身,
         对多值返回一个新的Number对象,其长度比原序列少window_size-1。
+        使用滑动累加和实现,总复杂度为O(n)。
 
         Args:
             window_size (int): 窗口大小,必须为正整数且不大于序列长度
@@ -1461,31 +4104,18 @@ class Number(object):
             ValueError: 当window_size小于1或大于序列长度时
             TypeError: 当对单值Number使用此方法时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot calculate moving average of single value")
 
-        if not isinstance(window_size, int) or window_size < 1:
-            raise ValueError("Window size must be a positive integer")
-
-        if window_size > len(self.value):
-            raise ValueError("Window size cannot be larger than sequence length")
-
+        rolling = self.rolling(window_size)
         if window_size == 1:
             return self
-
-        # 计算移动平均
-        result = []
-        for i in range(len(self.value) - window_size + 1):
-            window = self.value[i:i + window_size]
-            avg = sum(window) / window_size
-            result.append(avg)
-
-        return Number(*result)
+        return rolling.mean()
 
     def cumulative_stats(self) -> dict[str, 'Number']:
         """计算累积统计量
 
-        计算序列的累积统计量,包括：
+        计算序列的累积统计量(单次遍历,O(n)),包括：
         - 累积和
         - 累积均值
         - 累积最大值
@@ -1501,27 +4131,44 @@ class Number(object):
         Raises:
             TypeError: 当对单值Number使用此方法时
         """
-        if isinstance(self.value, (int, float)):
+        if isinstance(self._data, (int, float)):
             raise TypeError("Cannot calculate cumulative stats of single value")
 
+        data = self._data
+        x = _ndview(data) if len(data) >= _VECTOR_THRESHOLD else None
+        if x is not None and (x.dtype.kind == 'f' or _max_abs(x) * len(x) <= _MAX_EXACT_INT):
+            # cumsum与逐个累加的顺序相同, 结果与纯Python实现一致
+            cumsum = _np.cumsum(x)
+            return {
+                'sum': Number._from_buffer(_from_ndarray(cumsum)),
+                'mean': Number._from_buffer(_from_ndarray(cumsum / _np.arange(1, len(x) + 1))),
+                'max': Number._from_buffer(_from_ndarray(_np.maximum.accumulate(x))),
+                'min': Number._from_buffer(_from_ndarray(_np.minimum.accumulate(x))),
+            }
+
         cum_sum = []
         cum_mean = []
         cum_max = []
         cum_min = []
 
         current_sum = 0
-        for i, v in enumerate(self.value, 1):
+        current_max = current_min = data[0]
+        for i, v in enumerate(data, 1):
             current_sum += v
+            if v > current_max:
+                current_max = v
+            if v < current_min:
+                current_min = v
             cum_sum.append(current_sum)
             cum_mean.append(current_sum / i)
-            cum_max.append(max(self.value[:i]))
-            cum_min.append(min(self.value[:i]))
+            cum_max.append(current_max)
+            cum_min.append(current_min)
 
         return {
-            'sum': Number(*cum_sum),
-            'mean': Number(*cum_mean),
-            'max': Number(*cum_max),
-            'min': Number(*cum_min)
+            'sum': Number._from_values(cum_sum),
+            'mean': Number._from_values(cum_mean),
+            'max': Number._from_values(cum_max),
+            'min': Number._from_values(cum_min)
         }
 
 
@@ -1532,6 +4179,7 @@ class Number(object):
 
         在指定的区间[start, stop]内生成num个等距的数。
         这是一个类方法,不需要实例化即可调用。
+        结果是只保存起点、步长和个数的RangeNumber, 元素在访问时才计算。
 
         Args:
             start (float): 序列的起始值
@@ -1539,7 +4187,7 @@ class Number(object):
             num (int): 要生成的数的个数,默认为50
 
         Returns:
-            Number: 包含等距序列的Number对象
+            Number: 包含等距序列的Number对象(num为1时为单值Number)
 
         Raises:
             ValueError: 当num小于1时
@@ -1550,85 +4198,131 @@ class Number(object):
         if num == 1:
             return Number(start)
 
-        step = (stop - start) / (num - 1)
-        return cls(*(start + i * step for i in range(num)))
+        return RangeNumber(start, (stop - start) / (num - 1), num)
+
+    @classmethod
+    def arange(cls, start: int | float, stop: "int | float | None" = None, step: int | float = 1) -> 'Number':
+        """生成半开区间[start, stop)内步长为step的等差序列, 规则与range/numpy.arange相同
+
+        只提供一个参数时作为stop, 从0开始。整数参数得到整数序列。
+        结果是只保存起点、步长和个数的RangeNumber, 元素在访问时才计算。
+
+        Args:
+            start: 起始值(只提供一个参数时为结束值)
+            stop: 结束值(不含)
+            step: 步长, 不能为0
+
+        Returns:
+            Number: 等差序列(只有一个元素时为单值Number)
+
+        Raises:
+            ValueError: 当step为0,或区间内没有任何元素时
+            TypeError: 当参数不是数值时
+        """
+        if stop is None:
+            start, stop = 0, start
+        if not all(isinstance(v, (int, float)) for v in (start, stop, step)):
+            raise TypeError("arange arguments must be int or float")
+        if step == 0:
+            raise ValueError("step must not be zero")
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            count = len(range(start, stop, step))
+        else:
+            count = max(0, math.ceil((stop - start) / step))
+        if count == 0:
+            raise ValueError("arange produces no values")
+        if count == 1:
+            return Number(start)
+        return RangeNumber(start, step, count)
 
     # 一些静态方法
     @staticmethod
-    def add(numbers_a:list[int|float],numbers_b:list[int|float]) -> list[int|float]:
+    def add(numbers_a:list[int|float],numbers_b:list[int|float],out=None) -> list[int|float]:
         """对两个列表中的对应元素执行加法操作
 
+        由number_kernels批量计算: 也接受array、memoryview和numpy数组, 标量会广播到每个元素,
+        结果类型跟随输入(列表得到列表)。
+
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
+            out: 可选的输出列表或缓冲区, 结果直接写入其中
 
         Returns:
             list[int|float]: 包含对应元素加法结果的列表
+
+        Raises:
+            ValueError: 两个列表长度不同时
         """
-        return [a + b for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().add(numbers_a, numbers_b, out)
 
     @staticmethod
-    def sub(numbers_a:list[int|float],numbers_b:list[int|float]) -> list[int|float]:
+    def sub(numbers_a:list[int|float],numbers_b:list[int|float],out=None) -> list[int|float]:
         """对两个列表中的对应元素执行减法操作
 
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
+            out: 可选的输出列表或缓冲区
         Returns:
             list[int|float]: 包含对应元素减法结果的列表
         """
-        return [a - b for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().sub(numbers_a, numbers_b, out)
 
     @staticmethod
-    def mul(numbers_a:list[int|float],numbers_b:list[int|float]) -> list[int|float]:
+    def mul(numbers_a:list[int|float],numbers_b:list[int|float],out=None) -> list[int|float]:
         """对两个列表中的对应元素执行乘法操作
 
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
+            out: 可选的输出列表或缓冲区
 
         Returns:
             list[int|float]: 包含对应元素乘法结果的列表
         """
-        return [a * b for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().mul(numbers_a, numbers_b, out)
 
     @staticmethod
-    def div(numbers_a:list[int|float],numbers_b:list[int|float]) -> list[int|float]:
+    def div(numbers_a:list[int|float],numbers_b:list[int|float],out=None) -> list[int|float]:
         """对两个列表中的对应元素执行除法操作
 
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
+            out: 可选的输出列表或缓冲区
         Returns:
             list[int|float]: 包含对应元素除法结果的列表
         """
-        return [a / b for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().div(numbers_a, numbers_b, out)
 
     @staticmethod
-    def pow(numbers_a:list[int|float],numbers_b:list[int|float]) -> list[int|float]:
+    def pow(numbers_a:list[int|float],numbers_b:list[int|float],out=None) -> list[int|float]:
         """对两个列表中的对应元素执行幂运算
 
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
+            out: 可选的输出列表或缓冲区
 
         Returns:
             list[int|float]: 包含对应元素幂运算结果的列表
         """
-        return [a ** b for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().power(numbers_a, numbers_b, out)
 
     @staticmethod
-    def mod(numbers_a:list[int|float],numbers_b:list[int|float]) -> list[int|float]:
+    def mod(numbers_a:list[int|float],numbers_b:list[int|float],out=None) -> list[int|float]:
         """对两个列表中的对应元素执行取模运算
 
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
+            out: 可选的输出列表或缓冲区
 
         Returns:
             list[int|float]: 包含对应元素取模运算结果的列表
         """
-        return [a % b for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().mod(numbers_a, numbers_b, out)
 
     @staticmethod
     def stacount(numbers:list[int|float],value:int|float) -> int:
@@ -1641,21 +4335,24 @@ class Number(object):
         Returns:
             int: 指定值的个数
         """
-        return numbers.count(value)
+        return _kernels().stacount(numbers, value)
 
     @staticmethod
-    def stazip_with(numbers_a:list[int|float],numbers_b:list[int|float],func:Callable) -> list[int|float]:
+    def stazip_with(numbers_a:list[int|float],numbers_b:list[int|float],func:Callable,out=None) -> list[int|float]:
         """对两个列表中的对应元素执行指定函数操作
 
+        func为operator模块的算术函数或numpy ufunc时整批计算。
+
         Args:
             numbers_a (list[int|float]): 第一个列表
             numbers_b (list[int|float]): 第二个列表
             func (Callable[int|float,int|float]): 要执行的函数
+            out: 可选的输出列表或缓冲区
 
         Returns:
             list[int|float]: 包含对应元素函数操作结果的列表
         """
-        return [func(a, b) for a, b in zip(numbers_a, numbers_b)]
+        return _kernels().zip_with(numbers_a, numbers_b, func, out)
 
     @staticmethod
     def stamax(numbers:list[int|float]) -> int|float:
@@ -1667,7 +4364,7 @@ class Number(object):
         Returns:
             int|float: 列表中的最大值
         """
-        return max(numbers)
+        return _kernels().stamax(numbers)
 
     @staticmethod
     def stamin(numbers:list[int|float]) -> int|float:
@@ -1679,7 +4376,7 @@ class Number(object):
         Returns:
             int|float: 列表中的最小值
         """
-        return min(numbers)
+        return _kernels().stamin(numbers)
 
     @staticmethod
     def stasum(numbers:list[int|float]) -> int|float:
@@ -1691,7 +4388,7 @@ class Number(object):
         Returns:
             int|float: 列表中所有元素的和
         """
-        return sum(numbers)
+        return _kernels().stasum(numbers)
 
     @staticmethod
     def staaverage(numbers:list[int|float]) -> int|float:
@@ -1703,7 +4400,7 @@ class Number(object):
         Returns:
             int|float: 列表中所有元素的平均值
         """
-        return sum(numbers) / len(numbers)
+        return _kernels().staaverage(numbers)
 
     @staticmethod
     def stabin(number:int|float) -> str:
@@ -1755,8 +4452,1134 @@ class Number(object):
         return round(number,ndigits)
 
     def __round__(self, n=None):
-        return round(*self.value, n)
+        return round(*self._data, n)
+
+
+class _BufferNumber(Number):
+    """存储为外部缓冲区(共享内存段、内存映射文件)上memoryview的Number的公共基类
+
+    元素个数和存储类型固定: 不支持append/extend/删除元素, 原地修改元素时写入的值
+    必须能放入原有存储类型; 只读缓冲区上的任何修改都会抛出TypeError。
+    """
+
+    __slots__ = ()
+
+    def _get_data(self) -> memoryview:
+        return Number._data.__get__(self)
+
+    def _set_data(self, storage) -> None:
+        """存储只能原地改写: 长度和类型不变时写回缓冲区, 否则报错"""
+        current = Number._data.__get__(self)
+        if storage is current:
+            return
+        self._check_writable()
+        if isinstance(storage, (int, float)) or len(storage) != len(current) or _typecode(storage) != current.format:
+            raise TypeError(f"{type(self).__name__} has a fixed length and storage type")
+        current[:] = storage
+
+    _data = property(_get_data, _set_data)
+
+    @property
+    def readonly(self) -> bool:
+        """底层缓冲区是否只读"""
+        return Number._data.__get__(self).readonly
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise TypeError(f"{type(self).__name__} is read-only")
+
+    def __setitem__(self, index: int, value: int | float) -> None:
+        self._check_writable()
+        if isinstance(value, (int, float)) and not _storage_fits(self._data, value):
+            raise TypeError(f"Value does not fit the {type(self).__name__} storage type")
+        super().__setitem__(index, value)
+
+    def _inplace(self, op: str, other: "Number | int | float") -> 'Number':
+        self._check_writable()
+        return super()._inplace(op, other)
+
+    def _fixed_length(self, *args, **kwargs) -> None:
+        raise TypeError(f"{type(self).__name__} has a fixed length")
+
+    append = extend = delitem = __delitem__ = _fixed_length
+
+    def to_number(self) -> Number:
+        """复制为普通的Number对象,与外部缓冲区脱离"""
+        obj = Number._from_buffer(self._data)
+        obj.SM = self.SM
+        return obj
+
+    def close(self) -> None:
+        """释放对外部缓冲区的引用,之后不能再访问数据"""
+        Number._data.__get__(self).release()
+
+    def __del__(self) -> None:
+        """未调用close就被回收时先释放存储视图, 使共享内存段/内存映射随后可以正常关闭"""
+        try:
+            Number._data.__get__(self).release()
+        except (AttributeError, BufferError):
+            pass  # 构造未完成, 或视图仍被导出(如numpy数组), 由导出方释放后再关闭
+
+    def __enter__(self) -> '_BufferNumber':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SharedNumber(_BufferNumber):
+    """存放在共享内存(multiprocessing.shared_memory)中的Number
+
+    由Number.to_shared()或SharedNumber(*values)创建, 创建者(owner)负责unlink共享内存段。
+    pickle时只序列化段名、类型码、长度和显示模式, 接收方按名字附加到同一段内存上,
+    不复制数据, 并且只能读取。创建者可以原地修改元素, 长度和存储类型固定。
+
+    示例:
+        with Number(*values).to_shared() as shared:
+            executor.submit(work, shared)  # worker中附加到同一段内存
+    """
+
+    __slots__ = ('_shm', '_owner')
+
+    def __init__(self, *value, show_mode: str = '__visual__') -> None:
+        """创建共享Number, 参数规则与Number相同(至少两个值)
+
+        Raises:
+            ValueError: 未提供任何数值
+            TypeError: 提供的值不是整数或浮点数,只有一个值,或整数超出int64范围
+        """
+        data = Number(*value)._data
+        self._setup(self._new_segment(data), _typecode(data), len(data), True, show_mode)
+
+    @staticmethod
+    def _new_segment(data: "array | memoryview") -> SharedMemory:
+        """创建新的共享内存段并复制data"""
+        if _typecode(data) is None:
+            raise TypeError("Only multi-value Numbers with int64 or float64 storage can be shared")
+        nbytes = len(data) * 8
+        shm = SharedMemory(create=True, size=nbytes)
+        shm.buf[:nbytes] = memoryview(data).cast('B')
+        return shm
+
+    def _setup(self, shm: SharedMemory, typecode: str, length: int, owner: bool, show_mode: str) -> None:
+        """把存储指向共享内存段中的前length个元素, 附加方只得到只读视图"""
+        view = shm.buf[:length * 8]
+        if not owner:
+            view = view.toreadonly()
+        Number._data.__set__(self, view.cast(typecode))
+        self._shm = shm
+        self._owner = owner
+        self.SM = show_mode
+        self._cache = None
+
+    @classmethod
+    def _create(cls, data: "array | memoryview", show_mode: str) -> 'SharedNumber':
+        obj = cls.__new__(cls)
+        obj._setup(cls._new_segment(data), _typecode(data), len(data), True, show_mode)
+        return obj
 
+    @classmethod
+    def _attach(cls, name: str, typecode: str, length: int, show_mode: str) -> 'SharedNumber':
+        """按段名附加到已有的共享内存(pickle的重建入口), 只读"""
+        obj = cls.__new__(cls)
+        obj._setup(_attach_shared(name), typecode, length, False, show_mode)
+        return obj
+
+    def __reduce__(self):
+        data = self._data
+        return SharedNumber._attach, (self._shm.name, data.format, len(data), self.SM)
+
+    @property
+    def name(self) -> str:
+        """共享内存段的名字"""
+        return self._shm.name
+
+    def close(self) -> None:
+        """断开与共享内存的连接,之后不能再访问数据"""
+        super().close()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """删除共享内存段,只有创建者可以调用; 同时断开连接(见close),之后不能再访问数据
+
+        Raises:
+            PermissionError: 当对象是附加得到的只读对象时
+        """
+        if not self._owner:
+            raise PermissionError("Only the creating process can unlink the shared memory")
+        self.close()
+        _unlink_shared(self._shm)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+
+class MappedNumber(_BufferNumber):
+    """以内存映射方式打开的Number文件(见Number.save/Number.open)
+
+    打开时只读取文件头, 数据页在访问时才由操作系统按需载入, 启动开销为O(1)且
+    常驻内存受系统页缓存管理。以writable=True打开时对元素的原地修改会写回文件。
+    pickle时只序列化文件路径, 接收方重新映射同一个文件。
+    """
+
+    __slots__ = ('_mmap', '_path')
+
+    def __reduce__(self):
+        return Number.open, (self._path, True, not self.readonly)
+
+    @property
+    def path(self) -> str:
+        """映射的文件路径"""
+        return self._path
+
+    def flush(self) -> None:
+        """把已修改的数据页写回文件"""
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """关闭内存映射,之后不能再访问数据"""
+        super().close()
+        self._mmap.close()
+
+
+class RangeNumber(Number):
+    """只保存start、step和元素个数的等差序列Number(由Number.linspace/Number.arange创建)
+
+    第i个元素为 start + i * step, 在下标、切片或迭代时才计算:
+    1. len/sum/mean/min/max由公式直接得到, 为O(1)
+    2. 其他需要整块数据的方法使用临时生成的只读缓冲区, 在一次方法调用期间只生成一次, 调用结束即释放
+    3. 第一次修改(下标赋值、追加、删除、复合赋值)时才生成真正的存储, 之后与普通Number相同
+    """
+
+    __slots__ = ('_start', '_step', '_count', '_buffer', '_held', '_calls')
+
+    def __init__(self, start: int | float, step: int | float, count: int, show_mode: str = '__visual__') -> None:
+        """构造等差序列
+
+        Args:
+            start: 第一个元素
+            step: 相邻元素的差
+            count: 元素个数, 至少为2(单个元素请直接使用Number)
+            show_mode: 显示模式设置,同Number
+
+        Raises:
+            ValueError: 当count小于2时
+            TypeError: 当start或step不是数值时
+        """
+        if not all(isinstance(v, (int, float)) for v in (start, step)):
+            raise TypeError("start and step must be int or float")
+        if count < 2:
+            raise ValueError("RangeNumber must contain at least two values")
+        self._start, self._step, self._count = start, step, count
+        self._buffer = None  # 最近一次生成的临时缓冲区(弱引用)
+        self._held = None  # 方法调用期间强引用的临时缓冲区
+        self._calls = 0  # 正在进行的方法调用层数, 见_holding_buffer
+        self.SM = show_mode
+        self._cache = None
+
+    def _materialized(self) -> bool:
+        """是否已经生成了真正的存储"""
+        try:
+            Number._data.__get__(self)
+        except AttributeError:
+            return False
+        return True
+
+    def _get_data(self) -> "array | list | memoryview | int | float":
+        """未生成存储时返回临时的只读缓冲区, 调用方持有期间重复访问不会再次计算"""
+        if self._materialized():
+            return Number._data.__get__(self)
+        if self._held is not None:
+            return self._held
+        buffer = self._buffer() if self._buffer is not None else None
+        if buffer is None:
+            buffer = _range_values(self._start, self._step, range(self._count))
+            if not isinstance(buffer, list):  # 超出int64的整数得到列表, 列表无法只读也无法弱引用
+                buffer = memoryview(buffer).toreadonly()
+                self._buffer = weakref.ref(buffer)
+        if self._calls:
+            self._held = buffer
+        return buffer
+
+    def _set_data(self, storage) -> None:
+        Number._data.__set__(self, storage)
+        self._buffer = self._held = None
+
+    _data = property(_get_data, _set_data)
+
+    def _materialize(self) -> None:
+        """生成真正的存储, 之后所有操作都在该存储上进行"""
+        if not self._materialized():
+            self._data = _range_values(self._start, self._step, range(self._count))
+
+    def __reduce__(self):
+        if self._materialized():
+            return Number.from_buffer, (self._data, self.SM)
+        return RangeNumber, (self._start, self._step, self._count, self.SM)
+
+    def _cache_dict(self) -> dict:
+        """序列在生成存储前不会改变(生成的存储与之内容相同), 可以直接缓存, 不必先生成缓冲区"""
+        if self._materialized():
+            return super()._cache_dict()
+        if self._cache is None:
+            self._cache = {}
+        return self._cache
+
+    def __len__(self) -> int:
+        return len(Number._data.__get__(self)) if self._materialized() else self._count
+
+    def _item(self, index: int) -> int | float:
+        return self._start + index * self._step
+
+    def __getitem__(self, index: "int | slice | Mask") -> "int | float | tuple[int | float, ...]":
+        if self._materialized() or isinstance(index, Mask):
+            return super().__getitem__(index)
+        if isinstance(index, slice):
+            return tuple(_range_values(self._start, self._step, range(self._count)[index]))
+        if not -self._count <= index < self._count:
+            raise IndexError("Number index out of range")
+        return self._item(index % self._count)
+
+    def __iter__(self):
+        if self._materialized():
+            return iter(Number._data.__get__(self))
+        return (self._start + i * self._step for i in range(self._count))
+
+    def _last(self) -> int | float:
+        return self._item(self._count - 1)
+
+    def sum(self) -> int | float:
+        """求和: 等差数列求和公式, O(1)"""
+        if self._materialized():
+            return super().sum()
+        n = self._count
+        if isinstance(self._start, int) and isinstance(self._step, int):
+            return n * self._start + self._step * (n * (n - 1) // 2)
+        return n * (self._start + self._last()) / 2
+
+    def mean(self) -> float:
+        """平均值: 首尾元素的平均, O(1)"""
+        if self._materialized():
+            return super().mean()
+        return (self._start + self._last()) / 2
+
+    def max(self) -> int | float:
+        """最大值: 首元素或尾元素, O(1)"""
+        if self._materialized():
+            return super().max()
+        return max(self._start, self._last())
+
+    def min(self) -> int | float:
+        """最小值: 首元素或尾元素, O(1)"""
+        if self._materialized():
+            return super().min()
+        return min(self._start, self._last())
+
+    def __setitem__(self, index: int, value: int | float) -> None:
+        self._materialize()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: int) -> None:
+        self._materialize()
+        super().__delitem__(index)
+
+    def delitem(self, *indices) -> None:
+        self._materialize()
+        super().delitem(*indices)
+
+    def append(self, value: int | float) -> None:
+        self._materialize()
+        super().append(value)
+
+    def extend(self, values: "list | tuple | Number") -> None:
+        self._materialize()
+        super().extend(values)
+
+    def _inplace(self, op: str, other: "Number | int | float") -> 'Number':
+        self._materialize()
+        return super()._inplace(op, other)
+
+
+def _holding_buffer(method: Callable) -> Callable:
+    """包装继承自Number的方法: 调用期间强引用RangeNumber的临时缓冲区
+
+    同一次调用(包括其中嵌套的方法调用)里多次访问self._data只生成一次缓冲区,
+    最外层调用结束后释放, 不会在两次调用之间一直占用内存。
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._calls += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._calls -= 1
+            if not self._calls:
+                self._held = None
+    return wrapper
+
+
+for _name, _method in list(vars(Number).items()):
+    if isinstance(_method, FunctionType) and _name not in vars(RangeNumber) and _name not in ('__init__', '__del__'):
+        setattr(RangeNumber, _name, _holding_buffer(_method))
+del _name, _method
+
+
+class _VectorFallback(Exception):
+    """向量化路径无法保证与纯Python语义一致时, 用于通知调用方改走纯Python路径"""
+
+
+class LazyNumber(object):
+    """
+    LazyNumber 类型:Number的延迟求值表达式
+
+    主要特性:
+    1. 运算符(+,-,*,/,**)和数学方法(sqrt, exp, log, sin, cos, tan, item_map)只构建表达式树
+    2. 访问.value、sum()、mean()、to_list()等方法时才求值
+    3. 求值时整棵树融合为单次遍历: 纯Python路径组合为嵌套的map迭代器,
+       numpy路径按块计算, 中间结果只占用一个块的内存, 最终只分配一个输出缓冲区
+    4. 异常语义与Number一致(长度不同抛ValueError, 除零抛ZeroDivisionError等, 两条路径的异常信息相同),
+       但定义域与除零错误在求值时才会抛出
+    """
+    _CHUNK_SIZE = 65536  # numpy路径每块的元素数
+    _BINARY_SYMBOLS = {'add': '+', 'sub': '-', 'mul': '*', 'truediv': '/', 'pow': '**'}
+    _FLOAT_OPS = ('truediv', 'sqrt', 'exp', 'log', 'sin', 'cos', 'tan')
+
+    def __init__(self, op: str, args: tuple, length: int) -> None:
+        """构造表达式节点, 一般通过Number.lazy()获得, 不需要直接调用
+
+        参数:
+            op: 节点类型, 'leaf'/'const'/二元运算名/一元函数名/'map'
+            args: 子节点或节点参数
+            length: 表达式结果的长度
+        """
+        self._op = op
+        self._args = args
+        self._length = length
+
+    def __repr__(self) -> str:
+        """返回表达式的字符串表示(不会触发求值)"""
+        return f'LazyNumber({self._describe()}, length={self._length})'
+
+    def _describe(self) -> str:
+        """递归生成表达式的简短描述"""
+        op = self._op
+        if op == 'leaf':
+            return 'Number'
+        if op == 'const':
+            return repr(self._args[0])
+        if op in self._BINARY_SYMBOLS:
+            return f'({self._args[0]._describe()} {self._BINARY_SYMBOLS[op]} {self._args[1]._describe()})'
+        if op == 'map':
+            return f'map({self._args[0]._describe()})'
+        return f'{op}({self._args[0]._describe()})'
+
+    def __len__(self) -> int:
+        """返回表达式结果的长度(不会触发求值)"""
+        return self._length
+
+    # 表达式构建
+    def _operand(self, other: "LazyNumber | Number | int | float", symbol: str) -> 'LazyNumber':
+        """把另一个操作数转换为表达式节点, 并按照Number的规则检查长度"""
+        if isinstance(other, LazyNumber):
+            node = other
+        elif isinstance(other, Number):
+            if isinstance(other._data, (int, float)):
+                raise ValueError("Cannot combine single value with multiple values")
+            node = LazyNumber('leaf', (other._data,), len(other._data))
+        elif isinstance(other, (int, float)):
+            return LazyNumber('const', (other,), self._length)
+        else:
+            raise TypeError(f"Unsupported operand type for {symbol}: '{type(self).__name__}' and '{type(other).__name__}'")
+        if node._length != self._length:
+            raise ValueError("Cannot combine Numbers with different lengths")
+        return node
+
+    def _binary(self, op: str, other, reflected: bool = False) -> 'LazyNumber':
+        """构建二元运算节点"""
+        node = self._operand(other, self._BINARY_SYMBOLS[op])
+        args = (node, self) if reflected else (self, node)
+        return LazyNumber(op, args, self._length)
+
+    def __add__(self, other: "LazyNumber | Number | int | float") -> 'LazyNumber':
+        return self._binary('add', other)
+
+    def __radd__(self, other: int | float) -> 'LazyNumber':
+        return self._binary('add', other, reflected=True)
+
+    def __sub__(self, other: "LazyNumber | Number | int | float") -> 'LazyNumber':
+        return self._binary('sub', other)
+
+    def __rsub__(self, other: int | float) -> 'LazyNumber':
+        return self._binary('sub', other, reflected=True)
+
+    def __mul__(self, other: "LazyNumber | Number | int | float") -> 'LazyNumber':
+        return self._binary('mul', other)
+
+    def __rmul__(self, other: int | float) -> 'LazyNumber':
+        return self._binary('mul', other, reflected=True)
+
+    def __truediv__(self, other: "LazyNumber | Number | int | float") -> 'LazyNumber':
+        return self._binary('truediv', other)
+
+    def __rtruediv__(self, other: int | float) -> 'LazyNumber':
+        return self._binary('truediv', other, reflected=True)
+
+    def __pow__(self, power: "LazyNumber | Number | int | float") -> 'LazyNumber':
+        return self._binary('pow', power)
+
+    def __neg__(self) -> 'LazyNumber':
+        return LazyNumber('neg', (self,), self._length)
+
+    def __abs__(self) -> 'LazyNumber':
+        return LazyNumber('abs', (self,), self._length)
+
+    def sqrt(self) -> 'LazyNumber':
+        """延迟计算平方根"""
+        return LazyNumber('sqrt', (self,), self._length)
+
+    def exp(self) -> 'LazyNumber':
+        """延迟计算e的指数"""
+        return LazyNumber('exp', (self,), self._length)
+
+    def log(self, base: float = math.e) -> 'LazyNumber':
+        """延迟计算以base为底的对数, 底数在构建表达式时检查(见Number.log)"""
+        _check_log_base(base)
+        return LazyNumber('log', (self, base), self._length)
+
+    def sin(self) -> 'LazyNumber':
+        """延迟计算正弦值"""
+        return LazyNumber('sin', (self,), self._length)
+
+    def cos(self) -> 'LazyNumber':
+        """延迟计算余弦值"""
+        return LazyNumber('cos', (self,), self._length)
+
+    def tan(self) -> 'LazyNumber':
+        """延迟计算正切值"""
+        return LazyNumber('tan', (self,), self._length)
+
+    def item_map(self, func: Callable) -> 'LazyNumber':
+        """延迟对每个元素应用函数
+
+        Raises:
+            TypeError: 当func不是可调用对象时
+        """
+        if not callable(func):
+            raise TypeError('func must be a function object')
+        return LazyNumber('map', (self, func), self._length)
+
+    # 求值
+    def _leaves(self) -> list:
+        """按首次出现顺序收集所有不同的叶子存储"""
+        leaves = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._op == 'leaf':
+                leaves.setdefault(id(node._args[0]), node._args[0])
+            elif node._op != 'const':
+                stack.extend(arg for arg in node._args if isinstance(arg, LazyNumber))
+        for storage in leaves.values():
+            if len(storage) != self._length:
+                raise ValueError("Operand Number was resized before evaluation")
+        return list(leaves.values())
+
+    def _is_float(self) -> bool:
+        """静态判断表达式结果是否一定为浮点数(或因类型错误而失败)"""
+        op = self._op
+        if op == 'leaf':
+            return isinstance(self._args[0], array) and self._args[0].typecode == 'd'
+        if op == 'const':
+            return isinstance(self._args[0], float)
+        if op == 'map':
+            return False
+        if op in self._FLOAT_OPS:
+            return True
+        if op in self._BINARY_SYMBOLS:
+            return self._args[0]._is_float() or self._args[1]._is_float()
+        return self._args[0]._is_float()
+
+    def _python_func(self) -> Callable:
+        """纯Python路径中本节点的逐元素函数; 定义域错误和除零错误的异常信息与Number(以及numpy路径)一致"""
+        op = self._op
+        if op == 'truediv':
+            def divide(a, b):
+                try:
+                    return a / b
+                except ZeroDivisionError:
+                    raise ZeroDivisionError("Division by zero") from None
+            return divide
+        if op in self._BINARY_SYMBOLS:
+            return _PY_FUNCS[op][0]
+        if op == 'map':
+            return self._args[1]
+        if op == 'neg':
+            return operator.neg
+        if op == 'abs':
+            return abs
+        if op == 'log':
+            base = self._args[1]
+            func = lambda v: math.log(v, base)
+        else:
+            func = getattr(math, op)
+        if op not in Number._MATH_ERRORS:
+            return func
+        message = Number._MATH_ERRORS[op]
+
+        def checked(v):
+            try:
+                return func(v)
+            except ValueError:
+                raise ValueError(message) from None
+        return checked
+
+    def _vector_chunk(self, views: dict, start: int, stop: int):
+        """numpy路径: 计算表达式在[start, stop)区间上的结果
+
+        Raises:
+            _VectorFallback: 当结果可能与纯Python语义不一致时
+        """
+        op = self._op
+        if op == 'leaf':
+            return views[id(self._args[0])][start:stop]
+        if op == 'const':
+            return self._args[0]
+        a = self._args[0]._vector_chunk(views, start, stop)
+        if op in self._BINARY_SYMBOLS:
+            b = self._args[1]._vector_chunk(views, start, stop)
+            if op == 'truediv' and (b == 0 if isinstance(b, (int, float)) else not b.all()):
+                raise ZeroDivisionError("Division by zero")
+            result = _VECTOR_FUNCS[op](a, b)
+        elif op == 'sqrt':
+            if (a < 0).any():
+                raise ValueError("Cannot calculate square root of negative Number")
+            result = _np.sqrt(a)
+        elif op == 'log':
+            if (a <= 0).any():
+                raise ValueError("Cannot calculate logarithm of non-positive Number")
+            base = self._args[1]
+            result = _np.log(a) if base == math.e else _np.log(a) / math.log(base)
+        elif op == 'neg':
+            result = -a
+        elif op == 'abs':
+            result = _np.abs(a)
+        else:
+            result = getattr(_np, op)(a)
+        if not _np.isfinite(result).all():
+            # Python中exp/pow溢出会抛异常、sin(inf)抛ValueError, numpy则静默产生inf/nan
+            raise _VectorFallback
+        return result
+
+    def _vector_chunks(self, leaves: list):
+        """numpy路径: 按块生成表达式结果; 不满足向量化条件时返回None"""
+        if _np is None or self._length < _VECTOR_THRESHOLD:
+            return None
+        if self._has_map() or not all(isinstance(s, array) and s.typecode == 'd' for s in leaves):
+            return None
+
+        def chunks():
+            views = {id(storage): _ndview(storage) for storage in leaves}
+            with _np.errstate(all='ignore'):
+                for start in range(0, self._length, self._CHUNK_SIZE):
+                    stop = min(start + self._CHUNK_SIZE, self._length)
+                    yield start, stop, self._vector_chunk(views, start, stop)
+        return chunks()
+
+    def _has_map(self) -> bool:
+        """判断表达式中是否含有任意函数映射(无法向量化)"""
+        if self._op == 'map':
+            return True
+        return any(isinstance(arg, LazyNumber) and arg._has_map() for arg in self._args)
+
+    def _iter_values(self):
+        """纯Python路径: 把表达式树组合为嵌套的map迭代器, 单次遍历逐个生成结果
+
+        叶子为存储的迭代器, 常量为repeat, 运算节点为map(逐元素函数, 子迭代器...),
+        算术运算直接使用operator中的函数, 整个遍历基本在C层完成, 不生成中间结果。
+        """
+        op = self._op
+        if op == 'leaf':
+            return iter(self._args[0])
+        if op == 'const':
+            return repeat(self._args[0], self._length)
+        children = [arg._iter_values() for arg in self._args if isinstance(arg, LazyNumber)]
+        return map(self._python_func(), *children)
+
+    def _evaluate_storage(self) -> "array | list":
+        """融合求值, 结果直接写入唯一的输出缓冲区"""
+        leaves = self._leaves()
+        chunks = self._vector_chunks(leaves)
+        if chunks is not None:
+            out = array('d', bytes(8 * self._length))
+            view = _ndview(out)
+            try:
+                for start, stop, result in chunks:
+                    view[start:stop] = result
+            except _VectorFallback:
+                pass
+            else:
+                return out
+            finally:
+                del view
+        if self._is_float():
+            return array('d', self._iter_values())
+        values = list(self._iter_values())
+        if not all(isinstance(v, (int, float)) for v in values):
+            raise TypeError("All values must be int or float")
+        return _to_storage(values)
+
+    def evaluate(self) -> Number:
+        """对表达式求值
+
+        Returns:
+            Number: 包含求值结果的新Number对象
+        """
+        return Number._from_buffer(self._evaluate_storage())
+
+    @property
+    def value(self) -> tuple[int | float, ...]:
+        """对表达式求值并返回与Number.value相同格式的结果"""
+        return self.evaluate().value
+
+    def to_list(self) -> list:
+        """对表达式求值并转换为Python列表(结果超出int64时存储本身就是列表)"""
+        storage = self._evaluate_storage()
+        return storage.tolist() if isinstance(storage, array) else list(storage)
+
+    def to_tuple(self) -> tuple:
+        """对表达式求值并转换为Python元组"""
+        return tuple(self._evaluate_storage())
+
+    def _reduce(self, vector_func: Callable, python_func: Callable) -> int | float:
+        """不分配输出缓冲区, 边求值边归约"""
+        leaves = self._leaves()
+        chunks = self._vector_chunks(leaves)
+        if chunks is not None:
+            try:
+                return python_func(vector_func(result) for _, _, result in chunks)
+            except _VectorFallback:
+                pass
+        return python_func(self._iter_values())
+
+    def sum(self) -> int | float:
+        """融合求值并计算总和"""
+        return self._reduce(lambda chunk: float(chunk.sum()), sum)
+
+    def mean(self) -> float:
+        """融合求值并计算算术平均值"""
+        return self.sum() / self._length
+
+    def max(self) -> int | float:
+        """融合求值并返回最大值"""
+        return self._reduce(lambda chunk: float(chunk.max()), max)
+
+    def min(self) -> int | float:
+        """融合求值并返回最小值"""
+        return self._reduce(lambda chunk: float(chunk.min()), min)
+
+
+class ChunkedNumber(object):
+    """
+    ChunkedNumber 类型:按块流式处理的数值序列, 数据量可以大于内存
+
+    主要特性:
+    1. 数据来源是块的可迭代对象或生成函数(每块为Number、数组、列表或元组), 也可以是Number文件
+    2. 归约方法(sum, mean, min, max, variance, std_dev, count, product, stats)单次遍历所有块,
+       内存占用只与块大小有关
+    3. 逐元素运算(+,-,*,/,//,%,**、数学方法、item_map、item_filter)返回新的ChunkedNumber,
+       以生成器流水线的方式逐块计算, 构建时不会读取数据
+    4. slice、下标和head只物化需要的部分, 读到所需位置后立即停止
+    5. 来源为一次性迭代器时只能遍历一次, 需要多次归约时应传入可重复迭代的对象或生成函数,
+       或者用stats()一次得到全部统计量
+    """
+    _CHUNK_SIZE = 65536  # 由逐个数值或文件构造时每块的元素数
+
+    def __init__(self, chunks: "Iterable | Callable[[], Iterable]") -> None:
+        """构造分块序列
+
+        参数:
+            chunks: 块的可迭代对象, 或每次调用都返回新的块迭代器的函数
+        """
+        self._source = chunks
+        self._trusted = False  # 来源是否为内部流水线(已经是非空的紧凑存储)
+        self._consumed = False
+
+    @classmethod
+    def _derive(cls, chunks: Callable) -> 'ChunkedNumber':
+        """由内部生成函数构造, 生成函数产生的块已经是非空存储, 不再检查"""
+        obj = cls(chunks)
+        obj._trusted = True
+        return obj
+
+    @classmethod
+    def from_iterable(cls, values: "Iterable[int | float]", chunksize: "int | None" = None) -> 'ChunkedNumber':
+        """把逐个产生数值的可迭代对象按chunksize分块
+
+        Args:
+            values: 数值可迭代对象
+            chunksize: 每块的元素数, 默认为_CHUNK_SIZE
+        """
+        size = chunksize or cls._CHUNK_SIZE
+
+        def chunks():
+            iterator = iter(values)
+            while True:
+                block = list(islice(iterator, size))
+                if not block:
+                    return
+                yield block
+        return cls(chunks() if iter(values) is values else chunks)
+
+    @classmethod
+    def from_file(cls, path: "str | os.PathLike", chunksize: "int | None" = None) -> 'ChunkedNumber':
+        """按块读取Number.save保存的文件, 每次遍历只在内存中保留一块
+
+        Args:
+            path: 文件路径
+            chunksize: 每块的元素数, 默认为_CHUNK_SIZE
+
+        Raises:
+            ValueError: 文件不是Number文件时(遍历时抛出)
+        """
+        size = chunksize or cls._CHUNK_SIZE
+
+        def chunks():
+            with open(path, 'rb') as f:
+                typecode, remaining = _read_file_header(f)
+                while remaining:
+                    block = array(typecode)
+                    block.fromfile(f, min(size, remaining))
+                    if sys.byteorder != 'little':
+                        block.byteswap()
+                    remaining -= len(block)
+                    yield block
+        return cls._derive(chunks)
+
+    def __repr__(self) -> str:
+        """返回对象的字符串表示(不会读取数据)"""
+        return 'ChunkedNumber(<streaming>)'
+
+    def _storages(self):
+        """逐块产生非空的紧凑存储"""
+        source = self._source
+        chunks = source() if callable(source) else source
+        if self._trusted:
+            yield from chunks
+            return
+        if not callable(source) and iter(source) is source:
+            if self._consumed:
+                raise ValueError("ChunkedNumber source is an iterator and has already been consumed")
+            self._consumed = True
+        for chunk in chunks:
+            if isinstance(chunk, Number):
+                data = chunk._data
+            elif isinstance(chunk, array) and chunk.typecode in ('q', 'd'):
+                data = chunk
+            elif isinstance(chunk, (int, float)):
+                data = chunk
+            else:
+                values = chunk if isinstance(chunk, (list, tuple)) else list(chunk)
+                if not values:
+                    continue
+                data = Number.from_iterable(values)._data
+            if isinstance(data, (int, float)):
+                data = _to_storage((data,))
+            if len(data):
+                yield data
+
+    @staticmethod
+    def _result(number: Number) -> "array | list":
+        """把逐块运算得到的Number转换回块存储"""
+        data = number._data
+        return _to_storage((data,)) if isinstance(data, (int, float)) else data
+
+    def _map_chunks(self, func: Callable) -> 'ChunkedNumber':
+        """对每块应用Number上的运算, 返回新的流水线"""
+        return ChunkedNumber._derive(lambda: (self._result(func(Number._from_buffer(data))) for data in self._storages()))
+
+    @staticmethod
+    def _aligned(left, right):
+        """把两个块迭代器切成长度一致的块对
+
+        Raises:
+            ValueError: 两个序列总长度不同时
+        """
+        a = b = None
+        i = j = 0
+        while True:
+            if a is None or i == len(a):
+                a, i = next(left, None), 0
+            if b is None or j == len(b):
+                b, j = next(right, None), 0
+            if a is None or b is None:
+                if a is not None or b is not None:
+                    raise ValueError("Cannot combine Numbers with different lengths")
+                return
+            n = min(len(a) - i, len(b) - j)
+            yield (a if n == len(a) else a[i:i + n]), (b if n == len(b) else b[j:j + n])
+            i += n
+            j += n
+
+    # 逐元素运算
+    def _binary(self, op: str, other: "ChunkedNumber | Number | int | float", reflected: bool = False) -> 'ChunkedNumber':
+        """二元运算的公共实现, 运算规则与Number相同"""
+        func, symbol = _PY_FUNCS[op]
+        if isinstance(other, Number):
+            other = ChunkedNumber((other,))
+        if isinstance(other, ChunkedNumber):
+            def chunks():
+                for a, b in self._aligned(self._storages(), other._storages()):
+                    yield self._result(func(Number._from_buffer(a), Number._from_buffer(b)))
+            return ChunkedNumber._derive(chunks)
+        if not isinstance(other, (int, float)):
+            raise TypeError(f"Unsupported operand type for {symbol}: '{type(self).__name__}' and '{type(other).__name__}'")
+        if reflected:
+            return self._map_chunks(lambda n: func(other, n))
+        return self._map_chunks(lambda n: func(n, other))
+
+    def __add__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('add', other)
+
+    def __radd__(self, other: int | float) -> 'ChunkedNumber':
+        return self._binary('add', other, reflected=True)
+
+    def __sub__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('sub', other)
+
+    def __rsub__(self, other: int | float) -> 'ChunkedNumber':
+        return self._binary('sub', other, reflected=True)
+
+    def __mul__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('mul', other)
+
+    def __rmul__(self, other: int | float) -> 'ChunkedNumber':
+        return self._binary('mul', other, reflected=True)
+
+    def __truediv__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('truediv', other)
+
+    def __rtruediv__(self, other: int | float) -> 'ChunkedNumber':
+        return self._binary('truediv', other, reflected=True)
+
+    def __floordiv__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('floordiv', other)
+
+    def __mod__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('mod', other)
+
+    def __pow__(self, other: "ChunkedNumber | Number | int | float") -> 'ChunkedNumber':
+        return self._binary('pow', other)
+
+    def __rpow__(self, other: int | float) -> 'ChunkedNumber':
+        return self._binary('pow', other, reflected=True)
+
+    def __neg__(self) -> 'ChunkedNumber':
+        return self._map_chunks(operator.neg)
+
+    def __abs__(self) -> 'ChunkedNumber':
+        return self._map_chunks(abs)
+
+    def sqrt(self) -> 'ChunkedNumber':
+        """逐块计算平方根"""
+        return self._map_chunks(Number.sqrt)
+
+    def exp(self) -> 'ChunkedNumber':
+        """逐块计算e的幂"""
+        return self._map_chunks(Number.exp)
+
+    def log(self, base: float = math.e) -> 'ChunkedNumber':
+        """逐块计算以base为底的对数, 底数在构建时检查(见Number.log)"""
+        _check_log_base(base)
+        return self._map_chunks(lambda n: n.log(base))
+
+    def sin(self) -> 'ChunkedNumber':
+        """逐块计算正弦值"""
+        return self._map_chunks(Number.sin)
+
+    def cos(self) -> 'ChunkedNumber':
+        """逐块计算余弦值"""
+        return self._map_chunks(Number.cos)
+
+    def tan(self) -> 'ChunkedNumber':
+        """逐块计算正切值"""
+        return self._map_chunks(Number.tan)
+
+    def item_map(self, func: Callable) -> 'ChunkedNumber':
+        """逐块对每个元素应用函数
+
+        Raises:
+            TypeError: 当func不是可调用对象时
+        """
+        if not callable(func):
+            raise TypeError('func must be a function object')
+        return ChunkedNumber._derive(lambda: (
+            self._result(Number.from_iterable(map(func, data))) for data in self._storages()))
+
+    def item_filter(self, predicate: Callable) -> 'ChunkedNumber':
+        """逐块筛选满足条件的元素, 筛选后为空的块会被跳过
+
+        Raises:
+            TypeError: 当predicate不是可调用对象时
+        """
+        if not callable(predicate):
+            raise TypeError('predicate must be a function object')
+
+        def chunks():
+            for data in self._storages():
+                kept = [v for v in data if predicate(v)]
+                if kept:
+                    yield _to_storage(kept)
+        return ChunkedNumber._derive(chunks)
+
+    # 归约
+    def chunks(self):
+        """逐块产生Number对象"""
+        for data in self._storages():
+            yield Number._from_buffer(data)
+
+    def __iter__(self):
+        """逐个产生元素"""
+        for data in self._storages():
+            yield from data
+
+    def stats(self) -> StatsAccumulator:
+        """单次遍历得到count, sum, mean, variance, std_dev, min, max
+
+        Returns:
+            StatsAccumulator: 合并了所有块的累加器
+        """
+        acc = StatsAccumulator()
+        for data in self._storages():
+            acc.merge(StatsAccumulator._from_storage(data))
+        return acc
+
+    def count(self, value: "int | float | None" = None) -> int:
+        """不指定value时返回元素总数, 否则返回value出现的次数"""
+        if value is None:
+            return sum(len(data) for data in self._storages())
+        return sum(n.count(value) for n in self.chunks())
+
+    def sum(self) -> int | float:
+        """计算总和, 没有数据时返回0"""
+        return sum(n.sum() for n in self.chunks())
+
+    def product(self) -> int | float:
+        """计算所有元素的乘积, 没有数据时返回1"""
+        return reduce(operator.mul, (n.product() for n in self.chunks()), 1)
+
+    def mean(self) -> float:
+        """计算算术平均值
+
+        Raises:
+            ValueError: 没有数据时
+        """
+        return self.stats().mean
+
+    def max(self) -> int | float:
+        """返回最大值
+
+        Raises:
+            ValueError: 没有数据时
+        """
+        return self.stats().max
+
+    def min(self) -> int | float:
+        """返回最小值
+
+        Raises:
+            ValueError: 没有数据时
+        """
+        return self.stats().min
+
+    def variance(self) -> float:
+        """计算总体方差(与Number.variance一致)
+
+        Raises:
+            ValueError: 没有数据时
+        """
+        return self.stats().variance
+
+    def std_dev(self) -> float:
+        """计算总体标准差
+
+        Raises:
+            ValueError: 没有数据时
+        """
+        return self.stats().std_dev
+
+    # 按需物化
+    def slice(self, start: int = 0, stop: "int | None" = None) -> Number:
+        """只读取[start, stop)范围内的数据并物化为Number
+
+        读到stop后立即停止, 不会遍历剩余的块。
+
+        Args:
+            start: 起始位置
+            stop: 结束位置(不含), 默认到末尾
+
+        Returns:
+            Number: 包含该范围数据的Number对象
+
+        Raises:
+            ValueError: 当位置为负数或范围内没有数据时
+        """
+        storage = self._slice_storage(start, stop)
+        if storage is None:
+            raise ValueError("Slice contains no values")
+        return Number._from_buffer(storage)
+
+    def _slice_storage(self, start: int, stop: "int | None") -> "array | list | None":
+        """读取[start, stop)范围内的数据为一个存储, 范围内没有数据时返回None"""
+        if start < 0 or (stop is not None and stop < 0):
+            raise ValueError("ChunkedNumber slices require non-negative bounds")
+        parts = []
+        position = 0
+        for data in self._storages():
+            if stop is not None and position >= stop:
+                break
+            lo = max(start - position, 0)
+            hi = len(data) if stop is None else min(stop - position, len(data))
+            if lo < hi:
+                parts.append(data if hi - lo == len(data) else data[lo:hi])
+            position += len(data)
+        if not parts:
+            return None
+        if all(isinstance(p, array) for p in parts) and len({p.typecode for p in parts}) == 1:
+            storage = array(parts[0].typecode)
+            for part in parts:
+                storage.extend(part)
+            return storage
+        return _to_storage(list(chain.from_iterable(parts)))
+
+    def head(self, n: int = 5) -> Number:
+        """物化前n个元素"""
+        return self.slice(0, n)
+
+    def __getitem__(self, index: "int | slice") -> "int | float | tuple[int | float, ...]":
+        """按下标或切片读取, 只支持非负位置, 切片时与Number一样返回元组(范围内没有数据时为空元组)
+
+        Raises:
+            IndexError: 当下标为负数或越界时
+        """
+        if isinstance(index, slice):
+            if index.step is not None and index.step <= 0:
+                raise ValueError("ChunkedNumber slices require a positive step")
+            storage = self._slice_storage(index.start or 0, index.stop)
+            data = () if storage is None else tuple(storage)
+            return data[::index.step] if index.step else data
+        if index < 0:
+            raise IndexError("ChunkedNumber does not support negative indices")
+        try:
+            return self.slice(index, index + 1)._data
+        except ValueError:
+            raise IndexError("ChunkedNumber index out of range") from None
+
+    def to_number(self) -> Number:
+        """把全部数据物化为Number对象"""
+        return self.slice(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,289 @@
+"""
+Number批量计算内核
+对列表、元组、array、memoryview或numpy数组批量执行逐元素运算和归约:
+1. 输入包含array/memoryview/numpy缓冲区、数据量达到阈值且numpy可用时使用向量化实现,
+   语义与逐元素的Python运算一致(整数不会溢出、除零抛出ZeroDivisionError、浮点幂溢出抛出OverflowError)
+2. 纯列表/元组输入转换为缓冲区再转回列表的开销超过计算本身, 改用map/内置函数在C层逐元素计算
+3. 标量操作数广播到另一个操作数的每个元素
+4. 逐元素运算支持out=参数, 把结果写入调用方提供的列表或缓冲区
+5. 结果类型跟随输入: 列表/元组得到列表, numpy数组得到numpy数组, 其他缓冲区得到array
+Number.add/sub/mul/div/pow/mod/stazip_with/stasum/stamax/stamin/staaverage/stacount委托给本模块,
+函数名与之对应(pow对应power), 不与内置的sum/max/min/pow重名
+"""
+import operator
+from array import array
+from collections.abc import Callable
+
+from number_class import (_INT64_MAX, _PY_FUNCS, _VECTOR_THRESHOLD, _adopt_buffer, _contains_zero,
+                          _max_abs, _ndview, _np, _to_storage, _typecode, _vector_binary)
+
+_NUMERIC_TYPES = {int, float}
+_FLOAT_INPLACE_OPS = ('add', 'sub', 'mul', 'truediv')  # 浮点数上与Python语义完全一致的运算
+_FLOAT_UFUNCS = {
+    'add': _np.add,
+    'sub': _np.subtract,
+    'mul': _np.multiply,
+    'truediv': _np.true_divide,
+} if _np is not None else {}
+
+_OPERATOR_OPS = {
+    operator.add: 'add',
+    operator.sub: 'sub',
+    operator.mul: 'mul',
+    operator.truediv: 'truediv',
+    operator.floordiv: 'floordiv',
+    operator.mod: 'mod',
+    operator.pow: 'pow',
+}
+
+
+def _as_storage(values) -> "array | memoryview | list | int | float | None":
+    """把输入转换为紧凑存储(标量原样返回), 包含非int/float元素时返回None"""
+    if isinstance(values, (int, float)):
+        return values
+    if isinstance(values, array) and values.typecode in ('q', 'd'):
+        return values
+    if isinstance(values, (list, tuple)):
+        if not set(map(type, values)) <= _NUMERIC_TYPES:
+            return None
+        return _to_storage(values)
+    try:
+        return _adopt_buffer(values)
+    except (TypeError, ValueError):
+        return None
+
+
+def _view(values):
+    """返回输入的numpy视图(零拷贝), 不适用时返回None"""
+    if _np is None:
+        return None
+    if isinstance(values, _np.ndarray):
+        return values if values.ndim == 1 else None
+    storage = _as_storage(values)
+    return None if storage is None or isinstance(storage, (int, float)) else _ndview(storage)
+
+
+def _is_buffer(values) -> bool:
+    """values是否为array、memoryview或numpy数组等可零拷贝访问的缓冲区"""
+    return not isinstance(values, (int, float, list, tuple, str, bytes))
+
+
+def _like(values: "array | list", template):
+    """按template的类型返回结果: 列表/元组得到列表, numpy数组得到numpy数组, 其他得到array"""
+    if isinstance(template, (list, tuple)):
+        return values.tolist() if isinstance(values, array) else list(values)
+    if _np is not None and isinstance(template, _np.ndarray):
+        return _np.array(values.tolist() if isinstance(values, array) and _typecode(values) is None else values)
+    return values if isinstance(values, array) else _to_storage(values)
+
+
+def _check_out(out, length: int) -> None:
+    if len(out) != length:
+        raise ValueError("out must have the same length as the operands")
+
+
+def _write_out(out, values: "array | list"):
+    """把结果写入out并返回out"""
+    target = out if _np is not None and isinstance(out, _np.ndarray) else None
+    if target is None and _np is not None and not isinstance(out, list) and _typecode(values) is not None:
+        target = _view(out)
+    if target is not None and _typecode(values) is not None:
+        _np.copyto(target, _ndview(values), casting='same_kind')
+    elif isinstance(out, list):
+        out[:] = values.tolist() if isinstance(values, array) else values
+    else:
+        for i, v in enumerate(values):
+            out[i] = v
+    return out
+
+
+def _binary(op: str, a, b, out=None):
+    """逐元素二元运算的公共实现
+
+    Args:
+        op: 运算名, 与Number内部的运算名一致('add'、'truediv'等)
+        a: 左操作数, 序列、缓冲区或标量
+        b: 右操作数, 序列、缓冲区或标量
+        out: 可选的输出列表或缓冲区, 长度必须与操作数相同
+
+    Raises:
+        ValueError: 两个序列长度不同,或out长度不匹配时
+        ZeroDivisionError: 除数为零时
+    """
+    func = _PY_FUNCS[op][0]
+    a_scalar, b_scalar = isinstance(a, (int, float)), isinstance(b, (int, float))
+    if a_scalar and b_scalar:
+        return func(a, b)
+    template = b if a_scalar else a
+    length = len(template)
+    if not a_scalar and not b_scalar and len(b) != length:
+        raise ValueError("Operands must have the same length")
+    if out is not None:
+        _check_out(out, length)
+    x = y = None
+    if _np is not None and length >= _VECTOR_THRESHOLD and (_is_buffer(a) or _is_buffer(b)):
+        x, y = _as_storage(a), _as_storage(b)
+        if x is None or y is None:
+            x = y = None
+        elif op in ('truediv', 'floordiv', 'mod') and (y == 0 if b_scalar else _contains_zero(y)):
+            x = y = None  # 交给Python抛出ZeroDivisionError
+        else:
+            if out is not None and op in _FLOAT_INPLACE_OPS and _float_inplace(op, x, y, out):
+                return out
+            result = _vector_binary(op, x, y)
+            if result is not None:
+                return _like(result, template) if out is None else _write_out(out, result)
+    left = a if a_scalar or x is None else x
+    right = b if b_scalar or y is None else y
+    values = _py_binary(func, left, right, a_scalar, b_scalar)
+    if out is not None:
+        return _write_out(out, values)
+    if isinstance(template, (list, tuple)) or not set(map(type, values)) <= _NUMERIC_TYPES:
+        return values
+    return _like(_to_storage(values), template)
+
+
+def _py_binary(func: Callable, a, b, a_scalar: bool, b_scalar: bool) -> list:
+    """逐元素调用func, map在C层迭代, 比列表推导式更快"""
+    if a_scalar:
+        return [func(a, v) for v in b]
+    if b_scalar:
+        return [func(v, b) for v in a]
+    return list(map(func, a, b))
+
+
+def _float_inplace(op: str, x, y, out) -> bool:
+    """操作数和out都是float64时直接把结果写入out的缓冲区, 不分配中间结果; 不适用时返回False"""
+    target = _view(out)
+    if target is None or target.dtype != _np.float64 or not target.flags.writeable:
+        return False
+    operands = [v if isinstance(v, (int, float)) else _ndview(v) for v in (x, y)]
+    if not all(isinstance(v, float) or getattr(v, 'dtype', None) == _np.float64 for v in operands):
+        return False
+    with _np.errstate(all='ignore'):
+        _FLOAT_UFUNCS[op](*operands, out=target)
+    return True
+
+
+def add(a, b, out=None):
+    """逐元素加法, 支持标量广播"""
+    return _binary('add', a, b, out)
+
+
+def sub(a, b, out=None):
+    """逐元素减法, 支持标量广播"""
+    return _binary('sub', a, b, out)
+
+
+def mul(a, b, out=None):
+    """逐元素乘法, 支持标量广播"""
+    return _binary('mul', a, b, out)
+
+
+def div(a, b, out=None):
+    """逐元素真除法, 支持标量广播"""
+    return _binary('truediv', a, b, out)
+
+
+def power(a, b, out=None):
+    """逐元素幂运算, 支持标量广播"""
+    return _binary('pow', a, b, out)
+
+
+def mod(a, b, out=None):
+    """逐元素取模, 支持标量广播"""
+    return _binary('mod', a, b, out)
+
+
+def zip_with(a, b, func: Callable, out=None):
+    """对两个序列的对应元素执行func
+
+    func为operator模块中的算术函数时使用对应的向量化内核, 为numpy ufunc时直接对整个缓冲区调用,
+    其他函数逐元素调用。
+
+    Raises:
+        ValueError: 两个序列长度不同,或out长度不匹配时
+    """
+    op = _OPERATOR_OPS.get(func)
+    if op is not None:
+        return _binary(op, a, b, out)
+    a_scalar, b_scalar = isinstance(a, (int, float)), isinstance(b, (int, float))
+    template = b if a_scalar else a
+    length = len(template)
+    if not a_scalar and not b_scalar and len(b) != length:
+        raise ValueError("Operands must have the same length")
+    if out is not None:
+        _check_out(out, length)
+    if _np is not None and isinstance(func, _np.ufunc) and (_is_buffer(a) or _is_buffer(b)):
+        x = a if a_scalar else _view(a)
+        y = b if b_scalar else _view(b)
+        if x is not None and y is not None:
+            target = _view(out) if out is not None else None
+            if target is not None and target.flags.writeable:
+                func(x, y, out=target)
+                return out
+            result = func(x, y)
+            if out is not None:
+                return _write_out(out, result.tolist())
+            return result if isinstance(template, _np.ndarray) else _like(_to_storage(result.tolist()), template)
+    values = _py_binary(func, a, b, a_scalar, b_scalar)
+    return values if out is None else _write_out(out, values)
+
+
+def _vector_view(numbers):
+    """大数组的numpy视图, 数据量不足或不可向量化时返回None"""
+    if _np is None or not _is_buffer(numbers) or len(numbers) < _VECTOR_THRESHOLD:
+        return None
+    return _view(numbers)
+
+
+def stasum(numbers):
+    """求和; 整数结果可能超出int64时逐个相加以保持精确"""
+    x = _vector_view(numbers)
+    if x is not None and (x.dtype.kind == 'f' or _max_abs(x) * len(x) <= _INT64_MAX):
+        return x.sum().item()
+    return sum(numbers.tolist() if _np is not None and isinstance(numbers, _np.ndarray) else numbers)
+
+
+def stamax(numbers):
+    """最大值
+
+    Raises:
+        ValueError: 序列为空时
+    """
+    x = _vector_view(numbers)
+    if x is not None:
+        return x.max().item()
+    return max(numbers)
+
+
+def stamin(numbers):
+    """最小值
+
+    Raises:
+        ValueError: 序列为空时
+    """
+    x = _vector_view(numbers)
+    if x is not None:
+        return x.min().item()
+    return min(numbers)
+
+
+def staaverage(numbers):
+    """算术平均值
+
+    Raises:
+        ZeroDivisionError: 序列为空时
+    """
+    return stasum(numbers) / len(numbers)
+
+
+def stacount(numbers, value) -> int:
+    """统计value出现的次数"""
+    if isinstance(value, (int, float)):
+        x = _vector_view(numbers)
+        if x is not None:
+            return int(_np.count_nonzero(x == value))
+    if hasattr(numbers, 'count'):
+        return numbers.count(value)
+    return sum(1 for v in numbers if v == value)